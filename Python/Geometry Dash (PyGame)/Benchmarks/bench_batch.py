@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark: BatchSimulation against looping over Simulation objects
+
+Usage:
+    python Benchmarks/bench_batch.py
+"""
+import os
+import sys
+import time
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, script_dir)
+
+import numpy as np
+from batch_simulation import BatchSimulation
+from bench_collisions import SCREEN_HEIGHT, SCREEN_WIDTH, generate_level
+from simulation import Simulation
+
+TICKS = 240
+
+
+def run_scalar(level, players, inputs):
+    sims = [Simulation(level, SCREEN_WIDTH, SCREEN_HEIGHT) for _ in range(players)]
+    start = time.perf_counter()
+    for jump, right in inputs:
+        for i, sim in enumerate(sims):
+            if jump[i]:
+                sim.jump()
+            sim.keys_pressed = {'right'} if right[i] else set()
+            sim.step()
+    return time.perf_counter() - start
+
+
+def run_batch(level, players, inputs):
+    batch = BatchSimulation(level, SCREEN_WIDTH, SCREEN_HEIGHT, players)
+    start = time.perf_counter()
+    for jump, right in inputs:
+        batch.right = right
+        batch.jump(jump)
+        batch.step()
+    return time.perf_counter() - start
+
+
+def main():
+    level = generate_level(1_000)
+    rng = np.random.default_rng(0)
+    print(f"{'players':>8} {'loop (ms/tick)':>15} {'batch (ms/tick)':>16} {'speedup':>8}")
+    for players in (10, 100, 1_000, 10_000):
+        inputs = [(rng.random(players) < 0.03, rng.random(players) < 0.7) for _ in range(TICKS)]
+        scalar = run_scalar(level, players, inputs) / TICKS * 1000
+        batch = run_batch(level, players, inputs) / TICKS * 1000
+        print(f"{players:>8} {scalar:>15.2f} {batch:>16.2f} {scalar / batch:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-frame collision cost as the number of level objects grows
+
+With the spatial hash broadphase the cost per frame should stay roughly flat,
+while a full scan of every object grows linearly.
+
+Usage:
+    python Benchmarks/bench_collisions.py
+"""
+import os
+import random
+import sys
+import time
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, script_dir)
+
+from level_manager import GameState, parse_level_data
+
+SCREEN_WIDTH = 1280
+SCREEN_HEIGHT = 720
+FRAMES = 300
+
+
+def generate_level(object_count, seed=1):
+    """Level with object_count small platforms and obstacles spread over a wide area"""
+    return parse_level_data(generate_level_dict(object_count, seed))
+
+
+def generate_level_dict(object_count, seed=1):
+    """JSON data of generate_level()"""
+    rng = random.Random(seed)
+    width = max(SCREEN_WIDTH, object_count * 10)
+    platforms = [{"x": 0, "y": 680, "width": SCREEN_WIDTH, "height": 40, "type": "ground"}]
+    obstacles = []
+    for i in range(object_count):
+        x = rng.uniform(0, width)
+        y = rng.uniform(0, 640)
+        if i % 2:
+            platforms.append({"x": x, "y": y, "width": 60, "height": 20, "type": "ground"})
+        else:
+            obstacles.append({"x": x + SCREEN_WIDTH, "y": y, "width": 30, "height": 30, "type": "spike"})
+    return {
+        "name": f"Bench {object_count}",
+        "spawn_point": [100, 600],
+        "end_point": [-1000, -1000],
+        "platforms": platforms,
+        "obstacles": obstacles,
+    }
+
+
+class FullScanGameState(GameState):
+    """Reference GameState that tests every object each frame"""
+
+    def _nearby(self, static_grid, moving_grid, rect):
+        return range(len(self.platforms) if static_grid is self.static_platform_grid else len(self.obstacles))
+
+
+def time_frames(state_class, level):
+    """Average seconds per GameState.update over FRAMES frames"""
+    state = state_class(level, SCREEN_WIDTH, SCREEN_HEIGHT)
+    state.keys_pressed.add('right')
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        if frame % 40 == 0:
+            state.jump()
+        state.update(1.0 / 60.0)
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    print(f"{'objects':>8} {'build (ms)':>11} {'hash (us/frame)':>16} {'full scan (us/frame)':>21}")
+    for object_count in (10, 100, 1_000, 10_000, 100_000):
+        level = generate_level(object_count)
+
+        start = time.perf_counter()
+        GameState(level, SCREEN_WIDTH, SCREEN_HEIGHT)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        hashed = time_frames(GameState, level) * 1e6
+        # The full scan takes tens of seconds at 100k objects, so it is skipped there
+        full = f"{time_frames(FullScanGameState, level) * 1e6:.1f}" if object_count <= 10_000 else "-"
+        print(f"{object_count:>8} {build_ms:>11.1f} {hashed:>16.1f} {full:>21}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
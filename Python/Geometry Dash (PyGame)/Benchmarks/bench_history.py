@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: editor undo history on a 50k object level
+
+Times recording, undoing and redoing a session of edits and compares the
+memory the history holds with what snapshotting the object lists after
+every edit would take.
+
+Usage:
+    python Benchmarks/bench_history.py
+"""
+import copy
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, script_dir)
+
+from editor_history import AddObject, ClearObjects, DeleteObject, History, MoveObject, SetAttribute
+from editor_objects import EditorObjects
+from level_data import Obstacle, Platform
+
+OBJECTS = 50_000
+EDITS = 2_000
+DRAG_STEPS = 30
+
+
+def build_level(rng):
+    platforms, obstacles = EditorObjects(), EditorObjects()
+    for i in range(OBJECTS):
+        x, y = rng.uniform(0, 20000), rng.uniform(0, 800)
+        if i % 2:
+            platforms.add(Platform(x, y, 60, 20, "ground", (100, 150, 100)))
+        else:
+            obstacles.add(Obstacle(x, y, 30, 30, "spike", (255, 100, 100)))
+    return platforms, obstacles
+
+
+def edit_session(rng, history, platforms, obstacles):
+    """EDITS edits of every kind; returns the seconds spent in the history"""
+    elapsed = 0.0
+
+    def execute(command):
+        nonlocal elapsed
+        start = time.perf_counter()
+        history.execute(command)
+        elapsed += time.perf_counter() - start
+
+    for edit in range(EDITS):
+        objects = platforms if edit % 2 else obstacles
+        obj_id = rng.choice(list(objects.query(rng.uniform(0, 20000), 0, 200, 800)) or [None])
+        kind = edit % 4
+        if kind == 0 or obj_id is None:
+            execute(AddObject(objects, Platform(rng.uniform(0, 20000), rng.uniform(0, 800), 60, 20, "ground")))
+        elif kind == 1:
+            # A drag sends many small moves that become one entry
+            for step in range(DRAG_STEPS):
+                execute(MoveObject(objects, obj_id, objects[obj_id].x + 3, objects[obj_id].y + 1))
+        elif kind == 2:
+            execute(DeleteObject(objects, obj_id))
+        else:
+            execute(SetAttribute(objects[obj_id], "width", 80, objects, obj_id))
+        history.checkpoint()
+    return elapsed
+
+
+def main():
+    rng = random.Random(2)
+    platforms, obstacles = build_level(rng)
+    history = History(max_entries=EDITS + 1)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    record_s = edit_session(rng, history, platforms, obstacles)
+    edits_bytes = tracemalloc.get_traced_memory()[0] - before
+
+    start = time.perf_counter()
+    history.execute(ClearObjects([platforms, obstacles]))
+    clear_s = time.perf_counter() - start
+    history_bytes = tracemalloc.get_traced_memory()[0] - before
+    estimate = history.stats()["bytes"]
+    entries = len(history)
+
+    start = time.perf_counter()
+    history.undo()
+    undo_clear_s = time.perf_counter() - start
+    start = time.perf_counter()
+    while history.undo():
+        pass
+    undo_s = time.perf_counter() - start
+    assert len(platforms) + len(obstacles) == OBJECTS
+
+    start = time.perf_counter()
+    while history.redo():
+        pass
+    redo_s = time.perf_counter() - start
+
+    history.undo()  # Bring the objects back for the snapshot comparison
+    before = tracemalloc.get_traced_memory()[0]
+    snapshot = copy.deepcopy((list(platforms), list(obstacles)))
+    snapshot_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del snapshot
+
+    print(f"{OBJECTS} objects, {EDITS} edits ({DRAG_STEPS} moves per drag) and a clear -> {entries} entries")
+    print(f"{'record':>12} {record_s * 1000:>9.1f} ms  {record_s / EDITS * 1e6:>8.1f} us/edit")
+    print(f"{'clear':>12} {clear_s * 1000:>9.1f} ms")
+    print(f"{'undo clear':>12} {undo_clear_s * 1000:>9.1f} ms")
+    print(f"{'undo edits':>12} {undo_s * 1000:>9.1f} ms  {undo_s / EDITS * 1e6:>8.1f} us/edit")
+    print(f"{'redo all':>12} {redo_s * 1000:>9.1f} ms  {redo_s / entries * 1e6:>8.1f} us/entry")
+    print(f"history held {edits_bytes / 1e6:.2f} MB for the edits, {history_bytes / 1e6:.1f} MB with the clear "
+          f"(estimate {estimate / 1e6:.1f} MB)")
+    print(f"one snapshot of the level is {snapshot_bytes / 1e6:.1f} MB, "
+          f"{entries} snapshots would be {snapshot_bytes * entries / 1e9:.1f} GB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark: finding overlapping objects with the linter's sweep line
+
+The sweep line compares each object only with those its x range crosses,
+so it stays near linear; comparing all pairs grows quadratically.
+
+Usage:
+    python Benchmarks/bench_lint.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from itertools import combinations
+
+# Add root directory to path to find level_lint
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, script_dir)
+
+from bench_collisions import generate_level, generate_level_dict
+from level_lint import _box, find_overlaps, lint_file
+
+
+def all_pairs(boxes):
+    """Reference overlap search comparing every pair"""
+    for (i, a), (j, b) in combinations(enumerate(boxes), 2):
+        if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+            yield (i, j)
+
+
+def main():
+    print(f"{'objects':>8} {'overlaps':>9} {'sweep (ms)':>11} {'all pairs (ms)':>15} {'lint_file (ms)':>15}")
+    for object_count in (1_000, 5_000, 10_000, 100_000):
+        level = generate_level(object_count)
+        objects = list(level.platforms) + list(level.obstacles)
+        boxes = [_box(obj.x, obj.y, obj.width, obj.height) for obj in objects]
+
+        start = time.perf_counter()
+        overlaps = sum(1 for _ in find_overlaps(boxes))
+        sweep_ms = (time.perf_counter() - start) * 1000
+
+        # All pairs takes minutes at 100k objects, so it is skipped there
+        if object_count <= 5_000:
+            start = time.perf_counter()
+            assert sum(1 for _ in all_pairs(boxes)) == overlaps
+            pairs = f"{(time.perf_counter() - start) * 1000:.1f}"
+        else:
+            pairs = "-"
+
+        with tempfile.TemporaryDirectory() as levels_dir:
+            with open(os.path.join(levels_dir, "bench.json"), 'w') as f:
+                json.dump(generate_level_dict(object_count), f)
+            start = time.perf_counter()
+            lint_file(levels_dir, "bench")
+            lint_ms = (time.perf_counter() - start) * 1000
+        print(f"{object_count:>8} {overlaps:>9} {sweep_ms:>11.1f} {pairs:>15} {lint_ms:>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: merging editor-style ground pieces at load time
+
+Levels made in the editor build the ground out of many small pieces. This
+measures how many platforms merging removes, what the pass costs on top of
+parsing, and what it saves when building a game state and running frames.
+
+Usage:
+    python Benchmarks/bench_simplify.py
+"""
+import os
+import random
+import sys
+import time
+
+# Add root directory to path to find level_simplify
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, script_dir)
+
+from bench_collisions import SCREEN_HEIGHT, SCREEN_WIDTH, time_frames
+from level_data import parse_level_data
+from level_manager import GameState
+from level_simplify import simplify_level
+
+PIECE_WIDTH = 40
+
+
+def generate_level_dict(piece_count, seed=1):
+    """Ground of piece_count pieces with a ledge of a few pieces every screen"""
+    rng = random.Random(seed)
+    width = piece_count * PIECE_WIDTH
+    platforms = [{"x": x, "y": 680, "width": PIECE_WIDTH, "height": 40, "type": "ground"}
+                 for x in range(0, width, PIECE_WIDTH)]
+    for x in range(SCREEN_WIDTH, width - SCREEN_WIDTH, SCREEN_WIDTH // 2):
+        y = rng.choice([450, 500, 550])
+        platforms += [{"x": x + i * PIECE_WIDTH, "y": y, "width": PIECE_WIDTH, "height": 20, "type": "ground",
+                       "color": [100, 150, 200]} for i in range(rng.randrange(2, 6))]
+    return {
+        "name": f"Pieces {piece_count}",
+        "width": width,
+        "spawn_point": [100, 600],
+        "end_point": [-1000, -1000],
+        "platforms": platforms,
+        "obstacles": [],
+    }
+
+
+def time_build(level):
+    start = time.perf_counter()
+    GameState(level, SCREEN_WIDTH, SCREEN_HEIGHT)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'pieces':>8} {'merged':>7} {'parse (ms)':>11} {'merge (ms)':>11} "
+          f"{'build (ms)':>16} {'update (us/frame)':>18}")
+    for piece_count in (1_000, 10_000, 100_000):
+        data = generate_level_dict(piece_count)
+        start = time.perf_counter()
+        level = parse_level_data(data)
+        parse_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        simplified = simplify_level(level)
+        merge_ms = (time.perf_counter() - start) * 1000
+
+        build = f"{time_build(level):.0f} -> {time_build(simplified):.0f}"
+        update = f"{time_frames(GameState, level) * 1e6:.0f} -> {time_frames(GameState, simplified) * 1e6:.0f}"
+        merged = len(simplified.platforms)
+        print(f"{len(level.platforms):>8} {merged:>7} {parse_ms:>11.1f} {merge_ms:>11.1f} {build:>16} {update:>18}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: loading, updating and drawing levels of 10 to 100k objects
+
+Each generated level is a long scrolling level holding object_count platforms
+and obstacles (every 25th platform moves). For each size the suite measures
+
+    load_json_ms       LevelManager.get_level() of the JSON file, best of 5
+    load_compiled_ms   the same from a compiled .gdl file
+    first_state_ms     first GameState of a loaded level, which builds the
+                       level's shared collision grids and x indexes
+    update_ms          median GameState.update() while running right
+    collisions_ms      median collision check time inside update
+    draw_ms            median headless frame: LevelRenderer plus the HUD
+
+Results are compared with a stored baseline (Benchmarks/baseline.json) and
+any metric more than --tolerance slower than it in two runs is reported as a
+regression, making the script exit with status 1. Timings depend on the machine, so
+the comparison is skipped when the baseline was recorded on another platform
+or Python version; record one there with --save-baseline.
+
+Usage:
+    python Benchmarks/bench_suite.py                    # Run and compare
+    python Benchmarks/bench_suite.py --sizes 10,1000    # Only some sizes
+    python Benchmarks/bench_suite.py --json results.json
+    python Benchmarks/bench_suite.py --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, script_dir)
+
+import pygame
+from bench_collisions import SCREEN_HEIGHT, SCREEN_WIDTH, generate_level_dict
+from level_binary import compile_level_file
+from level_manager import GameState, LevelManager
+from profiler import FrameProfiler
+from renderer import LevelRenderer
+from text_cache import TextLabel
+
+SIZES = (10, 1_000, 10_000, 100_000)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+TICK_RATE = 120
+UPDATE_TICKS = 1200
+DRAW_FRAMES = 300
+LOAD_REPEATS = 5
+
+# A metric regresses when it is this much slower than the baseline...
+DEFAULT_TOLERANCE = 0.5
+# ...and by more than this, so timer noise on tiny values isn't reported
+MIN_REGRESSION_MS = 0.01
+
+# Baseline fields that must match this run for timings to be comparable
+MACHINE_FIELDS = ("platform", "python")
+
+METRICS = ("load_json_ms", "load_compiled_ms", "first_state_ms", "update_ms", "collisions_ms", "draw_ms")
+
+
+def suite_level_dict(object_count):
+    """Scrolling version of the collision benchmark level with some moving platforms"""
+    data = generate_level_dict(object_count)
+    width = max(SCREEN_WIDTH, object_count * 10) + SCREEN_WIDTH
+    data["name"] = f"Suite {object_count}"
+    data["width"] = width
+    data["end_point"] = [width - 100, 600]
+    data["platforms"][0]["width"] = width
+    for platform in data["platforms"][1::25]:
+        platform["type"] = "moving"
+        platform["speed"] = 100
+    return data
+
+
+def time_load(levels_dir, level_name):
+    """Best times of a fresh LevelManager loading the level and of the first
+    GameState created for it, in ms"""
+    LevelManager(levels_dir).get_level(level_name)  # Warm up file and import caches
+    best_load = best_state = float("inf")
+    for _ in range(LOAD_REPEATS):
+        start = time.perf_counter()
+        level = LevelManager(levels_dir).get_level(level_name)
+        loaded = time.perf_counter()
+        GameState(level, SCREEN_WIDTH, SCREEN_HEIGHT)
+        best_load = min(best_load, loaded - start)
+        best_state = min(best_state, time.perf_counter() - loaded)
+    return level, best_load * 1000, best_state * 1000
+
+
+def run_right(level, ticks, profiler, on_tick):
+    """Hold right and jump now and then, restarting from the spawn on death"""
+    template = GameState(level, SCREEN_WIDTH, SCREEN_HEIGHT)
+    template.press('right')
+    state = None
+    for tick in range(ticks):
+        if state is None or state.game_over or state.level_complete:
+            state = template.clone()
+            state.profiler = profiler
+        if tick % 40 == 0:
+            state.jump()
+        on_tick(state)
+
+
+def measure_updates(level):
+    """Median update and collision times in ms"""
+    profiler = FrameProfiler(history=UPDATE_TICKS)
+
+    def update(state):
+        profiler.begin_frame()
+        state.update(1.0 / TICK_RATE)
+        profiler.end_frame()
+
+    run_right(level, UPDATE_TICKS, profiler, update)
+    summary = profiler.summary()
+    return summary["frame"]["p50"], summary["collisions"]["p50"]
+
+
+def measure_draw(level, screen, font):
+    """Median time to draw a frame with LevelRenderer, in ms"""
+    profiler = FrameProfiler(history=DRAW_FRAMES)
+    label = TextLabel(font, (255, 255, 100))
+    current = {}
+
+    def draw(state):
+        # Two physics ticks per 60 FPS frame, drawn after the second
+        state.update(1.0 / TICK_RATE)
+        if state.tick % 2:
+            return
+        if current.get("state") is not state:
+            current["state"] = state
+            current["renderer"] = LevelRenderer(screen, state)
+        renderer = current["renderer"]
+
+        profiler.begin_frame()
+        with profiler.phase("draw"):
+            renderer.begin_frame()
+            renderer.draw_world()
+            renderer.blit(label.render(f"Time: {state.elapsed_time:.1f}s"), (10, 10))
+            renderer.present()
+        profiler.end_frame()
+
+    run_right(level, DRAW_FRAMES * 2, None, draw)
+    return profiler.summary()["draw"]["p50"]
+
+
+def run_suite(sizes):
+    """Run every benchmark for each level size, returning the results document"""
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    font = pygame.font.Font(None, 36)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for object_count in sizes:
+            level_name = f"suite_{object_count}"
+            json_dir = os.path.join(tmp, "json")
+            compiled_dir = os.path.join(tmp, "compiled")
+            os.makedirs(json_dir, exist_ok=True)
+            os.makedirs(compiled_dir, exist_ok=True)
+            json_path = os.path.join(json_dir, f"{level_name}.json")
+            with open(json_path, "w") as f:
+                json.dump(suite_level_dict(object_count), f)
+            compile_level_file(json_path, os.path.join(compiled_dir, f"{level_name}.gdl"))
+
+            level, load_json, first_state = time_load(json_dir, level_name)
+            _, load_compiled, _ = time_load(compiled_dir, level_name)
+
+            update, collisions = measure_updates(level)
+            draw = measure_draw(level, screen, font)
+
+            results[str(object_count)] = {
+                "load_json_ms": load_json,
+                "load_compiled_ms": load_compiled,
+                "first_state_ms": first_state,
+                "update_ms": update,
+                "collisions_ms": collisions,
+                "draw_ms": draw,
+            }
+            print_row(object_count, results[str(object_count)])
+
+    pygame.quit()
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def machine_differences(results, baseline):
+    """Descriptions of the MACHINE_FIELDS that differ between a run and a baseline"""
+    return [f"{field} {baseline.get(field)} (here {results[field]})"
+            for field in MACHINE_FIELDS if baseline.get(field) != results[field]]
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Metrics slower than the baseline by more than tolerance, as
+    (objects, metric, baseline, current) tuples"""
+    regressions = []
+    for size, metrics in results["results"].items():
+        reference = baseline["results"].get(size, {})
+        for metric, value in metrics.items():
+            if metric not in reference:
+                continue
+            expected = reference[metric]
+            if value > expected * (1 + tolerance) and value - expected > MIN_REGRESSION_MS:
+                regressions.append((int(size), metric, expected, value))
+    return regressions
+
+
+def keep_fastest(results, other):
+    """Merge another run into results, keeping the lower value of each metric"""
+    for size, metrics in other["results"].items():
+        current = results["results"].setdefault(size, {})
+        for metric, value in metrics.items():
+            current[metric] = min(value, current.get(metric, value))
+
+
+def print_header():
+    print(f"{'objects':>8}" + "".join(f"{metric[:-3]:>18}" for metric in METRICS) + "  (ms)")
+
+
+def print_row(object_count, metrics):
+    print(f"{object_count:>8}" + "".join(f"{metrics[metric]:>18.4f}" for metric in METRICS))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark loading, updating and drawing generated levels")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="comma separated object counts (default: %(default)s)")
+    parser.add_argument("--json", metavar="FILE", help="write the results to FILE")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline to compare with (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a regression is reported (default: %(default)s)")
+    options = parser.parse_args(args)
+
+    sizes = [int(size) for size in options.sizes.split(",")]
+    print_header()
+    results = run_suite(sizes)
+
+    regressions = []
+    differences = []
+    if not options.save_baseline and os.path.exists(options.baseline):
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+        differences = machine_differences(results, baseline)
+        regressions = [] if differences else compare(results, baseline, options.tolerance)
+        if regressions:
+            # Timings on a busy machine jump around, so only report slowdowns
+            # that a second run of the same size confirms
+            print("\nRe-running sizes that look slower:")
+            keep_fastest(results, run_suite(sorted({size for size, *_ in regressions})))
+            regressions = compare(results, baseline, options.tolerance)
+
+    if options.json:
+        with open(options.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if options.save_baseline:
+        with open(options.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {options.baseline}")
+        return 0
+    if not os.path.exists(options.baseline):
+        print(f"\nNo baseline at {options.baseline}; run with --save-baseline to record one")
+        return 0
+    if differences:
+        print(f"\nNot comparing: the baseline was recorded on {'; '.join(differences)}. "
+              f"Run with --save-baseline to record one on this machine")
+        return 0
+
+    if not regressions:
+        print(f"\nNo regressions against the baseline (tolerance {options.tolerance:.0%})")
+        return 0
+    print(f"\n{len(regressions)} regression(s) against the baseline:")
+    for object_count, metric, expected, value in regressions:
+        print(f"  {object_count:>7} objects  {metric:<17} {expected:.4f} -> {value:.4f} ms ({value / expected - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Level factories shared by the tests
+"""
+import json
+import os
+import random
+import sys
+
+# Add root directory to path to find level_data
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_data import parse_level_data
+
+
+def level_dict(level_name, **overrides):
+    """A small level in the JSON format, with top-level keys replaced by overrides"""
+    level_data = {
+        "name": f"Level {level_name}",
+        "difficulty": 2,
+        "time_limit": 0,
+        "background_color": [30, 30, 40],
+        "spawn_point": [100, 500],
+        "end_point": [900, 300],
+        "platforms": [
+            {"x": 0, "y": 600, "width": 1000, "height": 20, "type": "ground", "color": [100, 200, 100]},
+            {"x": 300, "y": 450, "width": 120, "height": 20, "type": "moving", "color": [100, 150, 200],
+             "speed": 50, "direction": 1}
+        ],
+        "obstacles": [
+            {"x": 500, "y": 560, "width": 40, "height": 40, "type": "box", "color": [255, 100, 0]}
+        ]
+    }
+    level_data.update(overrides)
+    return level_data
+
+
+def level_json(level_name, **overrides):
+    """JSON text of level_dict()"""
+    return json.dumps(level_dict(level_name, **overrides), indent=2)
+
+
+def write_level(levels_dir, level_name, **overrides):
+    """Write level_dict() in place as levels_dir/level_name.json and return its path"""
+    filepath = os.path.join(levels_dir, f"{level_name}.json")
+    with open(filepath, 'w') as f:
+        f.write(level_json(level_name, **overrides))
+    return filepath
+
+
+def random_level(seed, **overrides):
+    """Level with ground, springs, moving platforms and obstacles, with top-level keys replaced by overrides"""
+    rng = random.Random(seed)
+    platforms = [{"x": 0, "y": 650, "width": 1000, "height": 30, "type": "ground"}]
+    obstacles = []
+    for _ in range(50):
+        kind = rng.choice(["ground", "ground", "spring", "moving"])
+        platforms.append({
+            "x": rng.uniform(-20, 950), "y": rng.uniform(100, 640),
+            "width": rng.uniform(20, 200), "height": rng.uniform(10, 30),
+            "type": kind, "speed": rng.uniform(40, 120) if kind == "moving" else 0
+        })
+        if rng.random() < 0.3:
+            moving = rng.random() < 0.3
+            obstacles.append({
+                "x": rng.uniform(0, 950), "y": rng.uniform(100, 640),
+                "width": rng.uniform(10, 40), "height": rng.uniform(10, 40),
+                "type": "moving_box" if moving else "spike", "speed": 60 if moving else 0
+            })
+    level_data = {
+        "name": f"Random {seed}", "time_limit": rng.choice([0, 2.5]),
+        "spawn_point": [rng.uniform(50, 950), 50], "end_point": [rng.uniform(100, 900), 600],
+        "platforms": platforms, "obstacles": obstacles
+    }
+    level_data.update(overrides)
+    return parse_level_data(level_data)
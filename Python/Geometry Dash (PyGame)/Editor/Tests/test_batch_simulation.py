@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test that the vectorized batch engine matches the scalar simulation
+"""
+import os
+import sys
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+import numpy as np
+from simulation import Simulation
+from batch_simulation import BatchSimulation
+from level_fixtures import random_level
+
+
+def test_batch_matches_scalar():
+    """Run the same random inputs through BatchSimulation and N Simulations"""
+    print("=" * 60)
+    print("TEST: Batch Engine Matches Scalar Simulation")
+    print("=" * 60)
+
+    players = 24
+    for seed in range(10):
+        level = random_level(seed)
+        batch = BatchSimulation(level, 1000, 720, players)
+        sims = [Simulation(level, 1000, 720) for _ in range(players)]
+        rng = np.random.default_rng(seed)
+
+        for tick in range(480):
+            jump = rng.random(players) < 0.04
+            batch.left = rng.random(players) < 0.4
+            batch.right = rng.random(players) < 0.4
+            batch.jump(jump)
+            batch.step()
+
+            for i, sim in enumerate(sims):
+                if jump[i]:
+                    sim.jump()
+                sim.keys_pressed = {key for key, held in (('left', batch.left[i]), ('right', batch.right[i])) if held}
+                sim.step()
+
+        for i, sim in enumerate(sims):
+            expected = (sim.player_pos.x, sim.player_pos.y, sim.player_velocity_y, sim.is_jumping,
+                        sim.game_over, sim.level_complete, sim.elapsed_time, sim.tick)
+            actual = (batch.x[i], batch.y[i], batch.velocity_y[i], batch.is_jumping[i],
+                      batch.game_over[i], batch.level_complete[i], batch.elapsed_time[i], batch.ticks[i])
+            assert expected == actual, f"seed {seed} player {i}: {expected} != {actual}"
+
+        finished = int((batch.game_over | batch.level_complete).sum())
+        print(f"✓ Level {seed}: {players} players identical ({finished} finished)")
+
+    try:
+        BatchSimulation(random_level(0, width=3000), 1000, 720, players)
+        assert False, "a scrolling level with moving objects should be rejected"
+    except ValueError:
+        print("✓ Scrolling level with moving objects rejected")
+
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " BATCH SIMULATION TEST ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    try:
+        if test_batch_matches_scalar():
+            print("=" * 60)
+            print("✓ BATCH SIMULATION TEST PASSED!")
+            print("=" * 60)
+            return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test the scrolling camera, the x index and moving-object culling
+"""
+import os
+import random
+import sys
+import tempfile
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_binary import CompiledLevel, write_compiled_level
+from level_data import parse_level_data
+from simulation import ACTIVE_MARGIN, Simulation
+from x_index import XIndex
+
+
+def test_x_index_matches_brute_force():
+    """Queries return exactly the objects overlapping the range"""
+    print("=" * 60)
+    print("TEST: X Index Queries")
+    print("=" * 60)
+
+    rng = random.Random(3)
+    index = XIndex(wide_threshold=500)
+    spans = {}
+    bulk = []
+    for key in range(2000):
+        x = rng.uniform(-1000, 50000)
+        width = rng.choice([rng.uniform(-40, 200), rng.uniform(500, 5000)])
+        # Half added in one sorted batch, as levels load, half one at a time
+        if key % 2:
+            index.insert(key, x, width)
+        else:
+            bulk.append((key, x, width))
+        spans[key] = (min(x, x + width), max(x, x + width))
+    index.extend(bulk)
+
+    for step in range(500):
+        # Move and remove some objects between queries
+        key = rng.randrange(2000)
+        if step % 5 == 0 and key in spans:
+            index.remove(key)
+            del spans[key]
+        elif key in spans:
+            x, width = rng.uniform(-1000, 50000), rng.uniform(1, 300)
+            index.move(key, x, width)
+            spans[key] = (x, x + width)
+
+        x0 = rng.uniform(-2000, 51000)
+        x1 = x0 + rng.uniform(0, 3000)
+        expected = {k for k, (left, right) in spans.items() if left <= x1 and right >= x0}
+        found = index.query(x0, x1)
+        assert len(found) == len(set(found)), "duplicate keys"
+        assert set(found) == expected, f"query {x0:.0f}..{x1:.0f}"
+
+    assert len(index) == len(spans)
+    print(f"✓ 500 queries match a full scan over {len(spans)} objects")
+    print()
+    return True
+
+
+def long_level(width=20000):
+    platforms = [{"x": 0, "y": 600, "width": width, "height": 20, "type": "ground"}]
+    for x in range(1000, width, 2000):
+        platforms.append({"x": x, "y": 400, "width": 150, "height": 20, "type": "moving", "speed": 100})
+    return parse_level_data({
+        "name": "Long", "width": width, "spawn_point": [100, 560], "end_point": [width - 100, 560],
+        "platforms": platforms, "obstacles": []
+    })
+
+
+def test_camera_follows_player():
+    """The camera keeps the player in view and stops at the level edges"""
+    print("=" * 60)
+    print("TEST: Camera")
+    print("=" * 60)
+
+    sim = Simulation(long_level(), 1280, 720)
+    assert sim.scrolling and sim.camera_x == 0
+    sim.press('right')
+    for _ in range(120 * 70):
+        sim.step()
+        assert sim.camera_x <= sim.player_pos.x <= sim.camera_x + 1280
+        if sim.level_complete:
+            break
+    assert sim.level_complete, "player should run to the far end of the level"
+    assert sim.camera_x == sim.world_width - 1280
+    print(f"✓ Camera followed the player to x={sim.camera_x:.0f} and stopped at the edge")
+
+    # A level without a width stays on one screen
+    small = Simulation(parse_level_data({
+        "name": "Small", "spawn_point": [100, 560], "end_point": [600, 100],
+        "platforms": [{"x": 0, "y": 600, "width": 1280, "height": 20, "type": "ground"}], "obstacles": []
+    }), 1280, 720)
+    small.press('right')
+    small.run(600)
+    assert not small.scrolling and small.camera_x == 0
+    assert small.player_pos.x == 1280 - small.player_radius
+    print("✓ Levels that fit the screen don't scroll")
+    print()
+    return True
+
+
+def test_moving_objects_culled():
+    """Only moving objects near the view are updated"""
+    print("=" * 60)
+    print("TEST: Moving Object Culling")
+    print("=" * 60)
+
+    level = long_level()
+    sim = Simulation(level, 1280, 720)
+    sim.run(120)
+
+    x0, x1 = sim.view_range(ACTIVE_MARGIN)
+    moved = still = 0
+    for index in level.moving_platform_indices:
+        template, current = level.platforms[index], sim.platforms[index]
+        if template.x + template.width < x0 - 100 or template.x > x1 + 100:
+            assert current.x == template.x, "off-screen platform should not move"
+            still += 1
+        elif x0 <= template.x and template.x + template.width <= x1:
+            assert current.x != template.x, "platform in view should move"
+            moved += 1
+    assert moved and still
+    print(f"✓ {moved} platform(s) in view moved, {still} off screen stayed put")
+    print()
+    return True
+
+
+def test_width_round_trip():
+    """The level width survives the compiled format"""
+    print("=" * 60)
+    print("TEST: Level Width in Compiled Levels")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "long.gdl")
+        write_compiled_level(long_level(), path)
+        assert CompiledLevel(path).to_level_data().width == 20000
+    print("✓ Width stored and loaded")
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " CAMERA TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_x_index_matches_brute_force, test_camera_follows_player,
+             test_moving_objects_culled, test_width_round_trip]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL CAMERA TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Test the editor's autosave journal and crash recovery
+"""
+import json
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+sys.path.insert(0, os.path.join(script_dir, "Editor"))
+
+import pygame
+from editor_autosave import JOURNAL_FILE, SNAPSHOT_FILE, Autosave, recover
+from editor_history import ClearObjects
+
+LEVEL = {
+    "name": "custom",
+    "difficulty": 5,
+    "platforms": [{"x": 0, "y": 700, "width": 1000, "height": 100, "id": 1}],
+    "obstacles": [],
+}
+
+
+def without_generation(level):
+    return {key: value for key, value in level.items() if key != "autosave_generation"}
+
+
+def test_journal_replay():
+    """Recovery replays the journal over the snapshot, skipping what it can't trust"""
+    print("=" * 60)
+    print("TEST: Autosave Journal Replay")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        autosave = Autosave(directory)
+        autosave.start(LEVEL)
+        autosave.record([
+            {"op": "put", "kind": "platforms", "id": 2, "data": {"x": 10, "y": 20, "width": 60, "height": 20}},
+            {"op": "put", "kind": "obstacles", "id": 1, "data": {"x": 50, "y": 60, "width": 30, "height": 30}},
+        ])
+        autosave.record([
+            {"op": "put", "kind": "platforms", "id": 2, "data": {"x": 300, "y": 20, "width": 60, "height": 20}},
+            {"op": "delete", "kind": "platforms", "id": 1},
+            {"op": "level", "data": {"difficulty": 8}},
+        ])
+        autosave.flush()
+        expected = {
+            "name": "custom",
+            "difficulty": 8,
+            "platforms": [{"x": 300, "y": 20, "width": 60, "height": 20, "id": 2}],
+            "obstacles": [{"x": 50, "y": 60, "width": 30, "height": 30, "id": 1}],
+        }
+        assert without_generation(recover(directory)) == expected
+        print("✓ Snapshot plus journal gives the latest level")
+
+        # A crash in the middle of a write leaves a partial last line
+        journal_path = os.path.join(directory, JOURNAL_FILE)
+        with open(journal_path, 'a') as f:
+            f.write('{"op": "delete", "kind": "obst')
+        assert without_generation(recover(directory)) == expected
+        print("✓ A torn last record is ignored")
+
+        # Compaction folds the journal into the snapshot
+        with open(journal_path) as f:
+            old_journal = f.read()
+        autosave.compact()
+        autosave.flush()
+        with open(journal_path) as f:
+            assert len(f.read().splitlines()) == 1
+        assert without_generation(recover(directory)) == expected
+        assert not any(name.endswith(".tmp") for name in os.listdir(directory))
+        print("✓ Compaction leaves a snapshot and an empty journal")
+
+        # A crash between writing the snapshot and restarting the journal
+        # leaves the old journal, whose records are already in the snapshot
+        with open(journal_path, 'w') as f:
+            f.write(old_journal + '{"op": "clear", "kind": "obstacles"}\n')
+        assert without_generation(recover(directory)) == expected
+        print("✓ A journal from an older snapshot is skipped")
+
+        autosave.close()
+        assert not os.path.exists(journal_path)
+        assert not os.path.exists(os.path.join(directory, SNAPSHOT_FILE))
+        assert recover(directory) is None
+        print("✓ A clean close removes the autosave")
+
+        autosave = Autosave(directory, compact_every=10)
+        autosave.start(LEVEL)
+        for x in range(35):
+            autosave.record([{"op": "put", "kind": "platforms", "id": 1, "data": {"x": x}}])
+        autosave.flush()
+        assert autosave.compactions == 4, autosave.compactions
+        assert recover(directory)["platforms"] == [{"x": 34, "id": 1}]
+        autosave.close()
+        print("✓ The journal is compacted every 10 records")
+
+        # Records that can't be serialized are reported and dropped
+        autosave = Autosave(directory)
+        autosave.start(LEVEL)
+        autosave.record([{"op": "put", "kind": "platforms", "id": 2, "data": {"x": {1, 2}}}])
+        autosave.record([{"op": "put", "kind": "platforms", "id": 3, "data": {"x": 5}}])
+        autosave.flush()
+        assert recover(directory)["platforms"] == LEVEL["platforms"] + [{"x": 5, "id": 3}]
+        autosave.close()
+        print("✓ A record that fails to serialize doesn't stop the autosave thread")
+    print()
+    return True
+
+
+def test_editor_recovery():
+    """Edits made in the editor survive a crash with their ids"""
+    print("=" * 60)
+    print("TEST: Editor Crash Recovery")
+    print("=" * 60)
+
+    from level_editor import LevelEditor
+
+    def send(editor, event_type, **attributes):
+        pygame.event.post(pygame.event.Event(event_type, **attributes))
+        assert editor.handle_events()
+
+    with tempfile.TemporaryDirectory() as directory:
+        editor = LevelEditor(autosave_dir=directory)
+        assert len(editor.platforms) == 0
+        editor.add_platform((100, 100), (300, 140))
+        editor.add_platform((400, 400), (500, 420))
+        editor.add_obstacle((500, 500), (540, 530))
+        send(editor, pygame.MOUSEBUTTONDOWN, pos=(150, 120), button=1)
+        for x in range(160, 400, 8):
+            send(editor, pygame.MOUSEMOTION, pos=(x, 200), rel=(0, 0), buttons=(1, 0, 0))
+        send(editor, pygame.MOUSEBUTTONUP, pos=(392, 200), button=1)
+        editor.selected_object = ('platform', 2)
+        editor.delete_selected()
+        editor.set_level_property('difficulty', 9)
+        send(editor, pygame.KEYDOWN, key=pygame.K_z, mod=pygame.KMOD_LCTRL, unicode='', scancode=0)
+        editor.history.execute(ClearObjects([editor.platforms, editor.obstacles]))
+        send(editor, pygame.KEYDOWN, key=pygame.K_z, mod=pygame.KMOD_LCTRL, unicode='', scancode=0)
+        editor.set_object_property('obstacle', 1, 'width', 90)
+        send(editor, pygame.MOUSEMOTION, pos=(10, 10), rel=(0, 0), buttons=(0, 0, 0))
+        editor.autosave.flush()
+
+        expected = editor.level_snapshot(with_ids=True)
+        assert [p["id"] for p in expected["platforms"]] == [1] and expected["difficulty"] == 5
+        assert expected["obstacles"][0]["width"] == 90
+        assert without_generation(recover(directory)) == expected
+        print("✓ The journal follows drags, deletes, clears, undo and property changes")
+
+        # Stop the worker without removing its files, as a crash would
+        editor.autosave.close(discard=False)
+        recovered = LevelEditor(autosave_dir=directory)
+        assert recovered.level_snapshot(with_ids=True) == expected
+        assert recovered.platforms.pick(350, 210) == 1
+        print("✓ A new editor starts from the recovered level")
+
+        recovered.close()
+        assert os.listdir(directory) == []
+        print("✓ Closing the editor removes the autosave")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def test_save_level():
+    """Saving writes the next customN.json atomically, with or without autosave"""
+    print("=" * 60)
+    print("TEST: Editor Save")
+    print("=" * 60)
+
+    from level_editor import LevelEditor
+
+    with tempfile.TemporaryDirectory() as directory:
+        levels_dir = os.path.join(directory, "Levels")
+        os.makedirs(levels_dir)
+        with open(os.path.join(levels_dir, "custom1.json"), 'w') as f:
+            json.dump(LEVEL, f)
+
+        editor = LevelEditor(autosave_dir=os.path.join(directory, "Autosave"))
+        editor.levels_dir = levels_dir
+        editor.add_platform((100, 100), (300, 140))
+        editor.save_level()
+        editor.autosave.flush()
+        with open(os.path.join(levels_dir, "custom2.json")) as f:
+            saved = json.load(f)
+        assert saved == dict(editor.level_snapshot(), name="Custom Level 2")
+        print("✓ Saved from the autosave thread as custom2.json")
+        editor.close()
+
+        editor = LevelEditor()
+        editor.levels_dir = levels_dir
+        editor.save_level()
+        editor.load_from_file(os.path.join(levels_dir, "custom3.json"))
+        assert editor.level_name == "Custom Level 3" and len(editor.platforms) == 0
+        assert sorted(os.listdir(levels_dir)) == ["custom1.json", "custom2.json", "custom3.json", "levels.manifest"]
+        print("✓ Saved directly without autosave, no temporary files left")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " EDITOR AUTOSAVE TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_journal_replay, test_editor_recovery, test_save_level]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL EDITOR AUTOSAVE TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test the editor's undo/redo history
+"""
+import os
+import random
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+sys.path.insert(0, os.path.join(script_dir, "Editor"))
+
+import pygame
+from editor_history import (AddObject, ClearObjects, DeleteObject, History, MoveObject,
+                            SetAttribute)
+from editor_objects import EditorObjects
+from level_data import Obstacle, Platform
+
+
+def snapshot(*collections):
+    """Everything undo has to restore: ids, drawing order, positions and properties"""
+    return [[(obj_id, obj.x, obj.y, obj.width, obj.color) for obj_id, obj in objects.items()]
+            for objects in collections]
+
+
+def test_undo_redo_random_edits():
+    """Undoing every edit restores each earlier state, redoing replays them"""
+    print("=" * 60)
+    print("TEST: Undo/Redo of Random Edits")
+    print("=" * 60)
+
+    rng = random.Random(11)
+    platforms, obstacles = EditorObjects(), EditorObjects()
+    for _ in range(200):
+        platforms.add(Platform(rng.uniform(0, 1000), rng.uniform(0, 800), 60, 20, "ground", (1, 2, 3)))
+        obstacles.add(Obstacle(rng.uniform(0, 1000), rng.uniform(0, 800), 30, 30, "spike", (4, 5, 6)))
+
+    history = History()
+    states = [snapshot(platforms, obstacles)]
+    for step in range(400):
+        objects = rng.choice([platforms, obstacles])
+        ids = [obj_id for obj_id, _ in objects.items()]
+        action = rng.random()
+        if step == 200:
+            history.execute(ClearObjects([platforms, obstacles]))
+        elif action < 0.25 or not ids:
+            history.execute(AddObject(objects, Platform(rng.uniform(0, 1000), rng.uniform(0, 800),
+                                                        40, 40, "ground", (7, 8, 9))))
+        elif action < 0.45:
+            history.execute(DeleteObject(objects, rng.choice(ids)))
+        elif action < 0.8:
+            obj_id = rng.choice(ids)
+            for _ in range(rng.randint(1, 5)):
+                history.execute(MoveObject(objects, obj_id, rng.uniform(0, 1000), rng.uniform(0, 800)))
+        else:
+            obj_id = rng.choice(ids)
+            history.execute(SetAttribute(objects[obj_id], "width", rng.uniform(10, 200), objects, obj_id))
+        history.checkpoint()
+        states.append(snapshot(platforms, obstacles))
+
+    assert len(history) == 400
+    for expected in reversed(states[:-1]):
+        history.undo()
+        assert snapshot(platforms, obstacles) == expected
+    assert history.undo() is None
+    print("✓ 400 edits undone one by one, each earlier state restored exactly")
+
+    for expected in states[1:]:
+        history.redo()
+        assert snapshot(platforms, obstacles) == expected
+    assert not history.can_redo
+    print("✓ Redo replays every edit")
+
+    # Picking follows undone moves and size changes
+    for obj_id, obj in platforms.items():
+        assert platforms.pick(int(obj.x) + 1, int(obj.y) + 1) is not None
+    print()
+    return True
+
+
+def test_coalescing_and_memory_cap():
+    """A drag is one entry; old entries are dropped past the caps"""
+    print("=" * 60)
+    print("TEST: History Coalescing and Limits")
+    print("=" * 60)
+
+    objects = EditorObjects()
+    obj_id = objects.add(Platform(10, 10, 50, 20, "ground"))
+    history = History()
+    for x in range(20, 300, 10):
+        history.execute(MoveObject(objects, obj_id, x, 50))
+    history.checkpoint()
+    history.execute(MoveObject(objects, obj_id, 500, 500))
+    assert len(history) == 2
+    history.undo()
+    assert (objects[obj_id].x, objects[obj_id].y) == (290, 50)
+    history.undo()
+    assert (objects[obj_id].x, objects[obj_id].y) == (10, 10)
+    print("✓ 28 moves of one drag undone in one step")
+
+    # A new edit after undo drops the redo stack
+    history.redo()
+    history.checkpoint()
+    history.execute(MoveObject(objects, obj_id, 0, 0))
+    assert not history.can_redo
+    print("✓ New edits clear redo")
+
+    history = History(max_entries=10)
+    for x in range(50):
+        history.execute(MoveObject(objects, obj_id, x, 0))
+        history.checkpoint()
+    assert len(history) == 10
+    while history.undo():
+        pass
+    assert objects[obj_id].x == 39
+    print("✓ Only the newest 10 entries are kept")
+
+    many = EditorObjects()
+    for i in range(1000):
+        many.add(Platform(i, 0, 10, 10, "ground"))
+    history = History(max_bytes=300_000)
+    history.execute(ClearObjects([many]))
+    history.checkpoint()
+    for i in range(10):
+        history.execute(AddObject(many, Platform(i, 0, 10, 10, "ground")))
+        history.checkpoint()
+    assert history.stats()["bytes"] <= 300_000
+    assert len(history) == 10, "the clear holding 1000 objects should have been dropped"
+    print("✓ Entries dropped when the size estimate goes over the cap")
+    print()
+    return True
+
+
+def test_editor_undo():
+    """Editor actions go through the history"""
+    print("=" * 60)
+    print("TEST: Editor Undo")
+    print("=" * 60)
+
+    from level_editor import LevelEditor
+    editor = LevelEditor()
+    editor.add_platform((100, 100), (300, 140))
+    editor.add_obstacle((500, 500), (540, 530))
+    (platform_id, platform), = editor.platforms.items()
+
+    def send(event_type, **attributes):
+        pygame.event.post(pygame.event.Event(event_type, **attributes))
+        assert editor.handle_events()
+
+    send(pygame.MOUSEBUTTONDOWN, pos=(150, 120), button=1)
+    for x in range(160, 400, 8):
+        send(pygame.MOUSEMOTION, pos=(x, 200), rel=(0, 0), buttons=(1, 0, 0))
+    send(pygame.MOUSEBUTTONUP, pos=(392, 200), button=1)
+    assert platform.x == 342 and len(editor.history) == 3
+    print("✓ A drag of 30 motion events is one history entry")
+
+    editor.delete_selected()
+    assert len(editor.platforms) == 0
+    send(pygame.KEYDOWN, key=pygame.K_z, mod=pygame.KMOD_LCTRL, unicode='', scancode=0)
+    assert editor.platforms[platform_id] is platform
+    send(pygame.KEYDOWN, key=pygame.K_z, mod=pygame.KMOD_LCTRL, unicode='', scancode=0)
+    assert (platform.x, platform.y) == (100, 100)
+    assert editor.platforms.pick(150, 120) == platform_id
+    print("✓ Ctrl+Z restores the deleted platform with its id, then its position")
+
+    send(pygame.KEYDOWN, key=pygame.K_y, mod=pygame.KMOD_LCTRL, unicode='', scancode=0)
+    assert platform.x == 342
+    print("✓ Ctrl+Y redoes the drag")
+
+    editor.set_level_property('spawn_point', (10, 20))
+    editor.undo()
+    assert editor.spawn_point == (100, 100)
+    editor.set_object_property('platform', platform_id, 'width', 400)
+    assert editor.platforms.pick(700, 200 + 5) == platform_id
+    editor.undo()
+    assert platform.width == 200 and editor.platforms.pick(700, 205) is None
+    print("✓ Level and object properties undo")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " EDITOR HISTORY TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_undo_redo_random_edits, test_coalescing_and_memory_cap, test_editor_undo]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL EDITOR HISTORY TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test editor object ids, picking and dragging
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+sys.path.insert(0, os.path.join(script_dir, "Editor"))
+
+import pygame
+from editor_objects import EditorObjects
+from level_data import Platform
+from level_editor import LevelEditor
+
+
+def brute_force_pick(objects, x, y):
+    """First object in id order whose pygame.Rect contains the point"""
+    for object_id, obj in sorted(objects.items()):
+        if pygame.Rect(obj.x, obj.y, obj.width, obj.height).collidepoint(x, y):
+            return object_id
+    return None
+
+
+def test_pick_matches_brute_force():
+    """Picking through the index agrees with testing every rect"""
+    print("=" * 60)
+    print("TEST: Editor Object Picking")
+    print("=" * 60)
+
+    rng = random.Random(5)
+    objects = EditorObjects()
+    for _ in range(800):
+        objects.add(Platform(rng.uniform(0, 1000), rng.uniform(0, 800),
+                             rng.uniform(1, 150), rng.uniform(1, 60), "ground", (0, 0, 0)))
+
+    ids = [object_id for object_id, _ in objects.items()]
+    for step in range(2000):
+        object_id = rng.choice(ids)
+        if object_id in objects:
+            if step % 7 == 0:
+                objects.remove(object_id)
+            else:
+                objects.move(object_id, rng.uniform(0, 1000), rng.uniform(0, 800))
+        x, y = rng.randrange(0, 1000), rng.randrange(0, 800)
+        assert objects.pick(x, y) == brute_force_pick(objects, x, y), (x, y)
+    print(f"✓ 2000 picks match a full scan over {len(objects)} objects")
+
+    # Ids stay valid after other objects are removed, and removed ids aren't reused
+    first, second = ids[0], ids[-1]
+    if first in objects and second in objects:
+        kept = objects[second]
+        objects.remove(first)
+        assert objects[second] is kept
+    new_id = objects.add(Platform(0, 0, 10, 10, "ground", (0, 0, 0)))
+    assert new_id > max(ids)
+    print("✓ Ids are stable and never reused")
+    print()
+    return True
+
+
+def test_editor_select_drag_delete():
+    """The editor selects by id, and deleting other objects keeps the selection"""
+    print("=" * 60)
+    print("TEST: Editor Selection on a Large Level")
+    print("=" * 60)
+
+    rng = random.Random(9)
+    platforms = [{"x": rng.uniform(0, 1000), "y": rng.uniform(100, 800), "width": 40, "height": 10}
+                 for _ in range(20000)]
+    platforms.append({"x": 500, "y": 20, "width": 100, "height": 40})
+    data = {"name": "Big", "platforms": platforms,
+            "obstacles": [{"x": 700, "y": 20, "width": 50, "height": 50}]}
+
+    editor = LevelEditor()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        editor.load_from_file(path)
+    assert len(editor.platforms) == 20001 and len(editor.obstacles) == 1
+
+    start = time.perf_counter()
+    editor.handle_canvas_click((520, 30))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    obj_type, obj_id = editor.selected_object
+    assert obj_type == 'platform' and editor.platforms[obj_id].x == 500
+    print(f"✓ Click on a 20001 platform level picked the right object in {elapsed_ms:.3f} ms")
+
+    # Delete an earlier object: the selection still points at the same platform
+    selected = editor.platforms[obj_id]
+    editor.platforms.remove(next(iter(editor.platforms.items()))[0])
+    assert editor.platforms[obj_id] is selected
+
+    editor.drag_object((320, 40))
+    assert (selected.x, selected.y) == (300, 30)
+    editor.dragging = False
+    editor.handle_canvas_click((310, 35))
+    assert editor.selected_object == ('platform', obj_id)
+    editor.handle_canvas_click((520, 30))
+    assert editor.selected_object is None
+    print("✓ Dragged platform is found at its new position only")
+
+    editor.handle_canvas_click((710, 30))
+    assert editor.selected_object[0] == 'obstacle'
+    editor.delete_selected()
+    assert len(editor.obstacles) == 0 and editor.selected_object is None
+    print("✓ Obstacle selected and deleted by id")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " EDITOR OBJECTS TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_pick_matches_brute_force, test_editor_select_drag_delete]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL EDITOR OBJECTS TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
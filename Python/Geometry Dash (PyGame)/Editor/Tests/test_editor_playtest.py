@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test playtesting levels inside the editor
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+sys.path.insert(0, os.path.join(script_dir, "Editor"))
+
+import pygame
+from editor_history import DeleteObject
+from renderer import PLAYER_COLOR
+from simulation import SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+def key(editor, event_type, key_code):
+    pygame.event.post(pygame.event.Event(event_type, key=key_code, mod=0, unicode='', scancode=0))
+    assert editor.handle_events()
+
+
+def play(editor, seconds):
+    """Step the playtest by fixed frames instead of real time"""
+    for _ in range(int(seconds * 60)):
+        editor.playtest.update(1 / 60)
+        if editor.playtest.finished:
+            break
+
+
+def test_playtest_round_trip():
+    """F5 plays the level from memory, ESC returns to the same editing state"""
+    print("=" * 60)
+    print("TEST: Editor Playtest Round Trip")
+    print("=" * 60)
+
+    from level_editor import EditorMode, LevelEditor
+    editor = LevelEditor()
+    editor.add_platform((0, 700), (1000, 800))
+    editor.add_platform((600, 500), (700, 520))
+    moving_id = [obj_id for obj_id, _ in editor.platforms.items()][-1]
+    editor.set_object_property('platform', moving_id, 'platform_type', 'moving')
+    editor.set_object_property('platform', moving_id, 'speed', 100)
+    editor.set_level_property('spawn_point', (100, 600))
+    editor.set_level_property('end_point', (500, 670))
+    editor.selected_object = ('platform', moving_id)
+    editor.mode = EditorMode.ADD_OBSTACLE
+    history_length = len(editor.history)
+    moving = editor.platforms[moving_id]
+
+    key(editor, pygame.KEYDOWN, pygame.K_F5)
+    assert editor.playtest is not None
+    level = editor.playtest.level
+    assert all(a is b for a, b in zip(level.platforms, editor.platforms))
+    print("✓ The playtest level shares the editor's objects, no file involved")
+
+    editor.refresh()
+    state = editor.playtest.state
+    assert (state.screen_width, state.screen_height) == (SCREEN_WIDTH, SCREEN_HEIGHT)
+    player_x = int(state.player_pos.x - state.camera_x) - editor.playtest.view_x
+    assert editor.screen.get_at((player_x, int(state.player_pos.y)))[:3] == PLAYER_COLOR
+    print("✓ The run is played at the game's screen size and drawn on the canvas")
+
+    key(editor, pygame.KEYDOWN, pygame.K_RIGHT)
+    play(editor, 5)
+    assert state.level_complete, (state.player_pos, state.game_over)
+    assert state.platforms[1].x != moving.x and moving.x == 600
+    print(f"✓ Level completed in {state.elapsed_time:.2f}s; the moving platform moved, the editor's didn't")
+
+    key(editor, pygame.KEYDOWN, pygame.K_r)
+    assert editor.playtest.state is not state and editor.playtest.state.elapsed_time == 0
+    print("✓ R restarts the run")
+
+    key(editor, pygame.KEYDOWN, pygame.K_ESCAPE)
+    assert editor.playtest is None and editor.needs_redraw
+    assert editor.mode == EditorMode.ADD_OBSTACLE and editor.selected_object == ('platform', moving_id)
+    assert len(editor.history) == history_length
+    editor.refresh()
+    assert editor.screen.get_at((100, 590))[:3] == (100, 200, 100)  # Spawn marker
+    print("✓ ESC returns to editing with mode, selection and history untouched")
+
+    key(editor, pygame.KEYDOWN, pygame.K_F5)
+    assert editor.playtest.level is level and editor.playtest.state.elapsed_time == 0
+    key(editor, pygame.KEYDOWN, pygame.K_F5)
+    print("✓ Playing the unchanged level again reuses it")
+
+    # Falling off the level ends the run
+    editor.set_level_property('spawn_point', (100, 100))
+    editor.history.execute(DeleteObject(editor.platforms, 1))
+    editor.start_playtest()
+    assert editor.playtest.level is not level and len(editor.playtest.level.platforms) == 1
+    play(editor, 5)
+    assert editor.playtest.state.game_over
+    editor.stop_playtest()
+    print("✓ Game over when the player falls")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def test_playtest_start_time():
+    """Starting a playtest of a big level takes about a frame"""
+    print("=" * 60)
+    print("TEST: Playtest Start Time")
+    print("=" * 60)
+
+    from level_editor import LevelEditor
+    editor = LevelEditor()
+    for i in range(10_000):
+        editor.add_platform((i % 100 * 10, 300 + i // 100 * 5), (i % 100 * 10 + 8, 303 + i // 100 * 5))
+    editor.history.clear()
+
+    def round_trip():
+        start = time.perf_counter()
+        editor.start_playtest()
+        editor.refresh()
+        editor.stop_playtest()
+        return time.perf_counter() - start
+
+    first = round_trip()
+    again = min(round_trip() for _ in range(5))
+    print(f"✓ 10000 objects: first playtest and its first frame in {first * 1000:.1f} ms")
+    print(f"✓ Playing it again without edits in {again * 1000:.1f} ms")
+    assert again < first and again < 1 / 60
+
+    pygame.quit()
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " EDITOR PLAYTEST TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_playtest_round_trip, test_playtest_start_time]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL EDITOR PLAYTEST TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test that the editor's partial redraws match drawing everything
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+sys.path.insert(0, os.path.join(script_dir, "Editor"))
+
+import pygame
+from level_editor import LevelEditor
+
+
+def make_editor():
+    """Editor with a crowded level, including small objects whose labels stick out"""
+    rng = random.Random(4)
+    platforms = [{"x": rng.randrange(0, 990), "y": rng.randrange(40, 790),
+                  "width": rng.choice([8, 15, 60, 200]), "height": rng.choice([6, 20, 40]),
+                  "type": rng.choice(["ground", "spring", "moving"])}
+                 for _ in range(300)]
+    obstacles = [{"x": rng.randrange(0, 990), "y": rng.randrange(40, 790),
+                  "width": rng.choice([10, 30, 50]), "height": rng.choice([10, 30]), "type": "spike"}
+                 for _ in range(150)]
+    platforms.append({"x": 400, "y": 400, "width": 120, "height": 30, "type": "ground"})
+
+    editor = LevelEditor()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "crowded.json")
+        with open(path, "w") as f:
+            json.dump({"name": "Crowded", "spawn_point": [100, 700], "end_point": [900, 300],
+                       "platforms": platforms, "obstacles": obstacles}, f)
+        editor.load_from_file(path)
+    editor.draw()
+    return editor
+
+
+def send(editor, event_type, **attributes):
+    pygame.event.post(pygame.event.Event(event_type, **attributes))
+    assert editor.handle_events()
+
+
+def assert_matches_full_redraw(editor, what):
+    """The screen after partial redraws equals a full redraw of the same state"""
+    partial = editor.screen.copy()
+    editor.draw()
+    full = editor.screen.copy()
+    editor.screen.blit(partial, (0, 0))
+    assert pygame.image.tobytes(partial, "RGB") == pygame.image.tobytes(full, "RGB"), what
+
+
+def test_drag_redraws_dirty_areas():
+    """Dragging only redraws the areas the object left and entered"""
+    print("=" * 60)
+    print("TEST: Editor Drag Redraw")
+    print("=" * 60)
+
+    editor = make_editor()
+    send(editor, pygame.MOUSEBUTTONDOWN, pos=(460, 415), button=1)
+    assert editor.selected_object is not None and editor.needs_redraw
+    editor.refresh()
+
+    rng = random.Random(1)
+    x, y = 460, 415
+    for step in range(120):
+        x = max(0, min(999, x + rng.randint(-40, 40)))
+        y = max(0, min(799, y + rng.randint(-40, 40)))
+        send(editor, pygame.MOUSEMOTION, pos=(x, y), rel=(0, 0), buttons=(1, 0, 0))
+        assert not editor.needs_redraw and editor.dirty_rects
+        editor.refresh()
+        if step % 20 == 19:
+            assert_matches_full_redraw(editor, f"drag step {step}")
+    print("✓ 120 drag steps redrawn through dirty rects match a full redraw")
+
+    send(editor, pygame.MOUSEBUTTONUP, pos=(x, y), button=1)
+    send(editor, pygame.MOUSEMOTION, pos=(x + 5, y), rel=(0, 0), buttons=(0, 0, 0))
+    assert not editor.needs_redraw and not editor.dirty_rects
+    print("✓ Moving the mouse over the canvas redraws nothing")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def test_placing_and_hover():
+    """The placement line and button hover redraw only their areas"""
+    print("=" * 60)
+    print("TEST: Editor Placement and Hover Redraw")
+    print("=" * 60)
+
+    editor = make_editor()
+    add_platform = editor.buttons['add_platform'].rect.center
+    send(editor, pygame.MOUSEBUTTONDOWN, pos=add_platform, button=1)
+    send(editor, pygame.MOUSEBUTTONDOWN, pos=(300, 300), button=1)
+    editor.refresh()
+    assert editor.temp_start == (300, 300)
+
+    for pos in [(350, 320), (600, 100), (120, 700), (990, 790), (310, 305)]:
+        send(editor, pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+        assert not editor.needs_redraw
+        editor.refresh()
+        assert_matches_full_redraw(editor, f"line to {pos}")
+    print("✓ Placement line follows the mouse through dirty rects")
+
+    send(editor, pygame.MOUSEBUTTONDOWN, pos=(310, 305), button=1)
+    editor.refresh()
+    assert editor.temp_start is None and len(editor.platforms) == 302
+
+    save = editor.buttons['save'].rect.center
+    for pos in [save, (1300, 700), save]:
+        send(editor, pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+        assert not editor.needs_redraw
+        assert all(rect == editor.panel_rect for rect in editor.dirty_rects)
+        editor.refresh()
+        assert_matches_full_redraw(editor, f"hover at {pos}")
+    print("✓ Button hover redraws only the panel")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " EDITOR REDRAW TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_drag_redraws_dirty_areas, test_placing_and_hover]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL EDITOR REDRAW TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
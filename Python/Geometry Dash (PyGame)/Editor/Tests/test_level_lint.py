@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the level linter
+"""
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+# Add root directory to path to find level_lint
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_binary import compile_level_file
+from level_fixtures import write_level
+from level_lint import MAX_ISSUES_PER_CHECK, find_overlaps, lint_directory, lint_file, main as lint_main
+from simulation import int_rect, rects_collide
+
+
+# Only edges touch, so none of the checks should fire
+CLEAN_PLATFORMS = [
+    {"x": 0, "y": 600, "width": 500, "height": 20, "type": "ground"},
+    # Touches the first platform and the box on it
+    {"x": 500, "y": 600, "width": 500, "height": 20, "type": "ground"},
+    {"x": 300, "y": 450, "width": 120, "height": 20, "type": "moving", "speed": 50},
+]
+CLEAN_OBSTACLES = [
+    {"x": 500, "y": 560, "width": 40, "height": 40, "type": "box"},
+    {"x": 320, "y": 440, "width": 40, "height": 40, "type": "moving_box", "speed": 50},
+]
+
+
+def write_clean_level(levels_dir, level_name, **overrides):
+    """write_level() with the clean platforms and obstacles"""
+    overrides = {"platforms": CLEAN_PLATFORMS, "obstacles": CLEAN_OBSTACLES, **overrides}
+    return write_level(levels_dir, level_name, **overrides)
+
+
+def checks(report):
+    return sorted(report.counts)
+
+
+def test_sweep_matches_all_pairs():
+    """The sweep line finds exactly the pairs the game's collision test does"""
+    print("=" * 60)
+    print("TEST: Sweep Line Overlaps")
+    print("=" * 60)
+
+    rng = random.Random(7)
+    for _ in range(20):
+        rects = [int_rect(rng.randrange(0, 400, 10), rng.randrange(0, 400, 10),
+                          rng.choice([-30, 0, 10, 20, 40, 200]), rng.choice([-20, 10, 20, 40]))
+                 for _ in range(60)]
+        boxes = [None if not (w and h) else (min(x, x + w), min(y, y + h), max(x, x + w), max(y, y + h))
+                 for x, y, w, h in rects]
+        expected = {(i, j) for i in range(len(rects)) for j in range(i + 1, len(rects))
+                    if rects_collide(rects[i], rects[j])}
+        found = list(find_overlaps(boxes))
+        assert len(found) == len(set(found)) and set(found) == expected
+    print("✓ Same pairs as rects_collide on every pair, touching boxes excluded")
+    print()
+    return True
+
+
+def test_level_checks():
+    """Each check reports its problem and nothing else"""
+    print("=" * 60)
+    print("TEST: Level Checks")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        write_clean_level(levels_dir, "clean")
+        report = lint_file(levels_dir, "clean")
+        assert report.counts == {} and report.objects == 5
+        print("✓ Touching objects and overlapping moving objects are fine")
+
+        clean = json.load(open(os.path.join(levels_dir, "clean.json")))
+        platforms = clean["platforms"] + [{"x": 450, "y": 590, "width": 100, "height": 40, "type": "ground"}]
+        write_clean_level(levels_dir, "overlap", platforms=platforms)
+        report = lint_file(levels_dir, "overlap")
+        assert checks(report) == ["overlap"] and report.counts["overlap"] == 3
+        assert report.warnings == 3 and report.errors == 0
+        assert "platform 0 overlaps platform 3" in [issue.message for issue in report.issues]
+        assert "platform 3 overlaps obstacle 0" in [issue.message for issue in report.issues]
+        print(f"✓ Overlaps reported as warnings: {report.issues[0].message}")
+
+        write_clean_level(levels_dir, "spawn", spawn_point=[515, 570])
+        assert checks(lint_file(levels_dir, "spawn")) == ["spawn"]
+        write_clean_level(levels_dir, "beside", spawn_point=[560, 570])
+        assert lint_file(levels_dir, "beside").counts == {}
+        write_clean_level(levels_dir, "end", end_point=[1300, 300])
+        assert checks(lint_file(levels_dir, "end")) == ["end_point"]
+        write_clean_level(levels_dir, "wide", end_point=[1300, 300], width=2000)
+        assert lint_file(levels_dir, "wide").counts == {}
+        print("✓ Spawn inside an obstacle and end point outside the level are errors")
+
+        obstacles = [dict(clean["obstacles"][0], color=[255, 0]),
+                     dict(clean["obstacles"][1], color=[255, 0, 300])]
+        write_clean_level(levels_dir, "color", obstacles=obstacles, background_color=[0, 0, 0, 255])
+        report = lint_file(levels_dir, "color")
+        assert checks(report) == ["color"] and report.counts["color"] == 2
+        print("✓ Bad colors reported")
+
+        platforms = [{"x": 0, "y": 600, "width": 0, "height": 20}, {"x": "0", "y": 600, "height": 20}]
+        write_clean_level(levels_dir, "schema", platforms=platforms, difficulty=11, time_limit=-1)
+        report = lint_file(levels_dir, "schema")
+        assert checks(report) == ["schema"] and report.counts["schema"] == 4
+        assert any("x, width missing or not a number" in issue.message for issue in report.issues)
+        with open(os.path.join(levels_dir, "broken.json"), 'w') as f:
+            f.write('{"name": "Broken", "platforms": [')
+        assert checks(lint_file(levels_dir, "broken")) == ["schema"]
+        write_clean_level(levels_dir, "wrong_type", name=5, spawn_point=[515, 570])
+        assert checks(lint_file(levels_dir, "wrong_type")) == ["schema"]
+        write_clean_level(levels_dir, "float_difficulty", difficulty=2.0)
+        assert lint_file(levels_dir, "float_difficulty").counts == {}
+        write_clean_level(levels_dir, "fraction", difficulty=2.5)
+        assert checks(lint_file(levels_dir, "fraction")) == ["schema"]
+        print("✓ Schema errors reported, unparseable levels stop there")
+        print("✓ Whole-number float difficulties load and are accepted")
+
+        platforms = [{"x": 0, "y": 600, "width": 100, "height": 20}] * (MAX_ISSUES_PER_CHECK + 5)
+        write_clean_level(levels_dir, "many", platforms=platforms, obstacles=[])
+        report = lint_file(levels_dir, "many")
+        assert len(report.issues) == MAX_ISSUES_PER_CHECK
+        assert report.counts["overlap"] == (MAX_ISSUES_PER_CHECK + 5) * (MAX_ISSUES_PER_CHECK + 4) // 2
+        print("✓ Issues past the limit are counted, not listed")
+    print()
+    return True
+
+
+def test_directory_and_cli():
+    """A folder is linted in parallel and reported as text or JSON"""
+    print("=" * 60)
+    print("TEST: Directory and CLI")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        write_clean_level(levels_dir, "clean")
+        compile_level_file(write_clean_level(levels_dir, "compiled", end_point=[-5, 300]))
+        os.remove(os.path.join(levels_dir, "compiled.json"))
+        write_clean_level(levels_dir, "end", end_point=[1300, 300])
+
+        reports = lint_directory(levels_dir, workers=2)
+        assert list(reports) == ["clean", "compiled", "end"]
+        assert reports["compiled"].file == "compiled.gdl" and checks(reports["compiled"]) == ["end_point"]
+        print("✓ JSON and compiled levels linted across processes")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            assert lint_main(["clean", "--levels-dir", levels_dir, "--workers", "1"]) == 0
+        assert "✓ clean" in output.getvalue()
+
+        report_path = os.path.join(levels_dir, "report.json")
+        assert lint_main(["--levels-dir", levels_dir, "--format", "json", "--output", report_path]) == 1
+        with open(report_path) as f:
+            report = json.load(f)
+        levels = {level["level_name"]: level for level in report["levels"]}
+        assert levels["end"]["counts"] == {"end_point": 1}
+        assert levels["end"]["issues"][0]["severity"] == "error"
+        print("✓ Exit status 1 with errors, JSON report written")
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " LEVEL LINT TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_sweep_matches_all_pairs, test_level_checks, test_directory_and_cli]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL LEVEL LINT TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
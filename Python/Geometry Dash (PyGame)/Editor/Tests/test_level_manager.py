@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Tests for LevelManager loading, catalog and caching behaviour
+"""
+import os
+import random
+import sys
+import tempfile
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_manager import LevelManager, GameState, parse_level_data
+from level_binary import compile_level_file
+from level_fixtures import write_level
+
+
+def test_lazy_catalog():
+    """Test that levels are listed without being parsed"""
+    print("=" * 60)
+    print("TEST: Lazy Level Catalog")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        write_level(levels_dir, "alpha", difficulty=3)
+        write_level(levels_dir, "beta", name="Beta \"Quoted\"")
+
+        lm = LevelManager(levels_dir)
+        assert lm.list_levels() == ["alpha", "beta"]
+        assert len(lm.levels) == 0, "Levels should not be parsed up front"
+
+        info = lm.get_level_info("alpha")
+        assert info.name == "Level alpha"
+        assert info.difficulty == 3
+        assert lm.get_level_info("beta").name == "Beta \"Quoted\""
+        print(f"✓ Catalog: {lm.list_levels()}")
+
+        level = lm.get_level("alpha")
+        assert list(lm.levels) == ["alpha"]
+        assert len(level.platforms) == 2
+        print(f"✓ Parsed on first access: {level.name}")
+
+        eager = LevelManager(levels_dir, lazy=False)
+        assert sorted(eager.levels) == ["alpha", "beta"]
+        assert eager.list_levels() == lm.list_levels()
+        print("✓ Eager mode still parses everything")
+
+    print()
+    return True
+
+
+def test_compiled_level():
+    """Test that compiled levels load the same data as their JSON source"""
+    print("=" * 60)
+    print("TEST: Compiled Binary Levels")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        json_path = write_level(levels_dir, "gamma", time_limit=12.5)
+        expected = LevelManager(levels_dir).get_level("gamma")
+
+        compiled_path = compile_level_file(json_path)
+        os.remove(json_path)
+        print(f"✓ Compiled: {os.path.basename(compiled_path)} ({os.path.getsize(compiled_path)} bytes)")
+
+        lm = LevelManager(levels_dir)
+        assert lm.list_levels() == ["gamma"]
+        assert lm.get_level_info("gamma").name == expected.name
+
+        level = lm.get_level("gamma")
+        for field in ("name", "difficulty", "time_limit", "background_color", "spawn_point", "end_point"):
+            assert getattr(level, field) == getattr(expected, field), field
+        assert list(level.platforms) == list(expected.platforms)
+        assert list(level.obstacles) == list(expected.obstacles)
+        assert level.platforms.rect(0) == (0, 600, 1000, 20)
+
+        # Moving records are materialized once when the file is mapped
+        assert level.platforms[1] is level.platforms[1]
+        assert level.platforms.moving_indices() == [1]
+        print(f"✓ Loaded from mmap: {len(level.platforms)} platforms, {len(level.obstacles)} obstacles")
+
+        # Grids and x indexes are built from column views of the records
+        columns = level.platforms.columns()
+        assert [tuple(column[i] for column in columns) for i in range(2)] == [level.platforms.rect(i) for i in range(2)]
+        del columns  # Views keep the file mapped
+        assert level.static_platform_grid.query(0, 0, 1000, 700) == expected.static_platform_grid.query(0, 0, 1000, 700)
+        assert level.static_obstacle_x_index.query(0, 1000) == expected.static_obstacle_x_index.query(0, 1000)
+        print("✓ Collision grids and x indexes built from record columns match the JSON level's")
+
+        # Recompiling replaces the mapped file; the reloaded level replaces
+        # the old one in the cache, which closes it but leaves it usable
+        platforms = list(level.platforms)
+        compile_level_file(write_level(levels_dir, "gamma"))
+        os.remove(json_path)
+        reloaded = lm.reload_level("gamma")
+        assert reloaded is not level and list(level.platforms) == platforms
+        if os.path.exists("/proc/self/maps"):
+            with open("/proc/self/maps") as f:
+                stale = [line for line in f if compiled_path in line and line.rstrip().endswith("(deleted)")]
+            assert not stale, stale
+        print("✓ Replaced levels are unmapped and keep working from memory")
+
+        del level, reloaded, lm
+
+    print()
+    return True
+
+
+def test_level_cache():
+    """Test LRU eviction and invalidation when a level file changes"""
+    print("=" * 60)
+    print("TEST: Bounded Level Cache")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        for level_name in ("one", "two", "three"):
+            write_level(levels_dir, level_name)
+
+        lm = LevelManager(levels_dir, cache_entries=2)
+        first = lm.get_level("one")
+        assert lm.get_level("one") is first
+        lm.get_level("two")
+        lm.get_level("three")
+        assert list(lm.levels) == ["two", "three"], "Least recently used level should be evicted"
+
+        stats = lm.cache_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 3 and stats["evictions"] == 1
+        print(f"✓ LRU eviction: {stats}")
+
+        level = lm.get_level("three")
+        filepath = write_level(levels_dir, "three", name="Edited Three")
+        stat = os.stat(filepath)
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        edited = lm.get_level("three")
+        assert edited is not level and edited.name == "Edited Three"
+        assert lm.cache_stats()["invalidations"] == 1
+        print(f"✓ Reloaded after edit: {edited.name}")
+
+        lm = LevelManager(levels_dir, cache_entries=0, cache_bytes=1)
+        lm.get_level("one")
+        lm.get_level("two")
+        assert list(lm.levels) == ["two"], "Byte budget should keep only the newest level"
+        print("✓ Byte budget respected")
+
+    print()
+    return True
+
+
+def test_level_templates():
+    """Test that runs never modify the cached level template"""
+    print("=" * 60)
+    print("TEST: Immutable Level Templates")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        write_level(levels_dir, "delta")
+        lm = LevelManager(levels_dir)
+        level = lm.get_level("delta")
+        start_x = level.platforms[1].x
+
+        first = GameState(level, 1000, 720)
+        second = GameState(level, 1000, 720)
+        assert first.platforms[0] is level.platforms[0], "Static objects should be shared"
+
+        for _ in range(30):
+            first.update(1.0 / 60.0)
+
+        assert level.platforms[1].x == start_x, "Template should not move"
+        assert first.platforms[1].x > start_x
+        assert second.platforms[1].x == start_x, "Runs should not share moving objects"
+        print(f"✓ Run moved platform to x={first.platforms[1].x:.1f}, template stays at x={start_x}")
+
+        retry = GameState(lm.get_level("delta"), 1000, 720)
+        assert retry.platforms[1].x == start_x
+        print("✓ Retry starts from the original layout")
+
+    print()
+    return True
+
+
+def random_level_data(seed, object_count):
+    """Random level dictionary with static, moving and spring objects"""
+    rng = random.Random(seed)
+    platforms = [{"x": 0, "y": 650, "width": 1000, "height": 30, "type": "ground"}]
+    obstacles = []
+    for _ in range(object_count):
+        kind = rng.choice(["ground", "ground", "spring", "moving"])
+        platforms.append({
+            "x": rng.uniform(0, 950), "y": rng.uniform(100, 640),
+            "width": rng.uniform(20, 200), "height": rng.uniform(10, 30),
+            "type": kind, "speed": 80 if kind == "moving" else 0
+        })
+        if rng.random() < 0.3:
+            moving = rng.random() < 0.3
+            obstacles.append({
+                "x": rng.uniform(0, 950), "y": rng.uniform(100, 640),
+                "width": rng.uniform(10, 40), "height": rng.uniform(10, 40),
+                "type": "moving_box" if moving else "spike", "speed": 60 if moving else 0
+            })
+    return {"name": f"Random {seed}", "spawn_point": [rng.uniform(50, 950), 50],
+            "end_point": [5000, 5000], "platforms": platforms, "obstacles": obstacles}
+
+
+class FullScanGameState(GameState):
+    """GameState that tests every object, as before the broadphase existed"""
+
+    def _nearby(self, static_grid, moving_grid, rect):
+        return range(len(self.platforms) if static_grid is self.static_platform_grid else len(self.obstacles))
+
+
+def test_broadphase_matches_full_scan():
+    """Test that the spatial hash gives the same results as testing every object"""
+    print("=" * 60)
+    print("TEST: Spatial Hash Broadphase")
+    print("=" * 60)
+
+    for seed in range(20):
+        level = parse_level_data(random_level_data(seed, 60))
+        fast = GameState(level, 1000, 720)
+        slow = FullScanGameState(level, 1000, 720)
+        rng = random.Random(seed)
+
+        for frame in range(240):
+            if rng.random() < 0.05:
+                fast.jump()
+                slow.jump()
+            direction = rng.choice(['left', 'right', None])
+            fast.keys_pressed = {direction} if direction else set()
+            slow.keys_pressed = set(fast.keys_pressed)
+
+            fast.update(1.0 / 60.0)
+            slow.update(1.0 / 60.0)
+            assert (fast.player_pos, fast.player_velocity_y, fast.game_over) == \
+                (slow.player_pos, slow.player_velocity_y, slow.game_over), f"seed {seed} frame {frame}"
+
+    print("✓ 20 random levels x 240 frames match a full scan")
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " LEVEL MANAGER TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [
+        ("Lazy Level Catalog", test_lazy_catalog),
+        ("Compiled Binary Levels", test_compiled_level),
+        ("Bounded Level Cache", test_level_cache),
+        ("Immutable Level Templates", test_level_templates),
+        ("Spatial Hash Broadphase", test_broadphase_matches_full_scan),
+    ]
+
+    results = []
+    for test_name, test_func in tests:
+        try:
+            result = test_func()
+            results.append((test_name, result))
+        except Exception as e:
+            print(f"✗ Exception in {test_name}: {e}")
+            import traceback
+            traceback.print_exc()
+            results.append((test_name, False))
+            print()
+
+    print("=" * 60)
+    print("TEST SUMMARY")
+    print("=" * 60)
+    passed = sum(1 for _, result in results if result)
+    total = len(results)
+    for test_name, result in results:
+        status = "✓ PASS" if result else "✗ FAIL"
+        print(f"{status}: {test_name}")
+
+    print()
+    print(f"Total: {passed}/{total} tests passed")
+    print()
+
+    return 0 if passed == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the levels folder manifest
+"""
+import os
+import sys
+import tempfile
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from editor_autosave import write_custom_level
+from level_binary import compile_level_file
+from level_fixtures import write_level
+from level_manager import LevelManager
+from level_manifest import MANIFEST_FILE, LevelManifest
+
+
+def touch(path):
+    """Move a file's mtime forward so it counts as changed"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_incremental_refresh():
+    """Only new and changed files are read; everything else comes from the manifest file"""
+    print("=" * 60)
+    print("TEST: Incremental Manifest Refresh")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        write_level(levels_dir, "alpha", difficulty=7)
+        beta = write_level(levels_dir, "beta", obstacles=[])
+        manifest = LevelManifest(levels_dir)
+        assert manifest.refresh() and manifest.indexed == 2
+
+        entry = manifest["alpha"]
+        assert (entry.name, entry.difficulty, entry.platforms, entry.obstacles) == ("Level alpha", 7, 2, 1)
+        assert entry.bounds == (0, 450, 1000, 620) and len(entry.hash) == 40
+        assert manifest["beta"].obstacles == 0
+        assert manifest.entries(lambda e: e.difficulty > 5) == [entry]
+        print(f"✓ Indexed: {entry}")
+
+        # A new instance reads the manifest file instead of the levels
+        again = LevelManifest(levels_dir)
+        assert not again.refresh() and again.indexed == 0
+        assert again["alpha"] == entry
+        print("✓ Unchanged folder: nothing read but the manifest")
+
+        write_level(levels_dir, "beta", name="Edited")
+        touch(beta)
+        write_level(levels_dir, "gamma")
+        os.remove(os.path.join(levels_dir, "alpha.json"))
+        again = LevelManifest(levels_dir)
+        assert again.refresh() and again.indexed == 2
+        assert again.names() == ["beta", "gamma"] and again["beta"].name == "Edited"
+        assert again["beta"].hash != manifest["beta"].hash
+        print("✓ Edited and added levels re-indexed, deleted ones dropped")
+
+        with open(os.path.join(levels_dir, "broken.json"), 'w') as f:
+            f.write('{"name": "Broken", "platforms": [')
+        again.refresh()
+        assert again["broken"].error and again.names() == ["beta", "broken", "gamma"]
+        print(f"✓ Unreadable level recorded with its error: {again['broken'].error}")
+
+        with open(os.path.join(levels_dir, MANIFEST_FILE), 'w') as f:
+            f.write("not json")
+        again = LevelManifest(levels_dir)
+        again.refresh()
+        assert again.names() == ["beta", "broken", "gamma"] and again.indexed == 3
+        print("✓ A corrupt manifest is rebuilt")
+    print()
+    return True
+
+
+def test_compiled_levels():
+    """Levels with only a compiled file are indexed from it"""
+    print("=" * 60)
+    print("TEST: Manifest of Compiled Levels")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        json_path = write_level(levels_dir, "delta", difficulty=4)
+        compile_level_file(json_path)
+        manifest = LevelManifest(levels_dir)
+        manifest.refresh()
+        assert manifest["delta"].file == "delta.json"
+        from_json = manifest["delta"]
+
+        os.remove(json_path)
+        manifest.refresh()
+        entry = manifest["delta"]
+        assert entry.file == "delta.gdl"
+        assert (entry.name, entry.difficulty, entry.platforms, entry.obstacles, entry.bounds) == \
+            (from_json.name, from_json.difficulty, from_json.platforms, from_json.obstacles, from_json.bounds)
+        print("✓ Compiled level gives the same metadata as its source")
+    print()
+    return True
+
+
+def test_manifest_users():
+    """The level manager and saving levels go through the manifest"""
+    print("=" * 60)
+    print("TEST: Manifest Users")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        write_level(levels_dir, "custom1")
+        write_level(levels_dir, "custom3", difficulty=9)
+        with open(os.path.join(levels_dir, "broken.json"), 'w') as f:
+            f.write('{"name": "Broken"')
+
+        lm = LevelManager(levels_dir)
+        assert lm.list_levels() == ["custom1", "custom3"]
+        assert lm.get_level_info("custom3").difficulty == 9 and len(lm.levels) == 0
+        print("✓ Level catalog from the manifest, no level parsed")
+
+        path = write_custom_level(levels_dir, {"difficulty": 3, "platforms": [], "obstacles": []})
+        assert os.path.basename(path) == "custom2.json"
+        manifest = LevelManifest(levels_dir)
+        assert manifest["custom2"].name == "Custom Level 2" and not manifest.refresh()
+        assert manifest.next_free_name("custom") == "custom4"
+        print("✓ Saving picks the free name from the manifest and adds the level to it")
+
+        lm = LevelManager(levels_dir)
+        assert lm.manifest.indexed == 0
+        assert lm.list_levels() == ["custom1", "custom2", "custom3"]
+        print("✓ The next start reads nothing but the manifest")
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " LEVEL MANIFEST TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_incremental_refresh, test_compiled_levels, test_manifest_users]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL LEVEL MANIFEST TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for preparing levels on a background thread
+"""
+import os
+import sys
+import tempfile
+import threading
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_fixtures import write_level
+from level_manager import LevelManager, GameState
+from level_prefetch import LevelPrefetcher
+
+
+class StateMaker:
+    """make_state for the prefetcher that records which thread built what"""
+
+    def __init__(self):
+        self.built = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+
+    def __call__(self, level_name, level):
+        self.started.set()
+        self.gate.wait()
+        self.built.append((level_name, threading.current_thread().name))
+        return GameState(level, 1280, 720)
+
+
+def test_prefetch_and_take():
+    """Prefetched states are handed over once, later requests build a new one"""
+    print("=" * 60)
+    print("TEST: Prefetch and Take")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        for name in ("a", "b", "c"):
+            write_level(levels_dir, name)
+        make_state = StateMaker()
+        prefetcher = LevelPrefetcher(LevelManager(levels_dir), make_state)
+
+        prefetcher.prefetch(["a", "b"])
+        assert prefetcher.wait(5)
+        assert prefetcher.is_ready("a") and prefetcher.is_ready("b") and not prefetcher.is_ready("c")
+        assert make_state.built == [("a", "level-prefetch"), ("b", "level-prefetch")]
+        print("✓ Wanted levels built in order on the background thread")
+
+        state = prefetcher.take("a")
+        assert state.level.name == "Level a" and state.elapsed_time == 0
+        assert prefetcher.stats()["hits"] == 1 and not prefetcher.is_ready("a")
+        again = prefetcher.take("a")
+        assert again is not state and make_state.built[-1] == ("a", "MainThread")
+        assert prefetcher.wait(5) and len(make_state.built) == 3
+        print("✓ A state is handed over once; taking the level again builds it on the spot")
+
+        prefetcher.prefetch(["c"])
+        assert prefetcher.wait(5) and prefetcher.is_ready("b") and prefetcher.is_ready("c")
+        assert prefetcher.take("b").level.name == "Level b"
+        assert prefetcher.stats()["hits"] == 2
+        print("✓ Ready states survive a new wanted list")
+        prefetcher.close()
+
+        prefetcher = LevelPrefetcher(LevelManager(levels_dir), StateMaker(), max_ready=1)
+        prefetcher.prefetch(["a"])
+        prefetcher.wait(5)
+        prefetcher.prefetch(["b"])
+        prefetcher.wait(5)
+        assert prefetcher.is_ready("b") and not prefetcher.is_ready("a")
+        prefetcher.close()
+        print("✓ Unwanted ready states are dropped past max_ready")
+    print()
+    return True
+
+
+def test_take_while_building():
+    """Taking a level that is being built waits for it instead of building it twice"""
+    print("=" * 60)
+    print("TEST: Take While Building")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        write_level(levels_dir, "slow")
+        make_state = StateMaker()
+        make_state.gate.clear()
+        prefetcher = LevelPrefetcher(LevelManager(levels_dir), make_state)
+
+        prefetcher.prefetch(["slow"])
+        assert make_state.started.wait(5)
+        threading.Timer(0.1, make_state.gate.set).start()
+        state = prefetcher.take("slow")
+        assert make_state.built == [("slow", "level-prefetch")]
+        assert prefetcher.stats()["hits"] == 1 and state.level.name == "Level slow"
+        prefetcher.close()
+        print("✓ take() waited for the background build and used it")
+    print()
+    return True
+
+
+def test_stale_and_broken_levels():
+    """Changed files are not served from a prefetched state; bad files don't stop the thread"""
+    print("=" * 60)
+    print("TEST: Stale and Broken Levels")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        path = write_level(levels_dir, "a")
+        write_level(levels_dir, "b")
+        with open(os.path.join(levels_dir, "bad.json"), 'w') as f:
+            f.write('{"name": "Bad", "platforms": [')
+        prefetcher = LevelPrefetcher(LevelManager(levels_dir), StateMaker())
+
+        prefetcher.prefetch(["a"])
+        assert prefetcher.wait(5)
+        write_level(levels_dir, "a", name="Edited")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        state = prefetcher.take("a")
+        assert state.level.name == "Edited" and prefetcher.stats()["stale"] == 1
+        print("✓ A level edited after prefetching is built again")
+
+        prefetcher.prefetch(["bad", "b"])
+        assert prefetcher.wait(5)
+        assert prefetcher.stats()["errors"] == 1 and prefetcher.is_ready("b")
+        try:
+            prefetcher.take("bad")
+            assert False, "a broken level should raise when taken"
+        except ValueError:
+            pass
+        prefetcher.close()
+        print("✓ A broken level is reported and the next one still prefetched")
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " LEVEL PREFETCH TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_prefetch_and_take, test_take_while_building, test_stale_and_broken_levels]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL LEVEL PREFETCH TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Tests for merging touching static platforms at load time
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_data import LevelData, Platform
+from level_manager import LevelManager
+from level_simplify import merge_static_platforms, simplify_level
+from simulation import Simulation
+
+GROUND = (100, 200, 100)
+
+
+def ground(x, width, y=600, height=20, platform_type="ground", color=GROUND, speed=0):
+    return Platform(x, y, width, height, platform_type, color, speed)
+
+
+def make_level(platforms, obstacles=(), width=3000):
+    return LevelData(name="Test", difficulty=1, time_limit=0, obstacles=list(obstacles),
+                     platforms=list(platforms), background_color=(0, 0, 0),
+                     spawn_point=(100, 500), end_point=(2900, 100), width=width)
+
+
+def test_rows_merged():
+    """Touching and overlapping pieces of one row become one platform"""
+    print("=" * 60)
+    print("TEST: Rows Merged")
+    print("=" * 60)
+
+    pieces = [ground(x, 40) for x in range(0, 400, 40)]
+    overlapping = ground(390, 60)
+    far = ground(600, 40)
+    platforms = [pieces[3], far] + pieces[:3] + pieces[4:] + [overlapping]
+    merged = merge_static_platforms(platforms)
+    assert len(merged) == 2
+    assert (merged[0].x, merged[0].width) == (0, 450) and merged[1] is far
+    print(f"✓ {len(platforms)} platforms -> {len(merged)}, merged row takes its first piece's place")
+
+    kept = [
+        [ground(0, 40), ground(40, 40, color=(1, 2, 3))],  # different color
+        [ground(0, 40), ground(40, 40, y=601)],  # different y
+        [ground(0, 40), ground(40, 40, platform_type="spring")],  # different type
+        [ground(0, 40), ground(40, 40, height=30)],  # different height
+        [ground(0, 40), ground(41, 40)],  # gap
+        [ground(0, 40.5), ground(40.5, 40)],  # fractional edges
+        [ground(0, 40, platform_type="moving", speed=50), ground(40, 40, platform_type="moving", speed=50)],
+        [ground(0, 40), ground(0, 40, y=580)],  # stacked
+    ]
+    for platforms in kept:
+        assert merge_static_platforms(platforms) == platforms
+    springs = merge_static_platforms([ground(0, 40, platform_type="spring"),
+                                      ground(40, 40, platform_type="spring")])
+    assert len(springs) == 1 and springs[0].platform_type == "spring"
+    print("✓ Only static pieces with the same y, height, type and color and whole coordinates merge")
+
+    level = make_level([ground(0, 40), ground(40, 40)])
+    simplified = simplify_level(level)
+    assert len(simplified.platforms) == 1 and len(level.platforms) == 2
+    unchanged = make_level([ground(0, 40)])
+    assert simplify_level(unchanged) is unchanged
+    print("✓ simplify_level returns a new level only when something merged")
+    print()
+    return True
+
+
+def test_level_order_kept():
+    """A row is cut where merging would change which platform the player lands on first"""
+    print("=" * 60)
+    print("TEST: Level Order Kept")
+    print("=" * 60)
+
+    # The ledge sits on the ground between the ground's pieces in level order
+    ledge = Platform(50, 580, 60, 20, "ground", (200, 0, 0))
+    platforms = [ground(0, 40), ledge, ground(40, 40)]
+    assert merge_static_platforms(platforms) == platforms
+    print("✓ Not merged around a platform listed between the pieces that the player can touch with them")
+
+    ledge = Platform(100, 580, 60, 20, "ground", (200, 0, 0))
+    merged = merge_static_platforms([ground(0, 40), ground(40, 40), ledge, ground(80, 40), ground(120, 40)])
+    assert [(p.x, p.width) for p in merged] == [(0, 80), (100, 60), (80, 80)]
+    print("✓ The rest of the row still merges on each side of the cut")
+
+    assert len(merge_static_platforms([ground(0, 40), ground(40, 40), ledge])) == 2
+    high = Platform(50, 500, 60, 20, "ground", (200, 0, 0))
+    assert len(merge_static_platforms([ground(0, 40), high, ground(40, 40)])) == 2
+    print("✓ Merged when that platform comes after the row or is out of the player's reach")
+
+    mover = Platform(2000, 560, 60, 20, "moving", (0, 0, 200), 100)
+    assert len(merge_static_platforms([ground(0, 40), mover, ground(40, 40)])) == 3
+    print("✓ A moving platform in reach of the row's height blocks merging wherever it starts")
+    print()
+    return True
+
+
+def random_level(rng):
+    """A wide level with rows built from pieces, ledges and springs, in shuffled order"""
+    platforms = [ground(x, 40) for x in range(0, 3000, 40)]
+    for _ in range(12):
+        x, y = rng.randrange(200, 2800), rng.choice([520, 450, 380])
+        platform_type = rng.choice(["ground", "ground", "spring"])
+        for _ in range(rng.randrange(2, 6)):
+            width = rng.randrange(20, 80)
+            platforms.append(ground(x, width, y=y, platform_type=platform_type))
+            x += width - rng.choice([0, 0, 5])
+    for _ in range(15):
+        x = rng.randrange(100, 2900)
+        platforms.append(ground(x + rng.choice([0, 0.5]), rng.randrange(20, 100), y=rng.choice([560, 580, 500]),
+                                color=(200, 100, 0)))
+    platforms.append(Platform(800, 470, 100, 20, "moving", (0, 0, 200), 80))
+    rng.shuffle(platforms)
+    return make_level(platforms)
+
+
+def trace(level, seed):
+    """Player state after every tick of a run with seeded random inputs"""
+    sim = Simulation(level, 1280, 720)
+    rng = random.Random(seed)
+    states = []
+    for tick in range(1200):
+        if tick % 20 == 0:
+            for action in ('left', 'right'):
+                sim.release(action)
+            sim.press(rng.choice(['right', 'right', 'left']))
+            if rng.random() < 0.5:
+                sim.press('jump')
+        sim.step()
+        states.append((sim.player_pos.x, sim.player_pos.y, sim.player_velocity_x, sim.player_velocity_y,
+                       sim.is_jumping, sim.game_over, sim.level_complete))
+    return states
+
+
+def test_runs_unchanged():
+    """Runs on merged levels match runs on the original tick for tick"""
+    print("=" * 60)
+    print("TEST: Runs Unchanged")
+    print("=" * 60)
+
+    before = after = 0
+    for seed in range(8):
+        level = random_level(random.Random(seed))
+        simplified = simplify_level(level)
+        before += len(level.platforms)
+        after += len(simplified.platforms)
+        for run in range(3):
+            assert trace(level, run) == trace(simplified, run), f"level {seed} run {run} differs"
+    assert after < before / 2
+    print(f"✓ 24 runs identical on 8 levels, {before} platforms merged into {after}")
+    print()
+    return True
+
+
+def test_level_manager():
+    """LevelManager merges platforms as levels load and records how many"""
+    print("=" * 60)
+    print("TEST: Level Manager")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        level_data = {
+            "name": "Pieces",
+            "platforms": [{"x": x, "y": 600, "width": 40, "height": 20, "type": "ground"}
+                          for x in range(0, 1280, 40)],
+            "obstacles": [],
+        }
+        with open(os.path.join(levels_dir, "pieces.json"), 'w') as f:
+            json.dump(level_data, f)
+
+        lm = LevelManager(levels_dir)
+        assert len(lm.get_level("pieces").platforms) == 1 and lm.merged_platforms == {"pieces": 31}
+        lm = LevelManager(levels_dir, simplify=False)
+        assert len(lm.get_level("pieces").platforms) == 32 and lm.merged_platforms == {}
+        print("✓ 32 ground pieces loaded as 1 platform; simplify=False keeps them")
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " LEVEL SIMPLIFY TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_rows_merged, test_level_order_kept, test_runs_unchanged, test_level_manager]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL LEVEL SIMPLIFY TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
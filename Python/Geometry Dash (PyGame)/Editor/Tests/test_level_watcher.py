@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for reloading levels that change on disk while the game runs
+"""
+import os
+import sys
+import tempfile
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_data import atomic_write
+from level_fixtures import level_json, write_level
+from level_manager import LevelManager, GameState
+from level_prefetch import LevelPrefetcher
+from level_watcher import LevelWatcher
+
+
+def touch(path):
+    """Move a file's mtime forward so it counts as changed"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def expect_changes(watcher, expected):
+    """Wait for the watcher to report exactly these level names"""
+    assert watcher.wait(5), f"no change reported, expected {expected}"
+    names = watcher.changed()
+    assert names == expected, f"{names} != {expected}"
+    assert watcher.changed() == []
+
+
+def check_backend(levels_dir, watcher):
+    write_level(levels_dir, "a", name="Edited")
+    expect_changes(watcher, ["a"])
+    print(f"✓ [{watcher.backend}] File written in place reported")
+
+    atomic_write(os.path.join(levels_dir, "b.json"), level_json("b", name="Replaced"))
+    expect_changes(watcher, ["b"])
+    print(f"✓ [{watcher.backend}] File replaced by rename reported once, temp file ignored")
+
+    with open(os.path.join(levels_dir, "notes.txt"), 'w') as f:
+        f.write("not a level")
+    assert not watcher.wait(max(0.3, 2 * watcher.poll_interval))
+    os.remove(os.path.join(levels_dir, "a.json"))
+    expect_changes(watcher, ["a"])
+    print(f"✓ [{watcher.backend}] Other files ignored, removed level reported")
+
+
+def test_watcher_backends():
+    """inotify, where available, and polling both report changed levels"""
+    print("=" * 60)
+    print("TEST: Watcher Backends")
+    print("=" * 60)
+
+    for use_inotify in (True, False):
+        with tempfile.TemporaryDirectory() as levels_dir:
+            write_level(levels_dir, "a")
+            write_level(levels_dir, "b")
+            watcher = LevelWatcher(levels_dir, poll_interval=0.05, use_inotify=use_inotify)
+            if use_inotify and watcher.backend != "inotify":
+                print("  inotify not available here, polling instead")
+            try:
+                check_backend(levels_dir, watcher)
+            finally:
+                watcher.close()
+            assert not watcher._thread.is_alive()
+    print()
+    return True
+
+
+def test_reload_level():
+    """Only the changed level is parsed again and replaces the cached one"""
+    print("=" * 60)
+    print("TEST: Reload Level")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        path = write_level(levels_dir, "a")
+        write_level(levels_dir, "b")
+        lm = LevelManager(levels_dir)
+        old = lm.get_level("a")
+        lm.get_level("b")
+
+        write_level(levels_dir, "a", name="Edited", difficulty=5)
+        touch(path)
+        new = lm.reload_level("a")
+        assert new is not old and new.name == "Edited"
+        assert lm.get_level("a") is new and lm.get_level_info("a").difficulty == 5
+        assert lm.manifest["a"].name == "Edited"
+        print("✓ Cached level swapped for the new one, catalog and manifest updated")
+
+        write_level(levels_dir, "c", difficulty=3)
+        assert lm.reload_level("c") is None and "c" not in lm.levels
+        assert lm.list_levels() == ["a", "b", "c"]
+        print("✓ New level added to the catalog without parsing it")
+
+        with open(path, 'w') as f:
+            f.write('{"name": "Half written", "platforms": [')
+        touch(path)
+        try:
+            lm.reload_level("a")
+            assert False, "a broken file should raise"
+        except ValueError:
+            pass
+        assert lm.levels["a"] is new
+        print("✓ Unreadable file keeps the old level")
+
+        os.remove(path)
+        assert lm.reload_level("a") is None
+        assert "a" not in lm.levels and lm.list_levels() == ["b", "c"]
+        print("✓ Removed level dropped from cache and catalog")
+    print()
+    return True
+
+
+def test_reload_through_prefetcher():
+    """A prepared state of a changed level is dropped and built again from the new file"""
+    print("=" * 60)
+    print("TEST: Reload Through Prefetcher")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        path = write_level(levels_dir, "a")
+        prefetcher = LevelPrefetcher(LevelManager(levels_dir),
+                                     lambda level_name, level: GameState(level, 1280, 720))
+        reloaded = []
+
+        def reload_levels(level_names):
+            for level_name in level_names:
+                reloaded.append(prefetcher.reload(level_name))
+
+        watcher = LevelWatcher(levels_dir, on_change=reload_levels)
+        prefetcher.prefetch(["a"])
+        assert prefetcher.wait(5)
+        old = prefetcher.take("a").level
+        prefetcher.prefetch(["a"])
+        assert prefetcher.wait(5)
+
+        write_level(levels_dir, "a", name="Edited")
+        touch(path)
+        expect_changes(watcher, ["a"])
+        # on_change ran before the change was reported
+        assert reloaded and reloaded[0].name == "Edited" and reloaded[0] is not old
+        assert prefetcher.wait(5) and prefetcher.is_ready("a")
+        state = prefetcher.take("a")
+        assert state.level is reloaded[0] and prefetcher.stats()["stale"] == 0
+        assert prefetcher.list_levels() == ["a"]
+        watcher.close()
+        prefetcher.close()
+        print("✓ Watcher thread reloads the level, the new state is ready to take")
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " LEVEL WATCHER TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_watcher_backends, test_reload_level, test_reload_through_prefetcher]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL LEVEL WATCHER TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the per-phase frame profiler
+"""
+import json
+import os
+import sys
+import tempfile
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_data import load_level_file
+from profiler import FrameProfiler, _percentile
+from simulation import Simulation
+
+
+def test_percentiles():
+    """Nearest-rank percentiles over the buffered frames"""
+    print("=" * 60)
+    print("TEST: Profiler Percentiles")
+    print("=" * 60)
+
+    values = [float(v) for v in range(1, 101)]
+    assert _percentile(values, 50) == 50
+    assert _percentile(values, 95) == 95
+    assert _percentile(values, 99) == 99
+    assert _percentile([7.0], 99) == 7
+    assert _percentile([], 50) == 0
+    print("✓ Nearest-rank percentiles")
+
+    profiler = FrameProfiler(history=10)
+    for frame in range(25):
+        profiler.begin_frame()
+        profiler.add("draw", frame / 1000)
+        if frame % 2:
+            profiler.add("physics", 0.002)
+        profiler.end_frame()
+    assert profiler.frame_count == 25 and len(profiler.frames) == 10
+
+    summary = profiler.summary()
+    # Only frames 15..24 are kept
+    assert summary["draw"]["max"] == 24 and summary["draw"]["p50"] == 19
+    # Frames without physics count as zero
+    assert summary["physics"]["p50"] == 0 and summary["physics"]["max"] == 2
+    assert summary["frame"]["max"] >= 0
+
+    lines = profiler.report_lines()
+    assert [line.split()[0] for line in lines[1:]] == ["physics", "draw", "frame"]
+    print("✓ Ring buffer keeps the last 10 frames, report ends with the frame total")
+    print()
+    return True
+
+
+def test_metrics_stream():
+    """Every frame is written as a JSON line with its phase timings"""
+    print("=" * 60)
+    print("TEST: Profiler Metrics Stream")
+    print("=" * 60)
+
+    level_path = os.path.join(script_dir, "Levels", "level1.json")
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics_path = os.path.join(tmp, "frames.jsonl")
+        profiler = FrameProfiler(metrics_path=metrics_path)
+        sim = Simulation(load_level_file(level_path), 1280, 720)
+        sim.profiler = profiler
+
+        for _ in range(30):
+            profiler.begin_frame()
+            with profiler.phase("physics"):
+                sim.run(2)
+            profiler.end_frame(state="playing", steps=2)
+        profiler.close()
+
+        with open(metrics_path) as f:
+            records = [json.loads(line) for line in f]
+
+    assert [record["frame"] for record in records] == list(range(1, 31))
+    for record in records:
+        assert record["state"] == "playing" and record["steps"] == 2
+        ms = record["ms"]
+        assert set(ms) == {"physics", "collisions", "frame"}
+        assert ms["collisions"] <= ms["physics"] <= ms["frame"]
+    print(f"✓ {len(records)} frames written with collision time inside physics")
+
+    # Clones made for searching don't report into the game's profiler
+    assert sim.clone().profiler is None
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " PROFILER TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_percentiles, test_metrics_stream]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL PROFILER TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test that dirty-rect rendering produces the same picture as a full redraw
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+import pygame
+from level_data import parse_level_data
+from level_manager import LevelManager, GameState
+from renderer import LevelRenderer, draw_goal, draw_obstacle, draw_platform, draw_player
+
+
+def full_redraw(surface, state):
+    """Reference: everything drawn from scratch, in level order"""
+    view_x = int(state.camera_x)
+    surface.fill(state.level.background_color)
+    for platform in state.platforms:
+        draw_platform(surface, platform, view_x)
+    for obstacle in state.obstacles:
+        draw_obstacle(surface, obstacle, view_x)
+    draw_goal(surface, state.level.end_point, view_x)
+    draw_player(surface, state, view_x)
+
+
+def long_level(width=8000):
+    """Scrolling level with steps, moving platforms and boxes along the way"""
+    platforms = [{"x": 0, "y": 600, "width": width, "height": 20, "type": "ground"}]
+    obstacles = []
+    # Moving objects get their own rows: they are drawn above static ones,
+    # while a full redraw stacks everything in level order
+    for x in range(400, width - 400, 300):
+        moving = x % 1200 == 400
+        platforms.append({"x": x + 0.5, "y": 380 if moving else 450 + (x % 900) // 10,
+                          "width": 120.7, "height": 20, "type": "moving" if moving else "ground",
+                          "speed": 90, "color": [x % 256, 120, 200]})
+        moving = x % 1500 == 700
+        obstacles.append({"x": x + 150.25, "y": 150 if moving else 250, "width": 30, "height": 30,
+                          "type": "moving_box" if moving else "box", "speed": 60})
+    return parse_level_data({
+        "name": "Long", "width": width, "spawn_point": [100, 500], "end_point": [width - 100, 560],
+        "platforms": platforms, "obstacles": obstacles
+    })
+
+
+def render_frames(screen, reference, state, name, frames):
+    """Step and render a run, comparing every frame with a full redraw"""
+    hud = pygame.Surface((120, 30))
+    hud.fill((255, 255, 0))
+    renderer = LevelRenderer(screen, state)
+    state.press('right')
+
+    # pygame fills outlined rects that are clipped to within twice the outline
+    # width of a surface edge, so an object cut by the screen edge and the
+    # same object cut by the background strip edge differ in the outermost
+    # pixels. Those columns are left out of the comparison.
+    compared = pygame.Rect(0, 0, screen.get_width(), screen.get_height()).inflate(-6, 0)
+
+    for frame in range(frames):
+        if frame % 40 == 0:
+            state.press('jump')
+        state.step()
+        state.step()
+
+        renderer.begin_frame()
+        renderer.draw_world()
+        # A HUD element that moves, so its old position must be erased
+        renderer.blit(hud, (10 + frame % 50, 10))
+        renderer.present()
+
+        full_redraw(reference, state)
+        reference.blit(hud, (10 + frame % 50, 10))
+        assert pygame.image.tobytes(screen.subsurface(compared), "RGB") == \
+               pygame.image.tobytes(reference.subsurface(compared), "RGB"), f"{name}: frame {frame} differs"
+
+
+def test_dirty_rects_match_full_redraw():
+    """Frames built from the cached layer match full redraws pixel for pixel"""
+    print("=" * 60)
+    print("TEST: Dirty Rect Rendering")
+    print("=" * 60)
+
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    reference = pygame.Surface((1280, 720)).convert()
+
+    manager = LevelManager(os.path.join(script_dir, "Levels"))
+    for level_name in manager.list_levels():
+        state = GameState(manager.get_level(level_name), 1280, 720)
+        render_frames(screen, reference, state, level_name, 120)
+        print(f"✓ {level_name}: 120 frames identical to full redraw")
+
+    # Scrolling: the view crosses several background strips
+    state = GameState(long_level(), 1280, 720)
+    render_frames(screen, reference, state, "long level", 700)
+    assert state.camera_x > 1280 * 2, state.camera_x
+    print(f"✓ Scrolling level: 700 frames identical, camera at x={state.camera_x:.0f}")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " RENDERER TEST ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    try:
+        if test_dirty_rects_match_full_redraw():
+            print("=" * 60)
+            print("✓ RENDERER TEST PASSED!")
+            print("=" * 60)
+            return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test input recording and deterministic replay
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_data import load_level_file
+from level_fixtures import random_level
+from simulation import DEFAULT_TICK_RATE, Simulation
+from replay import (HEADER, MAGIC, InputEvent, InputLog, LevelChangedError, OUTCOME_COMPLETE,
+                    OUTCOME_GAME_OVER, prune_replays, replay, replay_filename, verify, verify_file)
+
+
+def play_random_run(level, seed, frames=600):
+    """Drive a simulation with random inputs at a variable frame rate"""
+    rng = random.Random(seed)
+    sim = Simulation(level, 1000, 720)
+    sim.input_log = InputLog(level.name, DEFAULT_TICK_RATE, 1000, 720, level_hash=level.source_hash)
+    for _ in range(frames):
+        if rng.random() < 0.1:
+            action = rng.choice(['jump', 'left', 'right'])
+            if action in sim.keys_pressed and action != 'jump':
+                sim.release(action)
+            else:
+                sim.press(action)
+        for _ in range(rng.randint(0, 4)):
+            sim.step()
+            if sim.game_over or sim.level_complete:
+                break
+        if sim.game_over or sim.level_complete:
+            break
+    sim.input_log.finish(sim)
+    return sim
+
+
+def test_encoding_round_trip():
+    """Logs survive to_bytes/from_bytes and save/load unchanged"""
+    print("=" * 60)
+    print("TEST: Replay Encoding Round Trip")
+    print("=" * 60)
+
+    log = InputLog("Ünïcode level", 240, 1280, 720, outcome=OUTCOME_COMPLETE, end_tick=100000,
+                   level_hash="0123456789abcdef0123456789abcdef01234567")
+    log.events = [InputEvent(0, 'right', True), InputEvent(0, 'jump', True),
+                  InputEvent(127, 'jump', False), InputEvent(128, 'left', True),
+                  InputEvent(99999, 'right', False)]
+    assert InputLog.from_bytes(log.to_bytes()) == log
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "run.gdr")
+        log.save(path)
+        assert InputLog.load(path) == log
+        print(f"✓ {len(log.events)} events in {os.path.getsize(path)} bytes")
+
+    try:
+        InputLog.from_bytes(b'JUNK' + log.to_bytes()[4:])
+        assert False, "bad magic should be rejected"
+    except ValueError:
+        print("✓ Non-replay data rejected")
+
+    # Version 1 files have no level hash
+    name_bytes = b"old"
+    old = HEADER.pack(MAGIC, 1, 120, 1280, 720, OUTCOME_COMPLETE, 50) + len(name_bytes).to_bytes(2, 'little')
+    old += name_bytes + (0).to_bytes(4, 'little')
+    assert InputLog.from_bytes(old) == InputLog("old", 120, 1280, 720, outcome=OUTCOME_COMPLETE, end_tick=50)
+    print("✓ Version 1 replays still load")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        days = range(1_700_000_000, 1_700_000_000 + 5 * 86400, 86400)
+        names = [replay_filename("level1", when) for when in days]
+        # Runs ending in the same second get their own files
+        names += [replay_filename("level1", days[-1] + 0.25), replay_filename("level1", days[-1] + 0.5)]
+        assert len(set(names)) == len(names)
+        names.append("level1_20000101_000000.gdr")  # saved before milliseconds were added
+        others = [replay_filename("level1_hard", 0), "level1_notes.gdr"]
+        for name in names + others:
+            log.save(os.path.join(tmp, name))
+        deleted = prune_replays(tmp, "level1", keep=3)
+        assert sorted(os.path.basename(path) for path in deleted) == sorted(names)[:5]
+        assert sorted(os.listdir(tmp)) == sorted(sorted(names)[5:] + others)
+        print("✓ Only a level's newest runs are kept, other files untouched")
+
+    print()
+    return True
+
+
+def test_replay_matches_live_run():
+    """Replaying a recorded log reproduces the live run tick for tick"""
+    print("=" * 60)
+    print("TEST: Replay Matches Live Run")
+    print("=" * 60)
+
+    outcomes = {OUTCOME_COMPLETE: 0, OUTCOME_GAME_OVER: 0}
+    for seed in range(20):
+        level = random_level(seed, time_limit=6)
+        live = play_random_run(level, seed)
+        log = InputLog.from_bytes(live.input_log.to_bytes())
+
+        result = replay(level, log)
+        assert result.ticks == live.tick, f"seed {seed}: {result.ticks} != {live.tick}"
+        assert result.elapsed_time == live.elapsed_time
+        assert (result.level_complete, result.game_over) == (live.level_complete, live.game_over)
+        assert verify(level, log)
+        outcomes[log.outcome] = outcomes.get(log.outcome, 0) + 1
+
+    print(f"✓ 20 runs replayed identically "
+          f"({outcomes[OUTCOME_COMPLETE]} complete, {outcomes[OUTCOME_GAME_OVER]} game over)")
+
+    # A forged claim fails verification
+    level = random_level(0, time_limit=6)
+    log = play_random_run(level, 0).input_log
+    log.end_tick -= 1
+    assert not verify(level, log)
+    print("✓ Tampered end tick rejected")
+
+    print()
+    return True
+
+
+def test_level_changed():
+    """Runs recorded on an older version of a level get no verdict"""
+    print("=" * 60)
+    print("TEST: Replay Level Changed")
+    print("=" * 60)
+
+    data = {
+        "name": "Flat", "spawn_point": [50, 500], "end_point": [600, 600],
+        "platforms": [{"x": 0, "y": 650, "width": 1000, "height": 30, "type": "ground"}],
+        "obstacles": []
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        level_path = os.path.join(tmp, "flat.json")
+        with open(level_path, 'w') as f:
+            json.dump(data, f)
+        level = load_level_file(level_path)
+        assert len(level.source_hash) == 40
+        log = play_random_run(level, 1).input_log
+        log.level_name = "flat"
+        assert log.level_hash == level.source_hash
+        replay_path = os.path.join(tmp, "flat.gdr")
+        log.save(replay_path)
+        assert verify_file(replay_path, tmp)[1] is True
+        print("✓ The level file's hash is recorded and matches")
+
+        data["platforms"][0]["y"] = 640
+        with open(level_path, 'w') as f:
+            json.dump(data, f)
+        path, ok, message = verify_file(replay_path, tmp)
+        assert ok is None and "changed" in message, message
+        try:
+            verify(load_level_file(level_path), log)
+            assert False, "a changed level should not be verified"
+        except LevelChangedError:
+            pass
+        print(f"✓ Edited level reported instead of verified: {message}")
+
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " REPLAY TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_encoding_round_trip, test_replay_matches_live_run, test_level_changed]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL REPLAY TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,8 @@ Quick test that verifies a level can be loaded and simulated
 """
 import sys
 import os
+import random
+import subprocess
 
 # Add root directory to path to find level_manager
 script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -11,6 +13,8 @@ sys.path.insert(0, script_dir)
 
 import pygame
 from level_manager import LevelManager, GameState
+from simulation import int_rect, rects_collide, rect_centery, Simulation, FixedTimestep
+from level_data import parse_level_data
 
 def test_level_simulation():
     """Simulate playing a level to ensure all mechanics work"""
@@ -65,6 +69,95 @@ def test_level_simulation():
     pygame.quit()
     return True
 
+def test_rect_rules_match_pygame():
+    """Check the headless rect helpers against pygame.Rect"""
+    print("=" * 60)
+    print("TEST: Headless Rects Match pygame.Rect")
+    print("=" * 60)
+    
+    rng = random.Random(7)
+    for _ in range(20000):
+        a = [rng.uniform(-60, 60) for _ in range(2)] + [rng.choice([0, rng.uniform(-40, 60)]) for _ in range(2)]
+        b = [rng.uniform(-60, 60) for _ in range(2)] + [rng.choice([0, rng.uniform(-40, 60)]) for _ in range(2)]
+        rect_a, rect_b = pygame.Rect(*a), pygame.Rect(*b)
+        
+        assert tuple(rect_a) == int_rect(*a)
+        assert rect_a.centery == rect_centery(int_rect(*a))
+        assert rect_a.colliderect(rect_b) == rects_collide(int_rect(*a), int_rect(*b)), (a, b)
+    
+    print("✓ 20000 random rect pairs agree")
+    print()
+    return True
+
+def test_core_without_pygame():
+    """Check the simulation core runs in an interpreter without pygame"""
+    print("=" * 60)
+    print("TEST: Simulation Core Without pygame")
+    print("=" * 60)
+    
+    code = (
+        "import sys; sys.modules['pygame'] = None\n"
+        "from level_data import parse_level_data\n"
+        "from simulation import Simulation\n"
+        "level = parse_level_data({'name': 'x', 'spawn_point': [100, 500],\n"
+        "    'platforms': [{'x': 0, 'y': 600, 'width': 1280, 'height': 20}]})\n"
+        "sim = Simulation(level, 1280, 720)\n"
+        "for _ in range(120): sim.update(1 / 60)\n"
+        "print(sim.player_pos.y, sim.game_over)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=script_dir, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    player_y, game_over = result.stdout.split()
+    assert 575 < float(player_y) < 600 and game_over == "False", result.stdout
+    
+    print(f"✓ Player landed at y={float(player_y):.1f} with pygame blocked")
+    print()
+    return True
+
+def test_fixed_timestep_determinism():
+    """Check runs give the same result however the frames are timed"""
+    print("=" * 60)
+    print("TEST: Fixed Timestep Determinism")
+    print("=" * 60)
+    
+    level = parse_level_data({
+        "name": "Timing", "time_limit": 3, "spawn_point": [100, 500],
+        "platforms": [
+            {"x": 0, "y": 600, "width": 1280, "height": 20, "type": "ground"},
+            {"x": 400, "y": 450, "width": 150, "height": 20, "type": "moving", "speed": 120},
+        ],
+    })
+    
+    def play(frame_times):
+        sim = Simulation(level, 1280, 720, tick_rate=120)
+        timestep = FixedTimestep(120, max_steps=1000)
+        for frame_dt in frame_times:
+            for _ in range(timestep.steps(frame_dt)):
+                if sim.tick == 60:
+                    sim.jump()
+                sim.keys_pressed = {'right'} if sim.tick >= 30 else set()
+                sim.step()
+        return sim
+    
+    rng = random.Random(3)
+    steady = play([1 / 60] * 240)
+    jittery = play([rng.choice([1 / 30, 1 / 60, 1 / 144, 0.1]) for _ in range(500)])
+    
+    for sim in (steady, jittery):
+        assert sim.game_over, "Time limit should end the run"
+        assert abs(sim.elapsed_time - 3) < 0.01
+    assert steady.tick == jittery.tick
+    assert tuple(steady.player_pos) == tuple(jittery.player_pos)
+    assert steady.platforms[1].x == jittery.platforms[1].x
+    print(f"✓ Both runs ended at tick {steady.tick}, player at {tuple(steady.player_pos)}")
+    
+    fast = Simulation(level, 1280, 720)
+    ticks = fast.run(10_000)
+    assert fast.game_over and ticks == steady.tick
+    print(f"✓ Headless run() reached the time limit in {ticks} ticks")
+    print()
+    return True
+
 def main():
     print("\n")
     print("╔" + "═" * 58 + "╗")
@@ -72,18 +165,27 @@ def main():
     print("╚" + "═" * 58 + "╝")
     print()
     
-    try:
-        result = test_level_simulation()
-        if result:
-            print("=" * 60)
-            print("✓ SIMULATION TEST PASSED!")
-            print("=" * 60)
-            return 0
-    except Exception as e:
-        print(f"✗ Test failed with error: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
+    tests = [
+        test_level_simulation,
+        test_rect_rules_match_pygame,
+        test_core_without_pygame,
+        test_fixed_timestep_determinism,
+    ]
+    
+    for test_func in tests:
+        try:
+            if not test_func():
+                return 1
+        except Exception as e:
+            print(f"✗ Test failed with error: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
+    
+    print("=" * 60)
+    print("✓ SIMULATION TEST PASSED!")
+    print("=" * 60)
+    return 0
 
 if __name__ == "__main__":
     sys.exit(main())
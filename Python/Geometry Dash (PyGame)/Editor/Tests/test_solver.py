@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Test the level solvability verifier
+"""
+import json
+import os
+import sys
+import tempfile
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+from level_data import parse_level_data
+from replay import verify
+from simulation import DEFAULT_TICK_RATE, Simulation
+from solver import ERROR, SOLVABLE, UNSOLVABLE, solve, solve_directory
+
+GAP_LEVEL = {
+    "name": "Gap", "time_limit": 0,
+    "spawn_point": [100, 500], "end_point": [1000, 560],
+    "platforms": [
+        {"x": 0, "y": 600, "width": 500, "height": 20, "type": "ground"},
+        {"x": 620, "y": 600, "width": 660, "height": 20, "type": "ground"}
+    ],
+    "obstacles": [
+        {"x": 800, "y": 560, "width": 30, "height": 40, "type": "spike"}
+    ]
+}
+
+UNREACHABLE_LEVEL = {
+    "name": "Too High", "time_limit": 2,
+    "spawn_point": [100, 500], "end_point": [600, 100],
+    "platforms": [{"x": 0, "y": 600, "width": 1280, "height": 20, "type": "ground"}],
+    "obstacles": []
+}
+
+
+def test_clone_is_independent():
+    """A cloned run can be stepped without touching the original"""
+    print("=" * 60)
+    print("TEST: Simulation Clone")
+    print("=" * 60)
+
+    level = parse_level_data({
+        "name": "Clone", "spawn_point": [100, 500], "end_point": [1200, 100],
+        "platforms": [{"x": 0, "y": 600, "width": 1280, "height": 20, "type": "ground"},
+                      {"x": 300, "y": 400, "width": 100, "height": 20, "type": "moving", "speed": 100}],
+        "obstacles": []
+    })
+    sim = Simulation(level, 1280, 720)
+    sim.run(30)
+    snapshot = (sim.tick, tuple(sim.player_pos), sim.platforms[1].x)
+
+    other = sim.clone()
+    other.press('right')
+    other.run(60)
+    assert (sim.tick, tuple(sim.player_pos), sim.platforms[1].x) == snapshot
+    assert other.platforms[1].x != snapshot[2]
+
+    sim.press('right')
+    sim.run(60)
+    assert (sim.tick, tuple(sim.player_pos), sim.platforms[1].x) == \
+           (other.tick, tuple(other.player_pos), other.platforms[1].x)
+    print("✓ Clone runs independently and matches the original")
+    print()
+    return True
+
+
+def test_solvable_level_has_witness():
+    """A level with a jumpable gap is solved and its witness replays"""
+    print("=" * 60)
+    print("TEST: Solvable Level")
+    print("=" * 60)
+
+    level = parse_level_data(GAP_LEVEL)
+    result = solve(level, "gap")
+    assert result.status == SOLVABLE, result.status
+    assert verify(level, result.witness)
+    print(f"✓ Solved in {result.end_tick} ticks after {result.states} states; witness replays")
+
+    # With a time limit, the same state reached later is kept apart from the earlier one
+    timed = parse_level_data(dict(GAP_LEVEL, time_limit=3))
+    result = solve(timed, "gap")
+    assert result.status == SOLVABLE and result.end_tick <= 3 * DEFAULT_TICK_RATE, result.status
+    assert verify(timed, result.witness)
+    print(f"✓ Solved within a 3 s time limit in {result.end_tick} ticks")
+    print()
+    return True
+
+
+def test_unreachable_level():
+    """An end point above jump height is reported unsolvable"""
+    print("=" * 60)
+    print("TEST: Unsolvable Level")
+    print("=" * 60)
+
+    result = solve(parse_level_data(UNREACHABLE_LEVEL), "too_high")
+    assert result.status == UNSOLVABLE, result.status
+    assert result.witness is None
+    print(f"✓ Search exhausted after {result.states} states")
+    print()
+    return True
+
+
+def test_solve_directory():
+    """A folder of levels is checked in parallel"""
+    print("=" * 60)
+    print("TEST: Solve Directory")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as levels_dir:
+        for name, data in (("gap", GAP_LEVEL), ("too_high", UNREACHABLE_LEVEL)):
+            with open(os.path.join(levels_dir, name + ".json"), 'w') as f:
+                json.dump(data, f)
+        missing_y = dict(GAP_LEVEL, platforms=[{"x": 0, "width": 500, "height": 20}])
+        with open(os.path.join(levels_dir, "missing_y.json"), 'w') as f:
+            json.dump(missing_y, f)
+        with open(os.path.join(levels_dir, "broken.json"), 'w') as f:
+            f.write('{"name": "Broken", "platforms": [')
+
+        results = solve_directory(levels_dir, workers=2)
+        assert results["gap"].status == SOLVABLE
+        assert results["too_high"].status == UNSOLVABLE
+        assert results["missing_y"].status == ERROR and "KeyError" in results["missing_y"].error
+        assert results["broken"].status == ERROR and results["broken"].level_name == "broken"
+        assert solve_directory(levels_dir, ["missing_y"], workers=1)["missing_y"].status == ERROR
+    print(f"✓ {len(results)} levels checked, unloadable levels reported as errors")
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " SOLVER TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_clone_is_independent, test_solvable_level_has_witness,
+             test_unreachable_level, test_solve_directory]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL SOLVER TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
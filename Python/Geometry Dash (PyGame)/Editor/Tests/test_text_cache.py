@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test the shared text surface cache
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add root directory to path to find level_manager
+script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, script_dir)
+
+import pygame
+from text_cache import TextCache, TextLabel
+
+
+def test_cache_hits_and_eviction():
+    """Repeated text is rendered once; the least recently used entry goes first"""
+    print("=" * 60)
+    print("TEST: Text Cache")
+    print("=" * 60)
+
+    pygame.init()
+    font = pygame.font.Font(None, 24)
+    other_font = pygame.font.Font(None, 36)
+    cache = TextCache(max_entries=3)
+
+    first = cache.render(font, "Level: 1", (255, 255, 255))
+    for _ in range(9):
+        assert cache.render(font, "Level: 1", (255, 255, 255)) is first
+    assert cache.stats()["hits"] == 9 and cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.9
+    print("✓ Same text, font and color reuses one surface")
+
+    # Font and color are part of the key
+    assert cache.render(font, "Level: 1", [255, 0, 0]) is not first
+    assert cache.render(other_font, "Level: 1", (255, 255, 255)) is not first
+    assert len(cache) == 3
+
+    # "Level: 1" in white was used first but touched least recently of the two
+    cache.render(font, "Level: 1", (255, 255, 255))
+    cache.render(font, "New", (255, 255, 255))
+    assert cache.stats()["evictions"] == 1
+    assert cache.render(font, "Level: 1", (255, 255, 255)) is first
+    assert cache.stats()["misses"] == 4
+    print("✓ Entries keyed by font and color, LRU entry evicted")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def test_label_renders_on_change():
+    """A label only re-renders when its text changes"""
+    print("=" * 60)
+    print("TEST: Text Label")
+    print("=" * 60)
+
+    pygame.init()
+    label = TextLabel(pygame.font.Font(None, 24), (255, 255, 100))
+
+    # A timer at 60 frames per second shows a new value every sixth frame
+    shown = [f"Time: {frame / 60:.1f}s" for frame in range(600)]
+    for text in shown:
+        label.render(text)
+    assert label.renders == len(set(shown)), label.renders
+    print(f"✓ 600 frames of a timer rendered {label.renders} times")
+
+    pygame.quit()
+    print()
+    return True
+
+
+def main():
+    print("\n")
+    print("╔" + "═" * 58 + "╗")
+    print("║" + " TEXT CACHE TEST SUITE ".center(58) + "║")
+    print("╚" + "═" * 58 + "╝")
+    print()
+
+    tests = [test_cache_hits_and_eviction, test_label_renders_on_change]
+    try:
+        for test in tests:
+            if not test():
+                return 1
+        print("=" * 60)
+        print("✓ ALL TEXT CACHE TESTS PASSED!")
+        print("=" * 60)
+        return 0
+    except Exception as e:
+        print(f"✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
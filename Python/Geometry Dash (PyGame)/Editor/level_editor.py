@@ -10,10 +10,44 @@ import sys
 # Add parent directory to path to find level_manager
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from level_manager import Platform, Obstacle, LevelData
+from level_manager import Platform, Obstacle, LevelData, GameState, FixedTimestep
+from editor_objects import EditorObjects
+from editor_history import AddObject, ClearObjects, DeleteObject, History, MoveObject, SetAttribute
+from editor_autosave import Autosave, recover, write_custom_level
+from level_manifest import LevelManifest
+from renderer import LevelRenderer
+from simulation import SCREEN_WIDTH, SCREEN_HEIGHT
+from text_cache import TextLabel, render_text
 from enum import Enum
 
 
+# Extra area searched for objects when redrawing part of the canvas, since
+# type labels can stick out of small objects
+LABEL_MARGIN = 40
+
+# Physics steps per second in playtests, as in main.py
+PLAYTEST_TICK_RATE = 120
+
+# Fills the canvas below the game's screen during playtests
+PLAYTEST_OUTSIDE_COLOR = (20, 20, 20)
+
+# Where the editor journals unsaved work when run as a program
+AUTOSAVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Autosave")
+
+
+def draw_outline(surface, color, rect, width):
+    """Same pixels as pygame.draw.rect(surface, color, rect, width), but drawn
+    from filled strips so a clip area doesn't add edges where it cuts the rect"""
+    rect = pygame.Rect(rect)
+    if rect.width <= 2 * width or rect.height <= 2 * width:
+        pygame.draw.rect(surface, color, rect)
+        return
+    surface.fill(color, (rect.x, rect.y, rect.width, width))
+    surface.fill(color, (rect.x, rect.bottom - width, rect.width, width))
+    surface.fill(color, (rect.x, rect.y, width, rect.height))
+    surface.fill(color, (rect.right - width, rect.y, width, rect.height))
+
+
 class EditorMode(Enum):
     SELECT = 0
     ADD_PLATFORM = 1
@@ -32,13 +66,15 @@ class Button:
         self.text_color = text_color
         self.hovered = False
     
-    def draw(self, screen, font):
+    def draw(self, surface, font, origin=(0, 0)):
+        """Draw on a surface whose top left corner is at origin on screen"""
+        rect = self.rect.move(-origin[0], -origin[1])
         color = tuple(min(c + 30, 255) for c in self.color) if self.hovered else self.color
-        pygame.draw.rect(screen, color, self.rect)
-        pygame.draw.rect(screen, (255, 255, 255), self.rect, 2)
-        text_surf = font.render(self.text, True, self.text_color)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, (255, 255, 255), rect, 2)
+        text_surf = render_text(font, self.text, self.text_color)
+        text_rect = text_surf.get_rect(center=rect.center)
+        surface.blit(text_surf, text_rect)
     
     def is_clicked(self, pos):
         return self.rect.collidepoint(pos)
@@ -47,8 +83,96 @@ class Button:
         self.hovered = self.rect.collidepoint(pos)
 
 
+class Playtest:
+    """A run of the level being edited, played on the editor's canvas
+
+    The run is played at the game's screen size, as in main.py, so moving
+    objects bounce and the player falls to death where they would in the
+    game. Frames are drawn off screen at that size and the canvas shows the
+    part of them around the player; the canvas below the game's screen is
+    left blank.
+    """
+    
+    def __init__(self, surface, level, font):
+        self.surface = surface
+        self.level = level
+        self.font = font
+        self.time_label = TextLabel(font, (255, 255, 100))
+        self.timestep = FixedTimestep(PLAYTEST_TICK_RATE)
+        self.clock = pygame.time.Clock()
+        self.frame = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.renderer = None
+        self.restart()
+    
+    def restart(self):
+        """Start the run over from the spawn point"""
+        self.state = GameState(self.level, SCREEN_WIDTH, SCREEN_HEIGHT, PLAYTEST_TICK_RATE)
+        if self.renderer is None:
+            self.renderer = LevelRenderer(self.frame, self.state)
+        else:
+            self.renderer.reset(self.state)
+        self.view_x = None  # Frame x shown at the canvas's left edge
+        self.hud_rects = []
+        self.timestep.reset()
+        self.clock.tick()
+    
+    @property
+    def finished(self):
+        return self.state.game_over or self.state.level_complete
+    
+    def update(self, dt):
+        """Advance the run by dt seconds in fixed physics steps"""
+        for _ in range(self.timestep.steps(dt)):
+            if self.finished:
+                break
+            self.state.step()
+    
+    def advance(self):
+        """Advance the run by the time since the last call"""
+        self.update(self.clock.tick() / 1000)
+    
+    def draw(self):
+        self.renderer.begin_frame()
+        self.renderer.draw_world()
+        changed = self.renderer.end_frame()
+        
+        # Follow the player across the frame when it is wider than the canvas
+        canvas_width, _ = self.surface.get_size()
+        player_x = int(self.state.player_pos.x - self.state.camera_x)
+        view_x = max(0, min(player_x - canvas_width // 2, SCREEN_WIDTH - canvas_width))
+        canvas = self.surface.get_rect()
+        if view_x != self.view_x:
+            self.view_x = view_x
+            self.surface.fill(PLAYTEST_OUTSIDE_COLOR)
+            self.surface.blit(self.frame, (0, 0), (view_x, 0, canvas_width, SCREEN_HEIGHT))
+            dirty = [canvas]
+        else:
+            # Copy what changed in the frame, and what the last HUD covered
+            dirty = []
+            for rect in changed + [rect.move(view_x, 0) for rect in self.hud_rects]:
+                rect = rect.move(-view_x, 0).clip(canvas)
+                if rect:
+                    self.surface.blit(self.frame, rect, rect.move(view_x, 0))
+                    dirty.append(rect)
+        
+        if self.state.game_over:
+            status = render_text(self.font, "GAME OVER - R to retry, ESC to edit", (255, 80, 80))
+        elif self.state.level_complete:
+            status = render_text(self.font, "LEVEL COMPLETE - R to retry, ESC to edit", (80, 255, 80))
+        else:
+            status = render_text(self.font, "PLAYTEST - ESC to edit", (200, 200, 200))
+        self.hud_rects = [
+            self.surface.blit(status, (10, 10)),
+            self.surface.blit(self.time_label.render(f"Time: {self.state.elapsed_time:.1f}s"), (10, 40)),
+        ]
+        offset = self.surface.get_abs_offset()
+        pygame.display.update([rect.move(offset) for rect in dirty + self.hud_rects])
+
+
 class LevelEditor:
-    def __init__(self):
+    def __init__(self, autosave_dir=None):
+        """autosave_dir: directory to journal changes to and recover them from
+        after a crash; None turns autosave off"""
         pygame.init()
         self.screen_width = 1400
         self.screen_height = 800
@@ -67,21 +191,41 @@ class LevelEditor:
         self.panel_rect = pygame.Rect(1000, 0, 400, self.screen_height)
         self.panel_color = (50, 50, 60)
         
-        # Level data
-        self.platforms = []
-        self.obstacles = []
+        # Level data; objects are looked up by id, selections are (kind, id)
+        self.platforms = EditorObjects()
+        self.obstacles = EditorObjects()
         self.spawn_point = (100, 100)
         self.end_point = (900, 300)
         self.level_name = "custom"
         self.difficulty = 5
         self.time_limit = 0.0
         self.background_color = (20, 20, 30)
+        self.levels_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Levels")
         
         # Editor state
         self.mode = EditorMode.SELECT
         self.selected_object = None
         self.dragging = False
         self.drag_offset = (0, 0)
+        self.mouse_pos = pygame.mouse.get_pos()
+        self.playtest = None  # Playtest while the level is being played
+        # The last playtest and the level version it was built from; playing
+        # an unchanged level again reuses its indexes and rendered background
+        self.last_playtest = None
+        self.last_playtest_version = None
+        
+        # Every change to the level goes through the history so it can be undone
+        self.history = History()
+        
+        # Redraw state: the screen is only redrawn after something changed,
+        # in full or just the dirty areas while dragging or placing objects
+        self.needs_redraw = True
+        self.dirty_rects = []
+        self.temp_line_rect = None
+        self.grid_surface = None
+        self.grid_color = None
+        self.panel_surface = None
+        self.panel_key = None
         
         # UI Elements
         self.setup_buttons()
@@ -94,6 +238,69 @@ class LevelEditor:
         self.new_platform_type = "ground"
         self.new_obstacle_type = "box"
         self.temp_start = None
+        
+        # Autosave: ids of objects changed since the last batch of events,
+        # 'all' when a whole collection changed, and the level properties
+        # last written to the journal
+        self.autosave = None
+        self.changed_ids = {'platform': set(), 'obstacle': set()}
+        self.journaled_properties = None
+        if autosave_dir:
+            self.start_autosave(autosave_dir)
+    
+    def start_autosave(self, directory):
+        """Recover unsaved work left in directory, then journal changes to it"""
+        recovered = recover(directory)
+        if recovered:
+            self.load_from_data(recovered)
+            print(f"✓ Recovered unsaved work from {directory}")
+        
+        self.platforms.on_change = lambda obj_id: self.note_change('platform', obj_id)
+        self.obstacles.on_change = lambda obj_id: self.note_change('obstacle', obj_id)
+        for ids in self.changed_ids.values():
+            ids.clear()
+        self.journaled_properties = self.level_properties()
+        self.autosave = Autosave(directory)
+        self.autosave.start(self.level_snapshot(with_ids=True))
+    
+    def note_change(self, obj_type, obj_id):
+        ids = self.changed_ids[obj_type]
+        if obj_id is None:
+            self.changed_ids[obj_type] = 'all'
+        elif ids != 'all':
+            ids.add(obj_id)
+    
+    def journal_changes(self):
+        """Hand what changed since the last call to the autosave thread"""
+        if self.autosave is None:
+            return
+        records = []
+        for obj_type, objects, to_data in (('platform', self.platforms, self.platform_data),
+                                           ('obstacle', self.obstacles, self.obstacle_data)):
+            kind = obj_type + 's'
+            ids = self.changed_ids[obj_type]
+            if ids == 'all':
+                records.append({"op": "clear", "kind": kind})
+                ids = [obj_id for obj_id, _ in objects.items()]
+            for obj_id in ids:
+                if obj_id in objects:
+                    records.append({"op": "put", "kind": kind, "id": obj_id, "data": to_data(objects[obj_id])})
+                else:
+                    records.append({"op": "delete", "kind": kind, "id": obj_id})
+            self.changed_ids[obj_type] = set()
+        
+        properties = self.level_properties()
+        if properties != self.journaled_properties:
+            records.append({"op": "level", "data": properties})
+            self.journaled_properties = properties
+        self.autosave.record(records)
+    
+    def close(self):
+        """Stop autosaving; the journal is removed since nothing is lost on a clean exit"""
+        if self.autosave is not None:
+            self.journal_changes()
+            self.autosave.close()
+            self.autosave = None
     
     def setup_buttons(self):
         """Setup UI buttons"""
@@ -107,20 +314,41 @@ class LevelEditor:
             'set_spawn': Button(1020, 320, 160, 40, "Set Spawn", (100, 150, 150), (0, 0, 0)),
             'set_end': Button(1020, 370, 160, 40, "Set End", (150, 100, 150), (0, 0, 0)),
             'delete_selected': Button(1020, 420, 160, 40, "Delete Sel.", (200, 100, 100), (0, 0, 0)),
+            'playtest': Button(1200, 20, 160, 40, "Playtest (F5)", (100, 200, 100), (0, 0, 0)),
             'exit': Button(1020, 720 - 50, 160, 40, "Exit", (100, 100, 100), (255, 255, 255)),
         }
     
     def handle_events(self):
-        """Handle events"""
-        for event in pygame.event.get():
+        """Handle events, waiting for one if there is nothing to redraw"""
+        events = pygame.event.get()
+        if not events and self.playtest is None and not self.needs_redraw and not self.dirty_rects:
+            events = [pygame.event.wait()] + pygame.event.get()
+        
+        for event in events:
             if event.type == pygame.QUIT:
+                self.journal_changes()
                 return False
             
-            mouse_pos = pygame.mouse.get_pos()
+            if self.playtest is not None:
+                self.handle_playtest_event(event)
+                continue
+            
+            mouse_pos = event.pos if hasattr(event, 'pos') else pygame.mouse.get_pos()
+            self.mouse_pos = mouse_pos
             
             # Update button hover
+            hovered = [button.hovered for button in self.buttons.values()]
             for button in self.buttons.values():
                 button.update_hover(mouse_pos)
+            if hovered != [button.hovered for button in self.buttons.values()]:
+                self.mark_dirty(self.panel_rect)
+            
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.mark_dirty()
+            
+            # A drag is one undo step from mouse press to release
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self.history.checkpoint()
             
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
@@ -136,16 +364,30 @@ class LevelEditor:
             elif event.type == pygame.MOUSEMOTION:
                 if self.dragging and self.selected_object and self.canvas_rect.collidepoint(mouse_pos):
                     self.drag_object(mouse_pos)
+                elif self.temp_start:
+                    # The line being placed follows the mouse
+                    if self.temp_line_rect:
+                        self.mark_dirty(self.temp_line_rect)
+                    self.temp_line_rect = pygame.Rect(self.temp_start, (1, 1)).union(pygame.Rect(mouse_pos, (1, 1))).inflate(4, 4)
+                    self.mark_dirty(self.temp_line_rect)
             
             elif event.type == pygame.KEYDOWN:
+                ctrl = event.mod & pygame.KMOD_CTRL
                 if event.key == pygame.K_DELETE and self.selected_object:
                     self.delete_selected()
+                elif ctrl and (event.key == pygame.K_y or (event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT)):
+                    self.redo()
+                elif ctrl and event.key == pygame.K_z:
+                    self.undo()
+                elif event.key == pygame.K_F5:
+                    self.start_playtest()
                 elif event.key == pygame.K_ESCAPE:
                     self.mode = EditorMode.SELECT
                     self.selected_object = None
                 elif event.key == pygame.K_RETURN and self.input_active:
                     self.handle_input_submit()
         
+        self.journal_changes()
         return True
     
     def handle_panel_click(self, pos):
@@ -181,7 +423,11 @@ class LevelEditor:
         elif self.buttons['delete_selected'].is_clicked(pos):
             self.delete_selected()
         
+        elif self.buttons['playtest'].is_clicked(pos):
+            self.start_playtest()
+        
         elif self.buttons['exit'].is_clicked(pos):
+            self.close()
             pygame.quit()
             exit()
     
@@ -206,35 +452,25 @@ class LevelEditor:
                 self.mode = EditorMode.SELECT
         
         elif self.mode == EditorMode.SET_SPAWN:
-            self.spawn_point = canvas_pos
+            self.set_level_property('spawn_point', canvas_pos)
             self.mode = EditorMode.SELECT
         
         elif self.mode == EditorMode.SET_END:
-            self.end_point = canvas_pos
+            self.set_level_property('end_point', canvas_pos)
             self.mode = EditorMode.SELECT
         
         else:
-            # Select object
+            # Select object, platforms first
             self.selected_object = None
             
-            # Check platforms
-            for platform in self.platforms:
-                rect = pygame.Rect(platform.x, platform.y, platform.width, platform.height)
-                if rect.collidepoint(canvas_pos):
-                    self.selected_object = ('platform', self.platforms.index(platform))
+            for obj_type, objects in (('platform', self.platforms), ('obstacle', self.obstacles)):
+                obj_id = objects.pick(*canvas_pos)
+                if obj_id is not None:
+                    obj = objects[obj_id]
+                    self.selected_object = (obj_type, obj_id)
                     self.dragging = True
-                    self.drag_offset = (canvas_pos[0] - platform.x, canvas_pos[1] - platform.y)
+                    self.drag_offset = (canvas_pos[0] - obj.x, canvas_pos[1] - obj.y)
                     break
-            
-            # Check obstacles
-            if not self.selected_object:
-                for obstacle in self.obstacles:
-                    rect = pygame.Rect(obstacle.x, obstacle.y, obstacle.width, obstacle.height)
-                    if rect.collidepoint(canvas_pos):
-                        self.selected_object = ('obstacle', self.obstacles.index(obstacle))
-                        self.dragging = True
-                        self.drag_offset = (canvas_pos[0] - obstacle.x, canvas_pos[1] - obstacle.y)
-                        break
     
     def drag_object(self, pos):
         """Drag selected object"""
@@ -243,13 +479,17 @@ class LevelEditor:
         new_y = max(0, min(canvas_pos[1] - self.drag_offset[1], self.canvas_rect.height - 1))
         
         if self.selected_object:
-            obj_type, obj_idx = self.selected_object
+            obj_type, obj_id = self.selected_object
             if obj_type == 'platform':
-                self.platforms[obj_idx].x = new_x
-                self.platforms[obj_idx].y = new_y
+                objects, type_attr = self.platforms, 'platform_type'
             elif obj_type == 'obstacle':
-                self.obstacles[obj_idx].x = new_x
-                self.obstacles[obj_idx].y = new_y
+                objects, type_attr = self.obstacles, 'obstacle_type'
+            else:
+                return
+            obj = objects[obj_id]
+            self.mark_dirty(self.object_area(obj, getattr(obj, type_attr)))
+            self.history.execute(MoveObject(objects, obj_id, new_x, new_y))
+            self.mark_dirty(self.object_area(obj, getattr(obj, type_attr)))
     
     def add_platform(self, start, end):
         """Add a platform"""
@@ -263,7 +503,7 @@ class LevelEditor:
             height = 20
         
         platform = Platform(x, y, width, height, self.new_platform_type, (100, 150, 100), 0, 1)
-        self.platforms.append(platform)
+        self.history.execute(AddObject(self.platforms, platform))
     
     def add_obstacle(self, start, end):
         """Add an obstacle"""
@@ -277,25 +517,98 @@ class LevelEditor:
             height = 30
         
         obstacle = Obstacle(x, y, width, height, self.new_obstacle_type, (255, 100, 100), 0, 1)
-        self.obstacles.append(obstacle)
+        self.history.execute(AddObject(self.obstacles, obstacle))
     
     def delete_selected(self):
         """Delete selected object"""
         if self.selected_object:
-            obj_type, obj_idx = self.selected_object
-            if obj_type == 'platform' and 0 <= obj_idx < len(self.platforms):
-                self.platforms.pop(obj_idx)
-            elif obj_type == 'obstacle' and 0 <= obj_idx < len(self.obstacles):
-                self.obstacles.pop(obj_idx)
+            obj_type, obj_id = self.selected_object
+            if obj_type == 'platform' and obj_id in self.platforms:
+                self.history.execute(DeleteObject(self.platforms, obj_id))
+            elif obj_type == 'obstacle' and obj_id in self.obstacles:
+                self.history.execute(DeleteObject(self.obstacles, obj_id))
             self.selected_object = None
     
     def clear_all(self):
         """Clear all objects"""
         if pygame.time.get_ticks() % 2 == 0:  # Simple confirmation
-            self.platforms = []
-            self.obstacles = []
+            self.history.execute(ClearObjects([self.platforms, self.obstacles]))
             self.selected_object = None
     
+    def set_level_property(self, name, value):
+        """Change a level property such as spawn_point or difficulty"""
+        self.history.execute(SetAttribute(self, name, value))
+    
+    def set_object_property(self, obj_type, obj_id, name, value):
+        """Change a property such as width or color of a platform or obstacle"""
+        objects = self.platforms if obj_type == 'platform' else self.obstacles
+        self.history.execute(SetAttribute(objects[obj_id], name, value, objects, obj_id))
+    
+    def undo(self):
+        """Undo the last change"""
+        if self.history.undo():
+            self.after_history_change()
+    
+    def redo(self):
+        """Redo the last undone change"""
+        if self.history.redo():
+            self.after_history_change()
+    
+    def after_history_change(self):
+        # The selected object may have been removed again
+        if self.selected_object:
+            obj_type, obj_id = self.selected_object
+            if obj_id not in (self.platforms if obj_type == 'platform' else self.obstacles):
+                self.selected_object = None
+        self.dragging = False
+        self.mark_dirty()
+    
+    def build_level_data(self):
+        """The level being edited as a LevelData, without going through a file
+        
+        The LevelData shares the editor's objects. Runs never change the
+        objects of a level, so that is safe as long as the level isn't
+        edited while it is being played.
+        """
+        return LevelData(
+            name=self.level_name,
+            difficulty=self.difficulty,
+            time_limit=self.time_limit,
+            obstacles=list(self.obstacles),
+            platforms=list(self.platforms),
+            background_color=tuple(self.background_color),
+            spawn_point=tuple(self.spawn_point),
+            end_point=tuple(self.end_point),
+        )
+    
+    def start_playtest(self):
+        """Play the level on the canvas; editing resumes where it was after stop_playtest()"""
+        self.dragging = False
+        version = (self.platforms.version, self.obstacles.version, self.level_properties())
+        if self.last_playtest is not None and version == self.last_playtest_version:
+            self.playtest = self.last_playtest
+            self.playtest.restart()
+        else:
+            canvas = self.screen.subsurface(self.canvas_rect)
+            self.playtest = self.last_playtest = Playtest(canvas, self.build_level_data(), self.font)
+            self.last_playtest_version = version
+    
+    def stop_playtest(self):
+        self.playtest = None
+        self.mark_dirty()
+    
+    def handle_playtest_event(self, event):
+        """Keys control the player while playtesting; ESC or F5 returns to editing"""
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_ESCAPE, pygame.K_F5):
+                self.stop_playtest()
+            elif event.key == pygame.K_r:
+                self.playtest.restart()
+            else:
+                self.playtest.state.handle_key_down(event.key)
+        elif event.type == pygame.KEYUP:
+            self.playtest.state.handle_key_up(event.key)
+    
     def show_properties_dialog(self):
         """Show properties dialog"""
         print("=== LEVEL PROPERTIES ===")
@@ -305,78 +618,84 @@ class LevelEditor:
         print(f"Background Color: {self.background_color}")
         print("Edit in console or modify level_editor.py")
     
-    def save_level(self):
-        """Save level to JSON"""
-        # Find next custom level number - save to parent Levels/ directory
-        script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        levels_dir = os.path.join(script_dir, "Levels")
-        os.makedirs(levels_dir, exist_ok=True)
-        
-        custom_num = 1
-        while os.path.exists(os.path.join(levels_dir, f"custom{custom_num}.json")):
-            custom_num += 1
-        
-        level_data = {
-            "name": f"Custom Level {custom_num}",
+    @staticmethod
+    def platform_data(p):
+        return {
+            "x": p.x,
+            "y": p.y,
+            "width": p.width,
+            "height": p.height,
+            "type": p.platform_type,
+            "color": list(p.color),
+            "speed": p.speed,
+            "direction": p.direction
+        }
+    
+    @staticmethod
+    def obstacle_data(o):
+        return {
+            "x": o.x,
+            "y": o.y,
+            "width": o.width,
+            "height": o.height,
+            "type": o.obstacle_type,
+            "color": list(o.color),
+            "speed": o.speed,
+            "direction": o.direction
+        }
+    
+    def level_properties(self):
+        return {
+            "name": self.level_name,
             "difficulty": self.difficulty,
             "time_limit": self.time_limit,
             "background_color": list(self.background_color),
             "spawn_point": list(self.spawn_point),
             "end_point": list(self.end_point),
-            "platforms": [
-                {
-                    "x": p.x,
-                    "y": p.y,
-                    "width": p.width,
-                    "height": p.height,
-                    "type": p.platform_type,
-                    "color": list(p.color),
-                    "speed": p.speed,
-                    "direction": p.direction
-                }
-                for p in self.platforms
-            ],
-            "obstacles": [
-                {
-                    "x": o.x,
-                    "y": o.y,
-                    "width": o.width,
-                    "height": o.height,
-                    "type": o.obstacle_type,
-                    "color": list(o.color),
-                    "speed": o.speed,
-                    "direction": o.direction
-                }
-                for o in self.obstacles
-            ]
         }
-        
-        filename = os.path.join(levels_dir, f"custom{custom_num}.json")
-        with open(filename, 'w') as f:
-            json.dump(level_data, f, indent=2)
-        
-        print(f"✓ Level saved to {filename}")
+    
+    def level_snapshot(self, with_ids=False):
+        """The level in the level file format; with_ids keeps each object's editor id"""
+        level_data = self.level_properties()
+        for key, objects, to_data in (("platforms", self.platforms, self.platform_data),
+                                      ("obstacles", self.obstacles, self.obstacle_data)):
+            if with_ids:
+                level_data[key] = [dict(to_data(obj), id=obj_id) for obj_id, obj in objects.items()]
+            else:
+                level_data[key] = [to_data(obj) for obj in objects]
+        return level_data
+    
+    def save_level(self):
+        """Save level to JSON as the next customN.json in the Levels/ directory"""
+        level_data = self.level_snapshot()
+        if self.autosave is not None:
+            # Written by the autosave thread so the editor doesn't wait for the disk
+            self.autosave.save_level(self.levels_dir, level_data)
+        else:
+            write_custom_level(self.levels_dir, level_data)
     
     def load_level(self):
         """Load level from JSON"""
-        # Load from parent Levels/ directory
-        script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        levels_dir = os.path.join(script_dir, "Levels")
+        levels_dir = self.levels_dir
         os.makedirs(levels_dir, exist_ok=True)
         
-        files = [f for f in os.listdir(levels_dir) if f.endswith('.json')]
-        if not files:
+        # Listed from the manifest, so only new or changed files are read
+        manifest = LevelManifest(levels_dir)
+        manifest.refresh()
+        entries = manifest.entries(lambda entry: entry.file.endswith('.json') and not entry.error)
+        if not entries:
             print("No levels to load")
             return
         
         print("Available levels:")
-        for i, f in enumerate(files):
-            print(f"{i}: {f}")
+        for i, entry in enumerate(entries):
+            print(f"{i}: {entry.file} - {entry.name}, difficulty {entry.difficulty}, "
+                  f"{entry.platforms} platforms, {entry.obstacles} obstacles")
         
         try:
             choice = int(input("Enter level number: "))
-            if 0 <= choice < len(files):
-                self.load_from_file(os.path.join(levels_dir, files[choice]))
+            if 0 <= choice < len(entries):
+                self.load_from_file(os.path.join(levels_dir, entries[choice].file))
         except ValueError:
             print("Invalid input")
     
@@ -385,145 +704,233 @@ class LevelEditor:
         try:
             with open(filepath, 'r') as f:
                 data = json.load(f)
-            
-            self.level_name = data.get('name', 'custom')
-            self.difficulty = data.get('difficulty', 5)
-            self.time_limit = data.get('time_limit', 0)
-            self.background_color = tuple(data.get('background_color', [20, 20, 30]))
-            self.spawn_point = tuple(data.get('spawn_point', [100, 100]))
-            self.end_point = tuple(data.get('end_point', [900, 300]))
-            
-            self.platforms = [
-                Platform(
-                    p['x'], p['y'], p['width'], p['height'],
-                    p.get('type', 'ground'),
-                    tuple(p.get('color', [100, 150, 100])),
-                    p.get('speed', 0),
-                    p.get('direction', 1)
-                )
-                for p in data.get('platforms', [])
-            ]
-            
-            self.obstacles = [
-                Obstacle(
-                    o['x'], o['y'], o['width'], o['height'],
-                    o.get('type', 'box'),
-                    tuple(o.get('color', [255, 100, 100])),
-                    o.get('speed', 0),
-                    o.get('direction', 1)
-                )
-                for o in data.get('obstacles', [])
-            ]
-            
+            self.load_from_data(data)
             print(f"✓ Level loaded from {filepath}")
         except Exception as e:
             print(f"✗ Error loading level: {e}")
     
+    def load_from_data(self, data):
+        """Replace the level with one in the level file format; objects with an
+        "id" keep it"""
+        self.level_name = data.get('name', 'custom')
+        self.difficulty = data.get('difficulty', 5)
+        self.time_limit = data.get('time_limit', 0)
+        self.background_color = tuple(data.get('background_color', [20, 20, 30]))
+        self.spawn_point = tuple(data.get('spawn_point', [100, 100]))
+        self.end_point = tuple(data.get('end_point', [900, 300]))
+        
+        self.platforms.clear()
+        for p in data.get('platforms', []):
+            self.platforms.add(Platform(
+                p['x'], p['y'], p['width'], p['height'],
+                p.get('type', 'ground'),
+                tuple(p.get('color', [100, 150, 100])),
+                p.get('speed', 0),
+                p.get('direction', 1)
+            ), p.get('id'))
+        
+        self.obstacles.clear()
+        for o in data.get('obstacles', []):
+            self.obstacles.add(Obstacle(
+                o['x'], o['y'], o['width'], o['height'],
+                o.get('type', 'box'),
+                tuple(o.get('color', [255, 100, 100])),
+                o.get('speed', 0),
+                o.get('direction', 1)
+            ), o.get('id'))
+        self.selected_object = None
+        self.history.clear()
+        self.mark_dirty()
+    
     def handle_input_submit(self):
         """Handle text input submission"""
         self.input_active = None
         self.input_value = ""
     
-    def draw(self):
-        """Draw everything"""
-        self.screen.fill((0, 0, 0))
+    def mark_dirty(self, rect=None):
+        """Schedule a redraw of an area of the screen, or of all of it"""
+        if rect is None:
+            self.needs_redraw = True
+        else:
+            self.dirty_rects.append(pygame.Rect(rect))
+    
+    def object_area(self, obj, type_name):
+        """Screen area an object and its type label cover"""
+        label = render_text(self.small_font, type_name[:3], (255, 255, 255))
+        area = pygame.Rect(obj.x, obj.y, obj.width, obj.height)
+        return area.union(label.get_rect(topleft=(obj.x + 5, obj.y + 5)))
+    
+    def get_grid_surface(self):
+        """Canvas background with the grid lines, rendered once per background color"""
+        if self.grid_surface is None or self.grid_color != self.background_color:
+            self.grid_color = self.background_color
+            self.grid_surface = pygame.Surface(self.canvas_rect.size).convert()
+            self.grid_surface.fill(self.background_color)
+            for x in range(0, self.canvas_rect.width, 50):
+                pygame.draw.line(self.grid_surface, (60, 60, 70), (x, 0), (x, self.canvas_rect.height), 1)
+            for y in range(0, self.canvas_rect.height, 50):
+                pygame.draw.line(self.grid_surface, (60, 60, 70), (0, y), (self.canvas_rect.width, y), 1)
+        return self.grid_surface
+    
+    def get_panel_surface(self):
+        """Panel with buttons and level info, rendered again only when they change"""
+        key = (tuple(button.hovered for button in self.buttons.values()),
+               len(self.platforms), len(self.obstacles), self.difficulty, self.time_limit)
+        if self.panel_surface is not None and key == self.panel_key:
+            return self.panel_surface
+        self.panel_key = key
+        
+        panel = self.panel_surface = pygame.Surface(self.panel_rect.size).convert()
+        panel.fill(self.panel_color)
+        origin = self.panel_rect.topleft
         
-        # Draw canvas
-        self.screen.fill(self.background_color, self.canvas_rect)
+        # Draw buttons
+        for button in self.buttons.values():
+            button.draw(panel, self.font, origin)
+        
+        # Draw info
+        info_y = 480
+        info_texts = [
+            "--- LEVEL INFO ---",
+            f"Platforms: {len(self.platforms)}",
+            f"Obstacles: {len(self.obstacles)}",
+            f"Difficulty: {self.difficulty}",
+            f"Time Limit: {self.time_limit}s",
+            "",
+            "--- CONTROLS ---",
+            "Click Add Platform/Obstacle",
+            "Click twice to place",
+            "Drag to move objects",
+            "Delete key to remove",
+            "ESC to cancel mode",
+            "Ctrl+Z / Ctrl+Y undo, redo",
+        ]
         
-        # Draw grid
-        for x in range(0, self.canvas_rect.width, 50):
-            pygame.draw.line(self.screen, (60, 60, 70), (x, 0), (x, self.canvas_rect.height), 1)
-        for y in range(0, self.canvas_rect.height, 50):
-            pygame.draw.line(self.screen, (60, 60, 70), (0, y), (self.canvas_rect.width, y), 1)
+        for i, text in enumerate(info_texts):
+            color = (150, 150, 150) if text.startswith("-") else (200, 200, 200)
+            info_text = render_text(self.small_font, text, color)
+            panel.blit(info_text, (1020 - origin[0], info_y + i * 20 - origin[1]))
+        return panel
+    
+    def draw_platform(self, obj_id, platform):
+        color = (150, 200, 150) if self.selected_object == ('platform', obj_id) else platform.color
+        pygame.draw.rect(self.screen, color, (platform.x, platform.y, platform.width, platform.height))
+        draw_outline(self.screen, (255, 255, 255), (platform.x, platform.y, platform.width, platform.height), 2)
+        
+        # Draw platform type label
+        type_text = render_text(self.small_font, platform.platform_type[:3], (255, 255, 255))
+        self.screen.blit(type_text, (platform.x + 5, platform.y + 5))
+    
+    def draw_obstacle(self, obj_id, obstacle):
+        color = (255, 150, 150) if self.selected_object == ('obstacle', obj_id) else obstacle.color
+        pygame.draw.rect(self.screen, color, (obstacle.x, obstacle.y, obstacle.width, obstacle.height))
+        draw_outline(self.screen, (255, 200, 100), (obstacle.x, obstacle.y, obstacle.width, obstacle.height), 2)
+        
+        # Draw obstacle type label
+        type_text = render_text(self.small_font, obstacle.obstacle_type[:3], (255, 255, 255))
+        self.screen.blit(type_text, (obstacle.x + 5, obstacle.y + 5))
+    
+    def draw_canvas(self, area=None):
+        """Draw the canvas, or only the part of it inside area"""
+        if area is None:
+            self.screen.blit(self.get_grid_surface(), self.canvas_rect)
+            platforms = self.platforms.items()
+            obstacles = self.obstacles.items()
+        else:
+            self.screen.set_clip(area)
+            self.screen.blit(self.get_grid_surface(), area, area.move(-self.canvas_rect.x, -self.canvas_rect.y))
+            # Labels stick out to the right of and below small objects
+            search = area.inflate(LABEL_MARGIN, LABEL_MARGIN).move(-LABEL_MARGIN // 2, -LABEL_MARGIN // 2)
+            platforms = ((obj_id, self.platforms[obj_id]) for obj_id in self.platforms.query(*search))
+            obstacles = ((obj_id, self.obstacles[obj_id]) for obj_id in self.obstacles.query(*search))
         
         # Draw platforms
-        for i, platform in enumerate(self.platforms):
-            color = (150, 200, 150) if self.selected_object == ('platform', i) else platform.color
-            pygame.draw.rect(self.screen, color, (platform.x, platform.y, platform.width, platform.height))
-            pygame.draw.rect(self.screen, (255, 255, 255), (platform.x, platform.y, platform.width, platform.height), 2)
-            
-            # Draw platform type label
-            type_text = self.small_font.render(platform.platform_type[:3], True, (255, 255, 255))
-            self.screen.blit(type_text, (platform.x + 5, platform.y + 5))
+        for obj_id, platform in platforms:
+            self.draw_platform(obj_id, platform)
         
         # Draw obstacles
-        for i, obstacle in enumerate(self.obstacles):
-            color = (255, 150, 150) if self.selected_object == ('obstacle', i) else obstacle.color
-            pygame.draw.rect(self.screen, color, (obstacle.x, obstacle.y, obstacle.width, obstacle.height))
-            pygame.draw.rect(self.screen, (255, 200, 100), (obstacle.x, obstacle.y, obstacle.width, obstacle.height), 2)
-            
-            # Draw obstacle type label
-            type_text = self.small_font.render(obstacle.obstacle_type[:3], True, (255, 255, 255))
-            self.screen.blit(type_text, (obstacle.x + 5, obstacle.y + 5))
+        for obj_id, obstacle in obstacles:
+            self.draw_obstacle(obj_id, obstacle)
         
         # Draw spawn point
         pygame.draw.circle(self.screen, (100, 200, 100), self.spawn_point, 15)
         pygame.draw.circle(self.screen, (255, 255, 255), self.spawn_point, 15, 2)
-        spawn_text = self.small_font.render("S", True, (255, 255, 255))
+        spawn_text = render_text(self.small_font, "S", (255, 255, 255))
         spawn_rect = spawn_text.get_rect(center=self.spawn_point)
         self.screen.blit(spawn_text, spawn_rect)
         
         # Draw end point
         pygame.draw.circle(self.screen, (100, 100, 200), self.end_point, 15)
         pygame.draw.circle(self.screen, (255, 255, 0), self.end_point, 15, 2)
-        end_text = self.small_font.render("E", True, (255, 255, 255))
+        end_text = render_text(self.small_font, "E", (255, 255, 255))
         end_rect = end_text.get_rect(center=self.end_point)
         self.screen.blit(end_text, end_rect)
         
         # Draw temp line if drawing
         if self.temp_start:
-            mouse_pos = pygame.mouse.get_pos()
-            if self.canvas_rect.collidepoint(mouse_pos):
-                pygame.draw.line(self.screen, (200, 200, 200), self.temp_start, mouse_pos, 2)
+            if self.canvas_rect.collidepoint(self.mouse_pos):
+                pygame.draw.line(self.screen, (200, 200, 200), self.temp_start, self.mouse_pos, 2)
         
         # Draw mode indicator
-        mode_text = self.font.render(f"Mode: {self.mode.name}", True, (200, 200, 200))
+        mode_text = render_text(self.font, f"Mode: {self.mode.name}", (200, 200, 200))
         self.screen.blit(mode_text, (10, 10))
         
-        # Draw panel
-        self.screen.fill(self.panel_color, self.panel_rect)
+        if area is not None:
+            # The panel border reaches into the canvas
+            self.draw_panel_border()
+            self.screen.set_clip(None)
+    
+    def draw_panel_border(self):
         pygame.draw.line(self.screen, (200, 200, 200), (1000, 0), (1000, self.screen_height), 3)
+    
+    def draw(self):
+        """Draw everything"""
+        self.draw_canvas()
         
-        # Draw buttons
-        for button in self.buttons.values():
-            button.draw(self.screen, self.font)
-        
-        # Draw info
-        info_y = 480
-        info_texts = [
-            "--- LEVEL INFO ---",
-            f"Platforms: {len(self.platforms)}",
-            f"Obstacles: {len(self.obstacles)}",
-            f"Difficulty: {self.difficulty}",
-            f"Time Limit: {self.time_limit}s",
-            "",
-            "--- CONTROLS ---",
-            "Click Add Platform/Obstacle",
-            "Click twice to place",
-            "Drag to move objects",
-            "Delete key to remove",
-            "ESC to cancel mode",
-        ]
-        
-        for i, text in enumerate(info_texts):
-            color = (150, 150, 150) if text.startswith("-") else (200, 200, 200)
-            info_text = self.small_font.render(text, True, color)
-            self.screen.blit(info_text, (1020, info_y + i * 20))
+        # Draw panel
+        self.screen.blit(self.get_panel_surface(), self.panel_rect)
+        self.draw_panel_border()
         
         pygame.display.flip()
+        self.needs_redraw = False
+        self.dirty_rects = []
+    
+    def draw_dirty(self):
+        """Redraw and update only the dirty areas"""
+        for rect in self.dirty_rects:
+            area = rect.clip(self.canvas_rect)
+            if area.width and area.height:
+                self.draw_canvas(area)
+        if any(rect.colliderect(self.panel_rect) for rect in self.dirty_rects):
+            self.screen.blit(self.get_panel_surface(), self.panel_rect)
+            self.draw_panel_border()
+        
+        pygame.display.update(self.dirty_rects)
+        self.dirty_rects = []
+    
+    def refresh(self):
+        """Redraw whatever changed since the last frame"""
+        if self.playtest is not None:
+            self.playtest.advance()
+            self.playtest.draw()
+        elif self.needs_redraw:
+            self.draw()
+        elif self.dirty_rects:
+            self.draw_dirty()
     
     def run(self):
         """Main editor loop"""
         running = True
         while running:
             running = self.handle_events()
-            self.draw()
+            self.refresh()
+            # Caps redraws while dragging or playtesting; when idle handle_events waits instead
             self.clock.tick(60)
         
+        self.close()
         pygame.quit()
 
 
 if __name__ == "__main__":
-    editor = LevelEditor()
+    editor = LevelEditor(autosave_dir=AUTOSAVE_DIR)
     editor.run()
@@ -0,0 +1,319 @@
+"""
+Vectorized simulation of many independent players on one level
+
+BatchSimulation steps N players at once with NumPy and reproduces
+Simulation.update exactly for each of them. Moving objects don't depend on
+the players, so one struct-of-arrays copy of them is shared by the batch.
+Static objects use the level's spatial hash, flattened into sorted arrays so
+candidate pairs for every player can be gathered without a Python loop.
+
+Limitations:
+- Requires numpy, which the game itself does not; importing this module
+  without it raises ImportError.
+- Levels wider than the screen that have moving platforms or obstacles are
+  rejected with ValueError, because moving objects only run near each
+  player's camera there and could no longer be shared by the batch.
+"""
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("batch_simulation requires numpy, install it with: pip install numpy") from e
+
+from level_data import LevelData
+from simulation import DEFAULT_TICK_RATE, Simulation
+from spatial_hash import SpatialHash
+
+# Sentinel larger than any object index
+_NO_INDEX = np.iinfo(np.int64).max
+
+# Packs a cell (cx, cy) into one sortable int64 key; allows levels up to
+# about a hundred million pixels in each direction
+_CELL_OFFSET = 1 << 20
+
+
+class _ObjectArrays:
+    """Struct-of-arrays copy of a level's platforms or obstacles"""
+
+    def __init__(self, objects, type_attr: str, moving_indices):
+        count = len(objects)
+        self.x = np.empty(count)
+        self.y = np.empty(count)
+        self.width = np.empty(count)
+        self.height = np.empty(count)
+        self.spring = np.zeros(count, dtype=bool)
+
+        rect = getattr(objects, 'rect', None)
+        kind = getattr(objects, 'kind', None)
+        for i in range(count):
+            if rect is not None:
+                # Compiled record tables hand out fields without building objects
+                self.x[i], self.y[i], self.width[i], self.height[i] = rect(i)
+                self.spring[i] = kind(i) == "spring"
+            else:
+                obj = objects[i]
+                self.x[i], self.y[i], self.width[i], self.height[i] = obj.x, obj.y, obj.width, obj.height
+                self.spring[i] = getattr(obj, type_attr) == "spring"
+
+        # Integer rects of static objects never change
+        self.rect_x = np.trunc(self.x).astype(np.int64)
+        self.rect_y = np.trunc(self.y).astype(np.int64)
+        self.rect_w = np.trunc(self.width).astype(np.int64)
+        self.rect_h = np.trunc(self.height).astype(np.int64)
+
+        # Moving objects, updated every step
+        self.moving = np.asarray(moving_indices, dtype=np.int64)
+        self.moving_speed = np.array([objects[i].speed for i in moving_indices], dtype=float)
+        self.moving_direction = np.array([objects[i].direction for i in moving_indices], dtype=float)
+
+
+class _FlatGrid:
+    """A SpatialHash flattened into sorted cell keys and a CSR index list"""
+
+    def __init__(self, grid: SpatialHash):
+        self.cell_size = grid.cell_size
+        cells = sorted((_cell_key(cx, cy), sorted(keys)) for (cx, cy), keys in grid.cells())
+        self.keys = np.array([key for key, _ in cells], dtype=np.int64)
+        counts = np.array([len(keys) for _, keys in cells], dtype=np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+        self.counts = counts
+        self.indices = np.array([i for _, keys in cells for i in keys], dtype=np.int64)
+
+    def candidates(self, rect_x, rect_y, rect_w, rect_h):
+        """(row, object index) pairs for objects in the cells each rect touches"""
+        if not len(self.keys):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        # Same padded cell range as SpatialHash.query
+        size = self.cell_size
+        min_cx = np.floor((rect_x - 1) / size).astype(np.int64)
+        min_cy = np.floor((rect_y - 1) / size).astype(np.int64)
+        max_cx = np.floor((rect_x + rect_w + 1) / size).astype(np.int64)
+        max_cy = np.floor((rect_y + rect_h + 1) / size).astype(np.int64)
+        if np.any(max_cx - min_cx > 1) or np.any(max_cy - min_cy > 1):
+            raise ValueError("Cells must be larger than the player")
+
+        rows = np.arange(len(rect_x), dtype=np.int64)
+        pair_rows, pair_starts, pair_counts = [], [], []
+        for dx in (0, 1):
+            for dy in (0, 1):
+                cx = min_cx + dx
+                cy = min_cy + dy
+                inside = (cx <= max_cx) & (cy <= max_cy)
+                keys = _cell_key(cx, cy)
+                slot = np.searchsorted(self.keys, keys)
+                slot = np.minimum(slot, len(self.keys) - 1)
+                found = inside & (self.keys[slot] == keys)
+                pair_rows.append(rows[found])
+                pair_starts.append(self.starts[slot[found]])
+                pair_counts.append(self.counts[slot[found]])
+
+        rows = np.concatenate(pair_rows)
+        starts = np.concatenate(pair_starts)
+        counts = np.concatenate(pair_counts)
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        # Expand every (row, bucket) into one pair per object in the bucket
+        pair_row = np.repeat(rows, counts)
+        first_of_bucket = np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(starts, counts) + (np.arange(total) - first_of_bucket)
+        return pair_row, self.indices[positions]
+
+
+def _cell_key(cx, cy):
+    return (cx + _CELL_OFFSET) * (2 * _CELL_OFFSET) + (cy + _CELL_OFFSET)
+
+
+def _collide(ax, ay, aw, ah, bx, by, bw, bh):
+    """Vectorized simulation.rects_collide"""
+    non_empty = (aw != 0) & (ah != 0) & (bw != 0) & (bh != 0)
+    return (non_empty
+            & (np.minimum(ax, ax + aw) < np.maximum(bx, bx + bw))
+            & (np.minimum(ay, ay + ah) < np.maximum(by, by + bh))
+            & (np.maximum(ax, ax + aw) > np.minimum(bx, bx + bw))
+            & (np.maximum(ay, ay + ah) > np.minimum(by, by + bh)))
+
+
+class BatchSimulation:
+    """Simulates `count` independent players on one level
+
+    Player state is held in arrays of length count. Set `left` and `right`
+    to boolean arrays of held keys and call jump() with a mask, then step().
+    """
+
+    def __init__(self, level: LevelData, screen_width: int, screen_height: int, count: int,
+                 tick_rate: int = DEFAULT_TICK_RATE):
+        # A scalar Simulation provides the physics constants so both stay in sync
+        reference = Simulation(level, screen_width, screen_height, tick_rate)
+        self.level = level
+        self.count = count
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.world_width = reference.world_width
+        self.tick_rate = tick_rate
+        self.tick_dt = reference.tick_dt
+        self.player_radius = reference.player_radius
+        self.gravity = reference.gravity
+        self.jump_power = reference.jump_power
+        self.move_speed = reference.move_speed
+        if reference.scrolling and (level.moving_platform_indices or level.moving_obstacle_indices):
+            # Moving objects only run near each player's camera, so players
+            # would no longer share them
+            raise ValueError("Moving objects in levels wider than the screen are not supported")
+
+        self.platforms = _ObjectArrays(level.platforms, 'platform_type', level.moving_platform_indices)
+        self.obstacles = _ObjectArrays(level.obstacles, 'obstacle_type', level.moving_obstacle_indices)
+        self.platform_grid = _FlatGrid(level.static_platform_grid)
+        self.obstacle_grid = _FlatGrid(level.static_obstacle_grid)
+
+        # Player state
+        spawn_x, spawn_y = level.spawn_point
+        self.x = np.full(count, spawn_x, dtype=float)
+        self.y = np.full(count, spawn_y, dtype=float)
+        self.velocity_x = np.zeros(count)
+        self.velocity_y = np.zeros(count)
+        self.is_jumping = np.zeros(count, dtype=bool)
+        self.left = np.zeros(count, dtype=bool)
+        self.right = np.zeros(count, dtype=bool)
+
+        # Game state
+        self.game_over = np.zeros(count, dtype=bool)
+        self.level_complete = np.zeros(count, dtype=bool)
+        self.elapsed_time = np.zeros(count)
+        self.ticks = np.zeros(count, dtype=np.int64)
+
+    @property
+    def active(self) -> np.ndarray:
+        """Players whose run hasn't ended"""
+        return ~(self.game_over | self.level_complete)
+
+    def jump(self, mask: Optional[np.ndarray] = None):
+        """Perform a jump for the players in mask (all players if None)"""
+        can_jump = ~self.is_jumping if mask is None else mask & ~self.is_jumping
+        self.velocity_y[can_jump] = -self.jump_power
+        self.is_jumping[can_jump] = True
+
+    def step(self):
+        """Advance every active player by one fixed tick"""
+        self.update(self.tick_dt)
+
+    def run(self, max_ticks: int) -> int:
+        """Step until every run ends or max_ticks pass"""
+        ticks = 0
+        while ticks < max_ticks and self.active.any():
+            self.step()
+            ticks += 1
+        return ticks
+
+    def update(self, dt: float):
+        """Vectorized Simulation.update for every active player"""
+        active = np.flatnonzero(self.active)
+        if not len(active):
+            return
+
+        self.ticks[active] += 1
+        self.elapsed_time[active] += dt
+
+        # Check time limit
+        if self.level.time_limit > 0:
+            timed_out = self.elapsed_time[active] > self.level.time_limit
+            self.game_over[active[timed_out]] = True
+            active = active[~timed_out]
+            if not len(active):
+                return
+
+        radius = self.player_radius
+
+        # Horizontal movement, right wins when both keys are held
+        velocity_x = np.where(self.right[active], self.move_speed,
+                              np.where(self.left[active], -self.move_speed, 0)).astype(float)
+        self.velocity_x[active] = velocity_x
+
+        velocity_y = self.velocity_y[active] + self.gravity * dt
+        x = self.x[active] + velocity_x * dt
+        y = self.y[active] + velocity_y * dt
+        x = np.maximum(radius, np.minimum(x, self.world_width - radius))
+
+        self._update_moving(self.platforms, dt)
+        self._update_moving(self.obstacles, dt)
+
+        # Platform collisions: the first platform in level order that the
+        # player lands on decides the outcome, as in the scalar loop
+        player_x, player_y, size = self._player_rect(x, y)
+        first = self._first_landing(player_x, player_y, size, velocity_y)
+        landed = first != _NO_INDEX
+        if landed.any():
+            landing = first[landed]
+            y[landed] = self.platforms.y[landing] - radius
+            spring = self.platforms.spring[landing]
+            velocity_y[landed] = np.where(spring, -self.jump_power * 1.5, 0)
+            jumping = self.is_jumping[active]
+            jumping[landed] = spring
+            self.is_jumping[active] = jumping
+
+        # Obstacle collisions use the rect after landing
+        player_x, player_y, size = self._player_rect(x, y)
+        hit = self._any_obstacle(player_x, player_y, size)
+
+        end_x, end_y = self.level.end_point
+        distance = ((x - end_x) ** 2 + (y - end_y) ** 2) ** 0.5
+
+        self.x[active] = x
+        self.y[active] = y
+        self.velocity_y[active] = velocity_y
+        self.game_over[active[hit | (y > self.screen_height + 100)]] = True
+        self.level_complete[active[distance < radius + 30]] = True
+
+    def _player_rect(self, x, y):
+        radius = self.player_radius
+        size = np.full(len(x), int(radius * 2), dtype=np.int64)
+        return np.trunc(x - radius).astype(np.int64), np.trunc(y - radius).astype(np.int64), size
+
+    def _update_moving(self, objects: _ObjectArrays, dt: float):
+        moving = objects.moving
+        if not len(moving):
+            return
+        x = objects.x[moving] + objects.moving_speed * objects.moving_direction * dt
+        bounce = (x < 0) | (x + objects.width[moving] > self.world_width)
+        objects.moving_direction[bounce] *= -1
+        objects.x[moving] = x
+        objects.rect_x[moving] = np.trunc(x).astype(np.int64)
+
+    def _moving_pairs(self, objects: _ObjectArrays, count: int):
+        """(row, object index) pairs of every player with every moving object"""
+        moving = objects.moving
+        rows = np.repeat(np.arange(count, dtype=np.int64), len(moving))
+        return rows, np.tile(moving, count)
+
+    def _pairs(self, grid: _FlatGrid, objects: _ObjectArrays, player_x, player_y, size):
+        rows, indices = grid.candidates(player_x, player_y, size, size)
+        if len(objects.moving):
+            moving_rows, moving_indices = self._moving_pairs(objects, len(player_x))
+            rows = np.concatenate((rows, moving_rows))
+            indices = np.concatenate((indices, moving_indices))
+        objects_hit = _collide(player_x[rows], player_y[rows], size[rows], size[rows],
+                               objects.rect_x[indices], objects.rect_y[indices],
+                               objects.rect_w[indices], objects.rect_h[indices])
+        return rows[objects_hit], indices[objects_hit]
+
+    def _first_landing(self, player_x, player_y, size, velocity_y):
+        platforms = self.platforms
+        rows, indices = self._pairs(self.platform_grid, platforms, player_x, player_y, size)
+        player_center = player_y[rows] + size[rows] // 2
+        platform_center = platforms.rect_y[indices] + platforms.rect_h[indices] // 2
+        lands = (velocity_y[rows] > 0) & (player_center < platform_center)
+
+        first = np.full(len(player_x), _NO_INDEX, dtype=np.int64)
+        np.minimum.at(first, rows[lands], indices[lands])
+        return first
+
+    def _any_obstacle(self, player_x, player_y, size):
+        rows, _ = self._pairs(self.obstacle_grid, self.obstacles, player_x, player_y, size)
+        hit = np.zeros(len(player_x), dtype=bool)
+        hit[rows] = True
+        return hit
@@ -0,0 +1,259 @@
+"""
+Background autosave and crash recovery for the level editor
+
+The editor hands every change to an Autosave as small JSON records. A worker
+thread appends them to a journal and now and then compacts the journal into
+a snapshot of the whole level. Snapshots and the journal's restarts are
+written to a temporary file that is then renamed over the old one, so a
+crash never leaves half a file behind. After a crash, recover() rebuilds
+the level from the snapshot plus whatever the journal recorded after it.
+
+The editor thread only puts records on a queue; every disk access,
+including saving levels with save_level(), happens on the worker.
+
+Files in the autosave directory:
+    autosave.json     Snapshot: a level file whose objects carry their editor
+                      id, plus the generation of the journal that follows it
+    autosave.journal  JSON lines: a header with the snapshot's generation,
+                      then one record per line
+
+Records:
+    {"op": "put", "kind": "platforms", "id": 3, "data": {...}}    added or changed
+    {"op": "delete", "kind": "platforms", "id": 3}
+    {"op": "clear", "kind": "platforms"}
+    {"op": "level", "data": {"difficulty": 4, ...}}              level properties
+
+This module does not import pygame.
+"""
+import json
+import os
+import queue
+import threading
+from typing import Dict, List, Optional
+
+from level_data import atomic_write
+from level_manifest import LevelManifest
+
+SNAPSHOT_FILE = "autosave.json"
+JOURNAL_FILE = "autosave.journal"
+
+# Compact after this many records, or once the editor has been idle this long
+COMPACT_EVERY = 500
+IDLE_COMPACT_SECONDS = 5.0
+
+OBJECT_KINDS = ("platforms", "obstacles")
+
+
+def write_custom_level(levels_dir: str, data: dict) -> str:
+    """Save a level as the first free customN.json, returning its path
+    
+    The free name comes from the levels folder's manifest, which is updated
+    with the new level right away.
+    """
+    os.makedirs(levels_dir, exist_ok=True)
+    manifest = LevelManifest(levels_dir)
+    manifest.refresh()
+    level_name = manifest.next_free_name("custom")
+    custom_num = int(level_name[len("custom"):])
+
+    data = dict(data, name=f"Custom Level {custom_num}")
+    filename = os.path.join(levels_dir, f"{level_name}.json")
+    atomic_write(filename, json.dumps(data, indent=2))
+    manifest.update(level_name)
+    print(f"✓ Level saved to {filename}")
+    return filename
+
+
+class _Replica:
+    """The worker's copy of the level, kept up to date from the records"""
+
+    def __init__(self, level: dict):
+        self.level = {key: value for key, value in level.items() if key not in OBJECT_KINDS}
+        self.level.pop("autosave_generation", None)
+        self.objects: Dict[str, Dict[int, dict]] = {}
+        for kind in OBJECT_KINDS:
+            self.objects[kind] = {}
+            for number, data in enumerate(level.get(kind, []), 1):
+                data = dict(data)
+                self.objects[kind][data.pop("id", number)] = data
+
+    def apply(self, record: dict):
+        op = record["op"]
+        if op == "put":
+            self.objects[record["kind"]][record["id"]] = record["data"]
+        elif op == "delete":
+            self.objects[record["kind"]].pop(record["id"], None)
+        elif op == "clear":
+            self.objects[record["kind"]].clear()
+        elif op == "level":
+            self.level.update(record["data"])
+
+    def to_level(self, generation: int) -> dict:
+        level = dict(self.level)
+        for kind in OBJECT_KINDS:
+            level[kind] = [dict(data, id=obj_id) for obj_id, data in self.objects[kind].items()]
+        level["autosave_generation"] = generation
+        return level
+
+
+class Autosave:
+    """Journal of editor changes written by a background thread"""
+
+    def __init__(self, directory: str, compact_every: int = COMPACT_EVERY,
+                 idle_seconds: float = IDLE_COMPACT_SECONDS):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, JOURNAL_FILE)
+        self.compact_every = compact_every
+        self.idle_seconds = idle_seconds
+        self.generation = 0
+        self.compactions = 0
+        self._queue = queue.Queue()
+        self._thread = None
+
+        # Only touched by the worker
+        self._replica: Optional[_Replica] = None
+        self._journal = None
+        self._pending = 0
+
+    def start(self, level: dict):
+        """Start journaling, with the editor's current level as the first snapshot"""
+        self._thread = threading.Thread(target=self._run, name="editor-autosave", daemon=True)
+        self._thread.start()
+        self._queue.put(("start", level))
+
+    def record(self, records: List[dict]):
+        """Queue records for the journal; never waits for the disk"""
+        if records:
+            self._queue.put(("records", records))
+
+    def compact(self):
+        """Ask for the journal to be folded into the snapshot"""
+        self._queue.put(("compact", None))
+
+    def save_level(self, levels_dir: str, data: dict):
+        """Save a level as the next customN.json from the worker thread"""
+        self._queue.put(("save", (levels_dir, data)))
+
+    def flush(self):
+        """Wait until everything queued so far has been written"""
+        self._queue.join()
+
+    def close(self, discard: bool = True):
+        """Stop the worker; the autosave files are removed unless discard is False"""
+        if self._thread is None:
+            return
+        self._queue.put(("stop", discard))
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            try:
+                kind, payload = self._queue.get(timeout=self.idle_seconds)
+            except queue.Empty:
+                if self._pending:
+                    self._try(self._compact)
+                continue
+
+            try:
+                if kind == "start":
+                    self._try(self._start, payload)
+                elif kind == "records":
+                    self._try(self._write_records, payload)
+                elif kind == "compact":
+                    self._try(self._compact)
+                elif kind == "save":
+                    self._try(write_custom_level, *payload)
+                elif kind == "stop":
+                    self._try(self._stop, payload)
+                    return
+            finally:
+                self._queue.task_done()
+
+    def _try(self, function, *args):
+        # Any failure is reported and the worker carries on, so that flush()
+        # and close() never wait on a dead thread
+        try:
+            function(*args)
+        except Exception as e:
+            print(f"✗ Autosave failed: {type(e).__name__}: {e}")
+
+    def _start(self, level: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        self._replica = _Replica(level)
+        self._compact()
+
+    def _write_records(self, records: List[dict]):
+        # Serialized first, so records that can't be written aren't applied either
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        for record in records:
+            self._replica.apply(record)
+        if self._journal is None:
+            return
+        self._journal.write(lines)
+        self._journal.flush()
+        self._pending += len(records)
+        if self._pending >= self.compact_every:
+            self._compact()
+
+    def _compact(self):
+        """Write a new snapshot, then start an empty journal after it"""
+        if self._replica is None:
+            return
+        self.generation += 1
+        atomic_write(self.snapshot_path, json.dumps(self._replica.to_level(self.generation)))
+        # A crash here leaves the old journal, which recover() skips because
+        # its generation no longer matches the snapshot
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        atomic_write(self.journal_path, json.dumps({"generation": self.generation}) + "\n")
+        self._journal = open(self.journal_path, 'a')
+        self._pending = 0
+        self.compactions += 1
+
+    def _stop(self, discard: bool):
+        if discard:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            for path in (self.journal_path, self.snapshot_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        else:
+            self._compact()
+            self._journal.close()
+            self._journal = None
+
+
+def recover(directory: str) -> Optional[dict]:
+    """The level an editor session left behind in an autosave directory, or None"""
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    journal_path = os.path.join(directory, JOURNAL_FILE)
+    try:
+        with open(snapshot_path) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    generation = snapshot.get("autosave_generation")
+    replica = _Replica(snapshot)
+    try:
+        with open(journal_path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        lines = []
+
+    try:
+        header = json.loads(lines[0]) if lines else {}
+    except ValueError:
+        header = {}
+    if header.get("generation") == generation:
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # The write the crash interrupted
+            replica.apply(record)
+    return replica.to_level(generation)
@@ -0,0 +1,226 @@
+"""
+Undo/redo history for the level editor
+
+Every change the editor makes goes through History.execute() as a command
+that knows how to apply and revert itself. Commands only hold what changed:
+an id and a position for a move, the removed objects for a delete or clear.
+Objects are shared with the level, never copied, so the history stays small
+no matter how big the level is.
+
+Commands pushed in a row merge where that makes sense (the moves of one
+drag become a single entry) until checkpoint() is called, which the editor
+does on every mouse press and release. The history keeps at most
+max_entries undo steps and drops the oldest ones once its estimated size
+goes over max_bytes.
+
+This module does not import pygame.
+"""
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+
+from editor_objects import EditorObjects
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Rough sizes for the memory cap: a command with its tuples, and a removed
+# object kept alive only by the history
+COMMAND_BYTES = 200
+OBJECT_BYTES = 400
+
+
+class Command:
+    """A reversible change to the level"""
+
+    size = COMMAND_BYTES
+
+    def apply(self):
+        raise NotImplementedError
+
+    def revert(self):
+        raise NotImplementedError
+
+    def merge(self, other: 'Command') -> bool:
+        """Fold a following command into this one, returning whether it did"""
+        return False
+
+
+class AddObject(Command):
+    def __init__(self, objects: EditorObjects, obj):
+        self.objects = objects
+        self.obj = obj
+        self.obj_id = None  # Assigned the first time, reused on redo
+
+    def apply(self):
+        self.obj_id = self.objects.add(self.obj, self.obj_id)
+
+    def revert(self):
+        self.objects.remove(self.obj_id)
+
+
+class DeleteObject(Command):
+    size = COMMAND_BYTES + OBJECT_BYTES
+
+    def __init__(self, objects: EditorObjects, obj_id: int):
+        self.objects = objects
+        self.obj_id = obj_id
+        self.obj = None
+
+    def apply(self):
+        self.obj = self.objects.remove(self.obj_id)
+
+    def revert(self):
+        self.objects.add(self.obj, self.obj_id)
+
+
+class MoveObject(Command):
+    def __init__(self, objects: EditorObjects, obj_id: int, x: float, y: float):
+        self.objects = objects
+        self.obj_id = obj_id
+        self.old: Optional[Tuple[float, float]] = None
+        self.new = (x, y)
+
+    def apply(self):
+        if self.old is None:
+            obj = self.objects[self.obj_id]
+            self.old = (obj.x, obj.y)
+        self.objects.move(self.obj_id, *self.new)
+
+    def revert(self):
+        self.objects.move(self.obj_id, *self.old)
+
+    def merge(self, other):
+        if isinstance(other, MoveObject) and other.objects is self.objects and other.obj_id == self.obj_id:
+            self.new = other.new
+            return True
+        return False
+
+
+class ClearObjects(Command):
+    """Remove every object from some collections
+
+    The collections' contents, index included, are set aside whole rather
+    than copied, so clearing and undoing it don't depend on the level size.
+    """
+
+    def __init__(self, collections: Iterable[EditorObjects]):
+        self.collections = list(collections)
+        self.removed = []
+        self.size = COMMAND_BYTES
+
+    def apply(self):
+        count = sum(len(objects) for objects in self.collections)
+        self.removed = [objects.detach() for objects in self.collections]
+        self.size = COMMAND_BYTES + OBJECT_BYTES * count
+
+    def revert(self):
+        for objects, state in zip(self.collections, self.removed):
+            objects.restore(state)
+        self.removed = []
+
+
+class SetAttribute(Command):
+    """Change an attribute of the editor or of an object
+
+    Give objects and obj_id when the target is an editor object, so its
+    position in the picking index follows changes to its rect.
+    """
+
+    def __init__(self, target, name: str, value, objects: EditorObjects = None, obj_id: int = None):
+        self.target = target
+        self.name = name
+        self.old = getattr(target, name)
+        self.new = value
+        self.objects = objects
+        self.obj_id = obj_id
+
+    def apply(self):
+        self._set(self.new)
+
+    def revert(self):
+        self._set(self.old)
+
+    def merge(self, other):
+        if isinstance(other, SetAttribute) and other.target is self.target and other.name == self.name:
+            self.new = other.new
+            return True
+        return False
+
+    def _set(self, value):
+        setattr(self.target, self.name, value)
+        if self.objects is not None:
+            self.objects.update(self.obj_id)
+
+
+class History:
+    """Undo and redo stacks of commands"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo: List[Command] = []
+        self._bytes = 0
+        self._can_merge = False
+
+    def __len__(self):
+        return len(self._undo)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def execute(self, command: Command):
+        """Apply a command and record it, merging it into the last one if possible"""
+        command.apply()
+        self._redo.clear()
+        if self._can_merge and self._undo and self._undo[-1].merge(command):
+            return
+        self._push(command)
+        self._can_merge = True
+
+    def checkpoint(self):
+        """Keep the next command from merging into the last one"""
+        self._can_merge = False
+
+    def undo(self) -> Optional[Command]:
+        """Revert the last command, returning it"""
+        if not self._undo:
+            return None
+        command = self._undo.pop()
+        self._bytes -= command.size
+        command.revert()
+        self._redo.append(command)
+        self._can_merge = False
+        return command
+
+    def redo(self) -> Optional[Command]:
+        """Apply the last undone command again, returning it"""
+        if not self._redo:
+            return None
+        command = self._redo.pop()
+        command.apply()
+        self._push(command)
+        self._can_merge = False
+        return command
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+        self._can_merge = False
+
+    def stats(self):
+        """Entry counts and estimated size, for diagnostics"""
+        return {"undo": len(self._undo), "redo": len(self._redo), "bytes": self._bytes}
+
+    def _push(self, command: Command):
+        self._undo.append(command)
+        self._bytes += command.size
+        # Always keep the newest entry, even if it alone is over the cap
+        while len(self._undo) > 1 and (len(self._undo) > self.max_entries or self._bytes > self.max_bytes):
+            self._bytes -= self._undo.popleft().size
@@ -0,0 +1,143 @@
+"""
+Level editor objects keyed by stable ids
+
+The editor keeps its platforms and obstacles in an EditorObjects collection
+each. Every object gets an id when it is added that stays the same until it
+is removed, so selections and other references survive deletes elsewhere in
+the level. Ids grow in the order objects are added and are also the drawing
+order, so an object put back with its old id (by undo) returns to its place
+among the others. A spatial hash over the objects makes picking by mouse
+position independent of the level size.
+
+on_change, when set, is called with an object's id after it is added,
+removed, moved or updated, and with None when the whole collection changes
+at once; the editor's autosave uses it to write only what changed. version
+counts those changes, so callers can tell whether anything changed since
+they last looked.
+
+This module does not import pygame.
+"""
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from spatial_hash import SpatialHash
+
+# Editor objects are small and the canvas is 1000x800, so smaller cells than
+# the game's keep the candidates per click low
+DEFAULT_CELL_SIZE = 64
+
+
+def contains_point(obj, x: float, y: float) -> bool:
+    """Whether an object's rect contains the point, as pygame.Rect.collidepoint"""
+    left, top = int(obj.x), int(obj.y)
+    width, height = int(obj.width), int(obj.height)
+    if width < 0:
+        left, width = left + width, -width
+    if height < 0:
+        top, height = top + height, -height
+    return left <= x < left + width and top <= y < top + height
+
+
+class EditorObjects:
+    """Platforms or obstacles of the level being edited, in id (drawing) order"""
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE):
+        self._objects: Dict[int, object] = {}  # id -> object, in id order unless _unordered
+        self._grid = SpatialHash(cell_size)
+        self._next_id = 1
+        self._unordered = False
+        self.on_change: Optional[Callable[[Optional[int]], None]] = None
+        self.version = 0
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._ordered().values())
+
+    def __contains__(self, object_id):
+        return object_id in self._objects
+
+    def __getitem__(self, object_id: int):
+        return self._objects[object_id]
+
+    def items(self) -> Iterator[Tuple[int, object]]:
+        """(id, object) pairs in drawing order"""
+        return iter(self._ordered().items())
+
+    def add(self, obj, object_id: Optional[int] = None) -> int:
+        """Add an object, returning its id; an id can be given to put a removed object back"""
+        if object_id is None:
+            object_id = self._next_id
+        elif object_id in self._objects:
+            raise ValueError(f"Object id {object_id} is already in use")
+        elif self._objects and object_id < next(reversed(self._objects)):
+            self._unordered = True
+        self._next_id = max(self._next_id, object_id + 1)
+        self._objects[object_id] = obj
+        self._grid.insert(object_id, obj.x, obj.y, obj.width, obj.height)
+        self._changed(object_id)
+        return object_id
+
+    def remove(self, object_id: int):
+        """Remove an object by id and return it"""
+        obj = self._objects.pop(object_id)
+        self._grid.remove(object_id)
+        self._changed(object_id)
+        return obj
+
+    def move(self, object_id: int, x: float, y: float):
+        """Move an object to a new position"""
+        obj = self._objects[object_id]
+        obj.x, obj.y = x, y
+        self._grid.move(object_id, obj.x, obj.y, obj.width, obj.height)
+        self._changed(object_id)
+
+    def update(self, object_id: int):
+        """Re-index an object after its position or size was changed directly"""
+        obj = self._objects[object_id]
+        self._grid.move(object_id, obj.x, obj.y, obj.width, obj.height)
+        self._changed(object_id)
+
+    def clear(self):
+        self._objects.clear()
+        self._grid.clear()
+        self._unordered = False
+        self._changed(None)
+
+    def detach(self):
+        """Remove every object at once, returning them in a form restore() takes back"""
+        state = (self._objects, self._grid, self._unordered)
+        self._objects = {}
+        self._grid = SpatialHash(self._grid.cell_size)
+        self._unordered = False
+        self._changed(None)
+        return state
+
+    def restore(self, state):
+        """Put back the objects detach() removed; the collection must be empty"""
+        if self._objects:
+            raise ValueError("Objects can only be restored into an empty collection")
+        self._objects, self._grid, self._unordered = state
+        self._changed(None)
+
+    def pick(self, x: float, y: float) -> Optional[int]:
+        """Id of the earliest added object containing the point, or None"""
+        hits = [object_id for object_id in self._grid.query_point(x, y)
+                if contains_point(self._objects[object_id], x, y)]
+        return min(hits) if hits else None
+
+    def query(self, x: float, y: float, width: float, height: float) -> List[int]:
+        """Ids of objects that may overlap the area, in id order"""
+        return sorted(self._grid.query(x, y, width, height))
+
+    def _changed(self, object_id: Optional[int]):
+        self.version += 1
+        if self.on_change is not None:
+            self.on_change(object_id)
+
+    def _ordered(self) -> Dict[int, object]:
+        """The objects by id, sorted again if an old id was put back"""
+        if self._unordered:
+            self._objects = dict(sorted(self._objects.items()))
+            self._unordered = False
+        return self._objects
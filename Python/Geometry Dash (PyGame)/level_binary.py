@@ -0,0 +1,322 @@
+"""
+Compiled binary level format
+
+Levels are compiled from the JSON format described in LEVEL_FORMAT.md into a
+compact file that can be memory-mapped. Platforms and obstacles are stored as
+fixed-width records, and object types and colors are interned into small
+lookup tables so every record has the same size.
+
+File layout (little-endian):
+    header          see HEADER below
+    name            UTF-8 bytes of the level name
+    type table      count entries of (u16 length, UTF-8 bytes)
+    color table     count entries of (r, g, b) bytes
+    padding         zero bytes up to an 8 byte boundary
+    platforms       platform_count records, see RECORD below
+    obstacles       obstacle_count records
+
+Usage:
+    python level_binary.py Levels/            # compile every level in a folder
+    python level_binary.py Levels/level1.json # compile a single level
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Iterator, List, Tuple
+
+from level_data import (COMPILED_EXTENSION, MOVING_OBSTACLE_TYPES, MOVING_PLATFORM_TYPES,
+                        LevelData, Obstacle, Platform, parse_level_data)
+
+MAGIC = b'GDLB'
+VERSION = 2
+
+# magic, version, flags, difficulty, time_limit, width, spawn x/y, end x/y,
+# background rgb, platform/obstacle/type/color counts, name length
+HEADER = struct.Struct('<4sHHddd4d3Bx5I')
+
+# x, y, width, height, speed, direction, type index, color index
+RECORD = struct.Struct('<5dbxHI')
+
+
+class RecordTable:
+    """Read-only sequence of platform or obstacle records in a mapped file
+
+    Static records are decoded from the mapping on access and are never held
+    as Python objects. Moving records are materialized once when the table is
+    opened, since every run copies them anyway.
+
+    Indexing a static record builds a new Platform or Obstacle each time,
+    which is fine for the few objects near the player or in view. Code that
+    goes over every record, like building the collision grids and x indexes,
+    reads columns() instead and allocates no object per record.
+    """
+
+    def __init__(self, buffer, offset: int, count: int, types: List[str],
+                 colors: List[tuple], factory, moving_types: set):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+        self._types = types
+        self._colors = colors
+        self._factory = factory
+
+        self._moving = {}
+        moving_indices = {i for i, kind in enumerate(types) if kind in moving_types}
+        if moving_indices:
+            for i in range(count):
+                if self.raw(i)[6] in moving_indices:
+                    self._moving[i] = self._decode(i)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("record index out of range")
+        if index in self._moving:
+            return self._moving[index]
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator:
+        for i in range(self._count):
+            yield self[i]
+
+    def raw(self, index: int) -> tuple:
+        """Unpack a record as (x, y, width, height, speed, direction, type, color)"""
+        return RECORD.unpack_from(self._buffer, self._offset + index * RECORD.size)
+
+    def rect(self, index: int) -> Tuple[float, float, float, float]:
+        """Get (x, y, width, height) of a record without building an object"""
+        if index in self._moving:
+            obj = self._moving[index]
+            return (obj.x, obj.y, obj.width, obj.height)
+        return struct.unpack_from('<4d', self._buffer, self._offset + index * RECORD.size)
+
+    def columns(self) -> Tuple[memoryview, memoryview, memoryview, memoryview]:
+        """Zero-copy (x, y, width, height) views indexed by record
+
+        Records are a whole number of doubles long and start 8-byte aligned,
+        so each column is a strided view of the records as doubles. Moving
+        records read their values from the file, not from their objects.
+        The views keep the file mapped until they are released.
+        """
+        doubles = memoryview(self._buffer)[self._offset:self._offset + self._count * RECORD.size].cast('d')
+        stride = RECORD.size // 8
+        return doubles[0::stride], doubles[1::stride], doubles[2::stride], doubles[3::stride]
+
+    def kind(self, index: int) -> str:
+        """Get the interned type string of a record"""
+        return self._types[self.raw(index)[6]]
+
+    def close(self):
+        """Stop reading records from the mapped file
+
+        The records are copied into memory first, so the table keeps working
+        for anyone still holding it; the mapping is released once nothing
+        else refers to it.
+        """
+        if isinstance(self._buffer, bytes):
+            return
+        self._buffer = bytes(self._buffer[self._offset:self._offset + self._count * RECORD.size])
+        self._offset = 0
+
+    def moving_indices(self) -> List[int]:
+        """Indices of records that move during play"""
+        return sorted(self._moving)
+
+    def as_array(self):
+        """Zero-copy NumPy structured array over the records (requires numpy)"""
+        import numpy as np
+        dtype = np.dtype([
+            ('x', '<f8'), ('y', '<f8'), ('width', '<f8'), ('height', '<f8'),
+            ('speed', '<f8'), ('direction', 'i1'), ('pad', 'V1'),
+            ('type', '<u2'), ('color', '<u4'),
+        ])
+        return np.frombuffer(self._buffer, dtype=dtype, count=self._count, offset=self._offset)
+
+    def _decode(self, index: int):
+        x, y, width, height, speed, direction, type_index, color_index = self.raw(index)
+        return self._factory(x, y, width, height, self._types[type_index],
+                             self._colors[color_index], speed, direction)
+
+
+class CompiledLevel:
+    """A memory-mapped compiled level"""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        with open(filepath, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = read_header(self._mmap)
+        (_, _, _, self.difficulty, self.time_limit, width,
+         spawn_x, spawn_y, end_x, end_y, bg_r, bg_g, bg_b,
+         platform_count, obstacle_count, type_count, color_count, name_length) = header
+        self.difficulty = _number(self.difficulty)
+        self.time_limit = _number(self.time_limit)
+        self.width = _number(width)
+        self.spawn_point = (spawn_x, spawn_y)
+        self.end_point = (end_x, end_y)
+        self.background_color = (bg_r, bg_g, bg_b)
+
+        offset = HEADER.size
+        self.name = bytes(self._mmap[offset:offset + name_length]).decode('utf-8')
+        offset += name_length
+
+        self.types = []
+        for _ in range(type_count):
+            (length,) = struct.unpack_from('<H', self._mmap, offset)
+            offset += 2
+            self.types.append(bytes(self._mmap[offset:offset + length]).decode('utf-8'))
+            offset += length
+
+        self.colors = []
+        for _ in range(color_count):
+            self.colors.append(tuple(self._mmap[offset:offset + 3]))
+            offset += 3
+
+        offset = _align(offset)
+        self.platforms = RecordTable(self._mmap, offset, platform_count,
+                                     self.types, self.colors, Platform, MOVING_PLATFORM_TYPES)
+        offset += platform_count * RECORD.size
+        self.obstacles = RecordTable(self._mmap, offset, obstacle_count,
+                                     self.types, self.colors, Obstacle, MOVING_OBSTACLE_TYPES)
+
+    def close(self):
+        """Unmap the file, e.g. so it can be replaced on Windows; see RecordTable.close()"""
+        self.platforms.close()
+        self.obstacles.close()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Arrays from as_array() still use the mapping; it is released with them
+            pass
+
+    def to_level_data(self) -> LevelData:
+        """Wrap the mapped records in a LevelData"""
+        return LevelData(
+            name=self.name,
+            difficulty=self.difficulty,
+            time_limit=self.time_limit,
+            obstacles=self.obstacles,
+            platforms=self.platforms,
+            background_color=self.background_color,
+            spawn_point=self.spawn_point,
+            end_point=self.end_point,
+            width=self.width,
+            source_hash=hashlib.sha1(self._mmap).hexdigest()
+        )
+
+
+def read_header(buffer) -> tuple:
+    """Unpack and validate the header of a compiled level"""
+    if len(buffer) < HEADER.size:
+        raise ValueError("File too small to be a compiled level")
+    header = HEADER.unpack_from(buffer, 0)
+    if header[0] != MAGIC:
+        raise ValueError("Not a compiled level file")
+    if header[1] != VERSION:
+        raise ValueError(f"Unsupported compiled level version {header[1]}")
+    return header
+
+
+def read_level_info(filepath: str) -> Tuple[str, float]:
+    """Read (name, difficulty) from a compiled level without mapping it"""
+    with open(filepath, 'rb') as f:
+        header = read_header(f.read(HEADER.size))
+        name = f.read(header[-1]).decode('utf-8')
+    return name, _number(header[3])
+
+
+def write_compiled_level(level: LevelData, filepath: str):
+    """Write a level in the compiled binary format"""
+    types = {}
+    colors = {}
+
+    def records(objects, type_attr):
+        packed = []
+        for obj in objects:
+            type_index = types.setdefault(getattr(obj, type_attr), len(types))
+            color_index = colors.setdefault(tuple(int(c) for c in obj.color[:3]), len(colors))
+            packed.append(RECORD.pack(obj.x, obj.y, obj.width, obj.height, obj.speed,
+                                      obj.direction, type_index, color_index))
+        return packed
+
+    platform_records = records(level.platforms, 'platform_type')
+    obstacle_records = records(level.obstacles, 'obstacle_type')
+
+    name_bytes = level.name.encode('utf-8')
+    chunks = [HEADER.pack(
+        MAGIC, VERSION, 0, level.difficulty, level.time_limit, level.width,
+        *level.spawn_point, *level.end_point, *level.background_color,
+        len(platform_records), len(obstacle_records), len(types), len(colors),
+        len(name_bytes)
+    ), name_bytes]
+    for kind in types:
+        kind_bytes = kind.encode('utf-8')
+        chunks.append(struct.pack('<H', len(kind_bytes)) + kind_bytes)
+    for color in colors:
+        chunks.append(bytes(color))
+
+    size = sum(len(chunk) for chunk in chunks)
+    chunks.append(b'\0' * (_align(size) - size))
+    chunks.extend(platform_records)
+    chunks.extend(obstacle_records)
+
+    # Write to a temporary file first so readers never see a partial level
+    temp_path = filepath + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(b''.join(chunks))
+    os.replace(temp_path, filepath)
+
+
+def compile_level_file(json_path: str, output_path: str = None) -> str:
+    """Compile a JSON level file, returning the path of the compiled file"""
+    if output_path is None:
+        output_path = os.path.splitext(json_path)[0] + COMPILED_EXTENSION
+
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+
+    write_compiled_level(parse_level_data(data), output_path)
+    return output_path
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _number(value: float):
+    """Give back whole numbers as ints, as they were written in the JSON"""
+    return int(value) if value.is_integer() else value
+
+
+def main(args: List[str]) -> int:
+    if not args:
+        print(__doc__)
+        return 1
+
+    for path in args:
+        if os.path.isdir(path):
+            files = [os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith('.json')]
+        else:
+            files = [path]
+
+        for json_path in files:
+            try:
+                output_path = compile_level_file(json_path)
+                print(f"✓ {json_path} -> {output_path}")
+            except Exception as e:
+                print(f"✗ {json_path}: {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
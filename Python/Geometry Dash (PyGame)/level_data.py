@@ -0,0 +1,247 @@
+"""
+Level data model shared by the game, the editor and headless tools
+
+This module does not depend on pygame, so levels can be loaded and simulated
+on machines without a display.
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from typing import List, Sequence
+
+from spatial_hash import SpatialHash, build_spatial_hash
+from x_index import XIndex, build_x_index
+
+# Extension of levels compiled with level_binary.py
+COMPILED_EXTENSION = '.gdl'
+
+# Object types that move every frame during play
+MOVING_PLATFORM_TYPES = {"moving"}
+MOVING_OBSTACLE_TYPES = {"moving_box"}
+
+
+@dataclass
+class Obstacle:
+    """Represents an obstacle (spike, box, etc.)"""
+    x: float
+    y: float
+    width: float
+    height: float
+    obstacle_type: str  # "spike", "box", "moving_box", etc.
+    color: tuple = (255, 0, 0)  # RGB
+    speed: float = 0  # For moving obstacles
+    direction: int = 1  # 1 for right, -1 for left
+
+
+@dataclass
+class Platform:
+    """Represents a platform"""
+    x: float
+    y: float
+    width: float
+    height: float
+    platform_type: str  # "ground", "spring", "moving", etc.
+    color: tuple = (100, 100, 100)  # RGB
+    speed: float = 0  # For moving platforms
+    direction: int = 1
+
+
+@dataclass(frozen=True)
+class LevelData:
+    """Complete level data
+    
+    A LevelData is a shared template: it is cached by LevelManager and must
+    not be changed during play. Per-run state lives in GameState.
+    """
+    name: str
+    difficulty: int  # 1-10
+    time_limit: float  # seconds, 0 for no limit
+    obstacles: Sequence[Obstacle]
+    platforms: Sequence[Platform]
+    background_color: tuple
+    spawn_point: tuple  # (x, y)
+    end_point: tuple  # (x, y) - level goal
+    width: float = 0  # pixels; 0 for a level that fits the screen
+    # sha1 of the file the level was loaded from, "" if built in memory; it
+    # identifies the file, not the content, so it is left out of comparisons
+    source_hash: str = field(default="", compare=False)
+    
+    @cached_property
+    def moving_platform_indices(self) -> List[int]:
+        """Indices of platforms that move during play"""
+        return _moving_indices(self.platforms, 'platform_type', MOVING_PLATFORM_TYPES)
+    
+    @cached_property
+    def moving_obstacle_indices(self) -> List[int]:
+        """Indices of obstacles that move during play"""
+        return _moving_indices(self.obstacles, 'obstacle_type', MOVING_OBSTACLE_TYPES)
+    
+    @cached_property
+    def static_platform_grid(self) -> SpatialHash:
+        """Broadphase over platforms that never move, built once per level"""
+        return _static_grid(self.platforms, self.moving_platform_indices)
+    
+    @cached_property
+    def static_obstacle_grid(self) -> SpatialHash:
+        """Broadphase over obstacles that never move, built once per level"""
+        return _static_grid(self.obstacles, self.moving_obstacle_indices)
+    
+    @cached_property
+    def static_platform_x_index(self) -> XIndex:
+        """Static platforms sorted by x, for finding what's in view"""
+        return _static_x_index(self.platforms, self.moving_platform_indices)
+    
+    @cached_property
+    def static_obstacle_x_index(self) -> XIndex:
+        """Static obstacles sorted by x, for finding what's in view"""
+        return _static_x_index(self.obstacles, self.moving_obstacle_indices)
+
+
+def _moving_indices(objects, type_attr: str, moving_types: set) -> List[int]:
+    if hasattr(objects, 'moving_indices'):
+        # Compiled record tables already know their moving records
+        return objects.moving_indices()
+    return [i for i, obj in enumerate(objects) if getattr(obj, type_attr) in moving_types]
+
+
+def _static_grid(objects, moving_indices: List[int]) -> SpatialHash:
+    moving = set(moving_indices)
+    return build_spatial_hash(objects, (i for i in range(len(objects)) if i not in moving))
+
+
+def _static_x_index(objects, moving_indices: List[int]) -> XIndex:
+    moving = set(moving_indices)
+    return build_x_index(objects, (i for i in range(len(objects)) if i not in moving))
+
+
+class LevelObjects:
+    """Per-run view of a template's platforms or obstacles
+    
+    Reads fall through to the shared template. A moving object is copied the
+    first time it is written, so starting a run costs nothing for static
+    geometry and the template is never modified.
+    """
+    
+    def __init__(self, template: Sequence, moving_indices: List[int]):
+        self.template = template
+        self.moving_indices = moving_indices
+        self._copies = {}
+    
+    def __len__(self):
+        return len(self.template)
+    
+    def __getitem__(self, index):
+        copy = self._copies.get(index)
+        return copy if copy is not None else self.template[index]
+    
+    def __iter__(self):
+        if not self._copies:
+            return iter(self.template)
+        return (self[i] for i in range(len(self.template)))
+    
+    def writable(self, index: int):
+        """Get this run's own copy of an object, copying it on first use"""
+        copy = self._copies.get(index)
+        if copy is None:
+            copy = replace(self.template[index])
+            self._copies[index] = copy
+        return copy
+    
+    def clone(self) -> 'LevelObjects':
+        """Independent view with copies of this run's written objects"""
+        other = LevelObjects(self.template, self.moving_indices)
+        other._copies = {index: replace(obj) for index, obj in self._copies.items()}
+        return other
+
+
+def parse_level_data(data: dict) -> LevelData:
+    """Build a LevelData from a level dictionary in the JSON format"""
+    # Parse obstacles
+    obstacles = []
+    for obs_data in data.get('obstacles', []):
+        obstacles.append(Obstacle(
+            x=obs_data['x'],
+            y=obs_data['y'],
+            width=obs_data['width'],
+            height=obs_data['height'],
+            obstacle_type=obs_data.get('type', 'box'),
+            color=tuple(obs_data.get('color', [255, 0, 0])),
+            speed=obs_data.get('speed', 0),
+            direction=obs_data.get('direction', 1)
+        ))
+    
+    # Parse platforms
+    platforms = []
+    for plat_data in data.get('platforms', []):
+        platforms.append(Platform(
+            x=plat_data['x'],
+            y=plat_data['y'],
+            width=plat_data['width'],
+            height=plat_data['height'],
+            platform_type=plat_data.get('type', 'ground'),
+            color=tuple(plat_data.get('color', [100, 100, 100])),
+            speed=plat_data.get('speed', 0),
+            direction=plat_data.get('direction', 1)
+        ))
+    
+    level = LevelData(
+        name=data['name'],
+        difficulty=data.get('difficulty', 1),
+        time_limit=data.get('time_limit', 0),
+        obstacles=obstacles,
+        platforms=platforms,
+        background_color=tuple(data.get('background_color', [0, 0, 0])),
+        spawn_point=tuple(data.get('spawn_point', [100, 100])),
+        end_point=tuple(data.get('end_point', [1200, 300])),
+        width=data.get('width', 0)
+    )
+    
+    return level
+
+
+def level_file_path(levels_dir: str, level_name: str) -> str:
+    """Path of a level, preferring a compiled file that is up to date"""
+    json_path = os.path.join(levels_dir, f"{level_name}.json")
+    compiled_path = os.path.join(levels_dir, f"{level_name}{COMPILED_EXTENSION}")
+    
+    if os.path.exists(compiled_path):
+        if not os.path.exists(json_path) or os.path.getmtime(compiled_path) >= os.path.getmtime(json_path):
+            return compiled_path
+    return json_path
+
+
+def atomic_write(path: str, text: str):
+    """Replace a file's contents so readers see either the old or the new file"""
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def close_level(level: LevelData):
+    """Release the file a loaded level keeps open; the level stays usable
+
+    Compiled levels read their records from a memory-mapped file, which
+    can't be replaced on Windows while mapped. Other levels hold no files.
+    """
+    for objects in (level.platforms, level.obstacles):
+        close = getattr(objects, 'close', None)
+        if close is not None:
+            close()
+
+
+def load_level_file(filepath: str) -> LevelData:
+    """Load a level from a JSON or compiled file"""
+    if filepath.endswith(COMPILED_EXTENSION):
+        # Compiled levels are memory-mapped rather than parsed
+        from level_binary import CompiledLevel
+        return CompiledLevel(filepath).to_level_data()
+    
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    
+    return replace(parse_level_data(json.loads(content)), source_hash=hashlib.sha1(content).hexdigest())
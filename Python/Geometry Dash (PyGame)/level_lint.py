@@ -0,0 +1,329 @@
+"""
+Level linter
+
+Checks every level in a folder for mistakes that load fine but make a
+level broken or unfair:
+
+- schema: missing or mistyped fields, non-positive sizes, out of range
+  difficulty (JSON levels; compiled ones were checked when compiled)
+- overlap: static platforms and obstacles that overlap each other
+- spawn: the player starts inside an obstacle
+- end_point: the goal lies outside the level
+- color: colors that aren't 3 or 4 integers from 0 to 255
+
+Overlaps are found with a sweep line over the objects sorted by left edge,
+so a level costs O(n log n) plus the number of objects whose x ranges
+overlap, rather than comparing all pairs. Moving objects are left out of
+the overlap check since they pass through other objects during play.
+Rectangles are compared the way the game compares them (rects_collide
+on truncated coordinates), so objects that only touch don't count.
+
+Levels are linted in parallel, one level per task.
+
+Usage:
+    python level_lint.py                     # every level in Levels/
+    python level_lint.py level1 custom1      # selected levels
+    python level_lint.py --format json --output report.json
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from level_data import (COMPILED_EXTENSION, MOVING_OBSTACLE_TYPES, MOVING_PLATFORM_TYPES, LevelData,
+                        load_level_file, parse_level_data)
+from level_manifest import LevelManifest
+from simulation import PLAYER_RADIUS, SCREEN_HEIGHT, SCREEN_WIDTH, int_rect
+
+ERROR = "error"
+WARNING = "warning"
+
+# Issues listed per check and level; the rest are only counted
+MAX_ISSUES_PER_CHECK = 20
+
+OBJECT_FIELDS = ('x', 'y', 'width', 'height')
+
+# (left, top, right, bottom)
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class LintIssue:
+    """One problem found in a level"""
+    check: str  # schema, overlap, spawn, end_point or color
+    severity: str  # error or warning
+    message: str
+
+
+@dataclass
+class LintReport:
+    """Everything found in one level"""
+    level_name: str
+    file: str
+    issues: List[LintIssue] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)  # issues per check, including unlisted ones
+    objects: int = 0
+
+    def add(self, check: str, severity: str, message: str):
+        count = self.counts.get(check, 0)
+        self.counts[check] = count + 1
+        if count < MAX_ISSUES_PER_CHECK:
+            self.issues.append(LintIssue(check, severity, message))
+
+    @property
+    def errors(self) -> int:
+        return sum(1 for issue in self.issues if issue.severity == ERROR)
+
+    @property
+    def warnings(self) -> int:
+        return sum(1 for issue in self.issues if issue.severity == WARNING)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_point(value) -> bool:
+    return isinstance(value, (list, tuple)) and len(value) == 2 and all(_is_number(v) for v in value)
+
+
+def is_valid_color(color) -> bool:
+    """Whether pygame accepts color as an RGB or RGBA tuple"""
+    return (isinstance(color, (list, tuple)) and len(color) in (3, 4)
+            and all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in color))
+
+
+def check_schema(data, report: LintReport) -> bool:
+    """Check a level dictionary against the JSON level format
+
+    Returns whether it can be parsed into a LevelData for the other checks.
+    """
+    if not isinstance(data, dict):
+        report.add("schema", ERROR, "level is not a JSON object")
+        return False
+
+    # Any field of the wrong type makes the level unparseable, so the other
+    # checks only ever see levels the loader accepts
+    parseable = True
+    if not isinstance(data.get('name'), str):
+        report.add("schema", ERROR, "'name' must be a string")
+        parseable = False
+    difficulty = data.get('difficulty', 1)
+    # Whole-number floats such as 2.0 load as that difficulty
+    if not _is_number(difficulty) or not float(difficulty).is_integer() or not 1 <= difficulty <= 10:
+        report.add("schema", ERROR, f"'difficulty' must be an integer from 1 to 10, not {difficulty!r}")
+        parseable = parseable and _is_number(difficulty)
+    for key in ('time_limit', 'width'):
+        value = data.get(key, 0)
+        if not _is_number(value) or value < 0:
+            report.add("schema", ERROR, f"'{key}' must be a number of at least 0, not {value!r}")
+            parseable = parseable and _is_number(value)
+    for key in ('spawn_point', 'end_point'):
+        if key in data and not _is_point(data[key]):
+            report.add("schema", ERROR, f"'{key}' must be [x, y], not {data[key]!r}")
+            parseable = False
+
+    for key in ('platforms', 'obstacles'):
+        objects = data.get(key, [])
+        if not isinstance(objects, list):
+            report.add("schema", ERROR, f"'{key}' must be a list")
+            parseable = False
+            continue
+        kind = key[:-1]
+        for i, obj in enumerate(objects):
+            if not isinstance(obj, dict):
+                report.add("schema", ERROR, f"{kind} {i} is not an object")
+                parseable = False
+                continue
+            missing = [name for name in OBJECT_FIELDS if not _is_number(obj.get(name))]
+            if missing:
+                report.add("schema", ERROR, f"{kind} {i}: {', '.join(missing)} missing or not a number")
+                parseable = False
+            elif obj['width'] <= 0 or obj['height'] <= 0:
+                report.add("schema", ERROR, f"{kind} {i} has size {obj['width']}x{obj['height']}")
+            if not isinstance(obj.get('type', ''), str):
+                report.add("schema", ERROR, f"{kind} {i}: 'type' must be a string")
+                parseable = False
+            for name in ('speed', 'direction'):
+                if name in obj and not _is_number(obj[name]):
+                    report.add("schema", ERROR, f"{kind} {i}: '{name}' must be a number")
+                    parseable = False
+    return parseable
+
+
+def check_colors(level: LevelData, report: LintReport):
+    if not is_valid_color(level.background_color):
+        report.add("color", ERROR, f"background color {level.background_color!r} is not valid")
+    for kind, objects in (("platform", level.platforms), ("obstacle", level.obstacles)):
+        for i, obj in enumerate(objects):
+            if not is_valid_color(obj.color):
+                report.add("color", ERROR, f"{kind} {i} has color {obj.color!r}")
+
+
+def _box(x: float, y: float, width: float, height: float) -> Optional[Box]:
+    """The area a rect collides with, or None if it can't collide"""
+    x, y, width, height = int_rect(x, y, width, height)
+    if not (width and height):
+        return None
+    # Negative sizes extend up/left of the origin, as in rects_collide
+    return (min(x, x + width), min(y, y + height), max(x, x + width), max(y, y + height))
+
+
+def find_overlaps(boxes: Sequence[Optional[Box]]) -> Iterator[Tuple[int, int]]:
+    """Pairs of indices of boxes that overlap, touching ones excluded
+
+    Sweeps a vertical line from left to right. Boxes the line is crossing are
+    kept active, ordered by right edge in a heap, and each new box is only
+    compared with the active ones.
+    """
+    order = sorted((box[0], i) for i, box in enumerate(boxes) if box is not None)
+    ending: List[Tuple[int, int]] = []  # (right, index) of active boxes
+    active: Dict[int, Box] = {}
+    for left, i in order:
+        while ending and ending[0][0] <= left:
+            del active[heapq.heappop(ending)[1]]
+        _, top, right, bottom = box = boxes[i]
+        for j, (_, other_top, _, other_bottom) in active.items():
+            if top < other_bottom and other_top < bottom:
+                yield (j, i) if j < i else (i, j)
+        active[i] = box
+        heapq.heappush(ending, (right, i))
+
+
+def check_overlaps(level: LevelData, report: LintReport):
+    moving_platforms = {i for i, p in enumerate(level.platforms) if p.platform_type in MOVING_PLATFORM_TYPES}
+    moving_obstacles = {i for i, o in enumerate(level.obstacles) if o.obstacle_type in MOVING_OBSTACLE_TYPES}
+    # Platforms first, then obstacles, in one list
+    boxes = [None if i in moving_platforms else _box(p.x, p.y, p.width, p.height)
+             for i, p in enumerate(level.platforms)]
+    boxes += [None if i in moving_obstacles else _box(o.x, o.y, o.width, o.height)
+              for i, o in enumerate(level.obstacles)]
+    platform_count = len(level.platforms)
+
+    def describe(index):
+        if index < platform_count:
+            return f"platform {index}"
+        return f"obstacle {index - platform_count}"
+
+    for a, b in find_overlaps(boxes):
+        report.add("overlap", WARNING, f"{describe(a)} overlaps {describe(b)}")
+
+
+def check_points(level: LevelData, report: LintReport):
+    x, y = level.spawn_point
+    spawn = _box(x - PLAYER_RADIUS, y - PLAYER_RADIUS, PLAYER_RADIUS * 2, PLAYER_RADIUS * 2)
+    for i, o in enumerate(level.obstacles):
+        box = _box(o.x, o.y, o.width, o.height)
+        if box is not None and box[0] < spawn[2] and spawn[0] < box[2] and box[1] < spawn[3] and spawn[1] < box[3]:
+            report.add("spawn", ERROR, f"spawn point {level.spawn_point} is inside obstacle {i}")
+
+    world_width = max(SCREEN_WIDTH, level.width)
+    end_x, end_y = level.end_point
+    if not (0 <= end_x <= world_width and 0 <= end_y <= SCREEN_HEIGHT):
+        report.add("end_point", ERROR,
+                   f"end point {level.end_point} is outside the level (0..{world_width:g}, 0..{SCREEN_HEIGHT})")
+
+
+def lint_level(level: LevelData, report: LintReport) -> LintReport:
+    """Run the checks that work on a loaded level"""
+    report.objects = len(level.platforms) + len(level.obstacles)
+    check_colors(level, report)
+    check_points(level, report)
+    check_overlaps(level, report)
+    return report
+
+
+def lint_file(levels_dir: str, level_name: str) -> LintReport:
+    """Worker entry point: load a level by name and lint it"""
+    json_path = os.path.join(levels_dir, f"{level_name}.json")
+    if not os.path.exists(json_path):
+        filepath = os.path.join(levels_dir, f"{level_name}{COMPILED_EXTENSION}")
+        report = LintReport(level_name, os.path.basename(filepath))
+        try:
+            return lint_level(load_level_file(filepath), report)
+        except Exception as e:
+            report.add("schema", ERROR, f"cannot load level: {type(e).__name__}: {e}")
+            return report
+
+    # JSON levels are checked against the format before parsing
+    report = LintReport(level_name, os.path.basename(json_path))
+    try:
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        report.add("schema", ERROR, f"cannot read level: {e}")
+        return report
+    if not check_schema(data, report):
+        return report
+    try:
+        level = parse_level_data(data)
+    except Exception as e:
+        report.add("schema", ERROR, f"cannot load level: {type(e).__name__}: {e}")
+        return report
+    return lint_level(level, report)
+
+
+def lint_directory(levels_dir: str, level_names: Optional[List[str]] = None,
+                   workers: Optional[int] = None) -> Dict[str, LintReport]:
+    """Lint many levels in parallel, one level per task"""
+    if level_names is None:
+        manifest = LevelManifest(levels_dir)
+        manifest.refresh()
+        level_names = manifest.names()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lint_file, [levels_dir] * len(level_names), level_names)
+        return dict(zip(level_names, results))
+
+
+def format_text(reports: Dict[str, LintReport]) -> str:
+    lines = []
+    for name, report in reports.items():
+        if not report.counts:
+            lines.append(f"✓ {name}: {report.objects} objects, no issues")
+            continue
+        counts = ", ".join(f"{count} {check}" for check, count in sorted(report.counts.items()))
+        mark = "✗" if report.errors else "!"
+        lines.append(f"{mark} {name} ({report.file}): {counts}")
+        for issue in report.issues:
+            lines.append(f"    {issue.severity}: [{issue.check}] {issue.message}")
+        unlisted = sum(report.counts.values()) - len(report.issues)
+        if unlisted:
+            lines.append(f"    ... and {unlisted} more")
+    failed = sum(1 for report in reports.values() if report.errors)
+    lines.append(f"\n{len(reports) - failed}/{len(reports)} levels without errors")
+    return "\n".join(lines)
+
+
+def format_json(reports: Dict[str, LintReport]) -> str:
+    return json.dumps({"levels": [asdict(report) for report in reports.values()]}, indent=2)
+
+
+def main(argv: List[str]) -> int:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Check levels for mistakes")
+    parser.add_argument("levels", nargs="*", help="level names (default: all)")
+    parser.add_argument("--levels-dir", default=os.path.join(script_dir, "Levels"), help="levels folder")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="report format")
+    parser.add_argument("--output", help="write the report to this file instead of printing it")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    args = parser.parse_args(argv)
+
+    reports = lint_directory(args.levels_dir, args.levels or None, args.workers)
+    text = format_json(reports) if args.format == "json" else format_text(reports)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    failed = any(report.errors or (args.strict and report.warnings) for report in reports.values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,53 +1,141 @@
-import json
 import pygame
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 
+from level_data import (Obstacle, Platform, LevelData, LevelObjects, parse_level_data, load_level_file,
+                        level_file_path, close_level, COMPILED_EXTENSION, MOVING_PLATFORM_TYPES,
+                        MOVING_OBSTACLE_TYPES)
+from level_manifest import LevelManifest
+from level_simplify import simplify_level
+from simulation import Simulation, FixedTimestep, DEFAULT_TICK_RATE
 
-@dataclass
-class Obstacle:
-    """Represents an obstacle (spike, box, etc.)"""
-    x: float
-    y: float
-    width: float
-    height: float
-    obstacle_type: str  # "spike", "box", "moving_box", etc.
-    color: tuple = (255, 0, 0)  # RGB
-    speed: float = 0  # For moving obstacles
-    direction: int = 1  # 1 for right, -1 for left
+# The level types and timing helpers moved to level_data and simulation but
+# are still importable from here, as main, the editor and older code expect
+__all__ = [
+    'Obstacle', 'Platform', 'LevelData', 'LevelObjects', 'parse_level_data',
+    'MOVING_PLATFORM_TYPES', 'MOVING_OBSTACLE_TYPES', 'FixedTimestep', 'DEFAULT_TICK_RATE',
+    'DEFAULT_CACHE_ENTRIES', 'DEFAULT_CACHE_BYTES', 'KEY_ACTIONS',
+    'LevelInfo', 'LevelCache', 'LevelManager', 'GameState',
+]
+
+# Default budget for parsed levels kept in memory
+DEFAULT_CACHE_ENTRIES = 64
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
 
 
 @dataclass
-class Platform:
-    """Represents a platform"""
-    x: float
-    y: float
-    width: float
-    height: float
-    platform_type: str  # "ground", "spring", "moving", etc.
-    color: tuple = (100, 100, 100)  # RGB
-    speed: float = 0  # For moving platforms
-    direction: int = 1
+class LevelInfo:
+    """Cheap catalog entry for a level that may not be parsed yet"""
+    level_name: str  # file name without extension
+    name: str  # display name
+    difficulty: int
 
 
-@dataclass
-class LevelData:
-    """Complete level data"""
-    name: str
-    difficulty: int  # 1-10
-    time_limit: float  # seconds, 0 for no limit
-    obstacles: List[Obstacle]
-    platforms: List[Platform]
-    background_color: tuple
-    spawn_point: tuple  # (x, y)
-    end_point: tuple  # (x, y) - level goal
+class LevelCache:
+    """LRU cache of parsed levels that notices when their file changes
+    
+    Entries are validated against the file's mtime and size on every lookup.
+    The byte budget is measured by the size of the level files on disk.
+    A budget of 0 means unlimited. Levels leaving the cache are closed, so
+    compiled level files are no longer mapped.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # level_name -> (level, filepath, mtime_ns, size)
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def __contains__(self, level_name):
+        return level_name in self._entries
+    
+    def __getitem__(self, level_name) -> LevelData:
+        return self._entries[level_name][0]
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get(self, level_name: str, filepath: str) -> Optional[LevelData]:
+        """Get a cached level if its file has not changed since it was loaded"""
+        entry = self._entries.get(level_name)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        level, cached_path, mtime_ns, size = entry
+        try:
+            stat = os.stat(filepath)
+            fresh = cached_path == filepath and stat.st_mtime_ns == mtime_ns and stat.st_size == size
+        except OSError:
+            fresh = False
+        
+        if not fresh:
+            self.invalidations += 1
+            self.misses += 1
+            self.discard(level_name)
+            return None
+        
+        self.hits += 1
+        self._entries.move_to_end(level_name)
+        return level
+    
+    def put(self, level_name: str, level: LevelData, filepath: str, stat: os.stat_result):
+        """Add a level, evicting the least recently used ones over budget"""
+        self.discard(level_name)
+        self._entries[level_name] = (level, filepath, stat.st_mtime_ns, stat.st_size)
+        self.total_bytes += stat.st_size
+        
+        # Never evict the entry that was just added
+        while len(self._entries) > 1 and self._over_budget():
+            oldest = next(iter(self._entries))
+            self.discard(oldest)
+            self.evictions += 1
+    
+    def discard(self, level_name: str):
+        """Remove a level from the cache if present"""
+        entry = self._entries.pop(level_name, None)
+        if entry is not None:
+            self.total_bytes -= entry[3]
+            close_level(entry[0])
+    
+    def clear(self):
+        """Remove every cached level"""
+        for level_name in list(self._entries):
+            self.discard(level_name)
+    
+    def stats(self) -> Dict[str, int]:
+        """Cache counters for diagnostics"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+    
+    def _over_budget(self) -> bool:
+        if self.max_entries and len(self._entries) > self.max_entries:
+            return True
+        return bool(self.max_bytes) and self.total_bytes > self.max_bytes
 
 
 class LevelManager:
     """Manages level loading and game objects"""
     
-    def __init__(self, levels_dir: str = None):
+    def __init__(self, levels_dir: str = None, lazy: bool = True,
+                 cache_entries: int = DEFAULT_CACHE_ENTRIES, cache_bytes: int = DEFAULT_CACHE_BYTES,
+                 simplify: bool = True):
         # Get directory relative to this script's location
         if levels_dir is None:
             script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -55,237 +143,144 @@ class LevelManager:
         
         self.levels_dir = levels_dir
         self.current_level = None
-        self.levels = {}
+        self.levels = LevelCache(cache_entries, cache_bytes)
+        self.catalog: Dict[str, LevelInfo] = {}
+        # Touching static platforms are merged as levels load (see level_simplify.py)
+        self.simplify = simplify
+        self.merged_platforms: Dict[str, int] = {}  # Platforms removed per loaded level
         self._ensure_levels_dir()
-        self.load_all_levels()
+        self.manifest = LevelManifest(self.levels_dir)
+        
+        # In lazy mode the catalog comes from the levels folder's manifest,
+        # bodies are parsed the first time get_level() asks for them
+        if lazy:
+            self.scan_levels()
+        else:
+            self.load_all_levels()
     
     def _ensure_levels_dir(self):
         """Create levels directory if it doesn't exist"""
         if not os.path.exists(self.levels_dir):
             os.makedirs(self.levels_dir)
     
+    def scan_levels(self):
+        """Catalog available levels from the manifest, indexing only new or changed files"""
+        if not os.path.exists(self.levels_dir):
+            return
+        
+        self.manifest.refresh()
+        for entry in self.manifest.entries():
+            if entry.error:
+                print(f"Error loading level {entry.level_name}: {entry.error}")
+            else:
+                self.catalog[entry.level_name] = LevelInfo(entry.level_name, entry.name, entry.difficulty)
+    
+    def _level_files(self) -> List[str]:
+        """Names of all level files, JSON or compiled"""
+        names = set()
+        for filename in os.listdir(self.levels_dir):
+            base, ext = os.path.splitext(filename)
+            if ext in ('.json', COMPILED_EXTENSION):
+                names.add(base)
+        return sorted(names)
+    
+    def _level_path(self, level_name: str) -> str:
+        """Path of a level, preferring a compiled file that is up to date"""
+        return level_file_path(self.levels_dir, level_name)
+    
     def load_all_levels(self):
         """Load all available levels"""
         if not os.path.exists(self.levels_dir):
             return
         
-        for filename in sorted(os.listdir(self.levels_dir)):
-            if filename.endswith('.json'):
-                level_name = filename.replace('.json', '')
-                try:
-                    self.load_level_from_file(level_name)
-                except Exception as e:
-                    print(f"Error loading level {level_name}: {e}")
+        for level_name in self._level_files():
+            try:
+                self.load_level_from_file(level_name)
+            except Exception as e:
+                print(f"Error loading level {level_name}: {e}")
     
     def load_level_from_file(self, level_name: str) -> LevelData:
-        """Load a level from JSON file"""
-        filepath = os.path.join(self.levels_dir, f"{level_name}.json")
-        
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+        """Load a level from its JSON or compiled file"""
+        filepath = self._level_path(level_name)
+        stat = os.stat(filepath)
+        level = load_level_file(filepath)
+        if self.simplify:
+            simplified = simplify_level(level)
+            self.merged_platforms[level_name] = len(level.platforms) - len(simplified.platforms)
+            level = simplified
         
-        # Parse obstacles
-        obstacles = []
-        for obs_data in data.get('obstacles', []):
-            obstacles.append(Obstacle(
-                x=obs_data['x'],
-                y=obs_data['y'],
-                width=obs_data['width'],
-                height=obs_data['height'],
-                obstacle_type=obs_data.get('type', 'box'),
-                color=tuple(obs_data.get('color', [255, 0, 0])),
-                speed=obs_data.get('speed', 0),
-                direction=obs_data.get('direction', 1)
-            ))
-        
-        # Parse platforms
-        platforms = []
-        for plat_data in data.get('platforms', []):
-            platforms.append(Platform(
-                x=plat_data['x'],
-                y=plat_data['y'],
-                width=plat_data['width'],
-                height=plat_data['height'],
-                platform_type=plat_data.get('type', 'ground'),
-                color=tuple(plat_data.get('color', [100, 100, 100])),
-                speed=plat_data.get('speed', 0),
-                direction=plat_data.get('direction', 1)
-            ))
-        
-        level = LevelData(
-            name=data['name'],
-            difficulty=data.get('difficulty', 1),
-            time_limit=data.get('time_limit', 0),
-            obstacles=obstacles,
-            platforms=platforms,
-            background_color=tuple(data.get('background_color', [0, 0, 0])),
-            spawn_point=tuple(data.get('spawn_point', [100, 100])),
-            end_point=tuple(data.get('end_point', [1200, 300]))
-        )
-        
-        self.levels[level_name] = level
+        self.levels.put(level_name, level, filepath, stat)
+        self.catalog[level_name] = LevelInfo(level_name, level.name, level.difficulty)
         return level
     
     def get_level(self, level_name: str) -> LevelData:
-        """Get a loaded level"""
+        """Get a level, parsing it on first access or after its file changed"""
+        level = self.levels.get(level_name, self._level_path(level_name))
+        if level is None:
+            level = self.load_level_from_file(level_name)
+        return level
+    
+    def reload_level(self, level_name: str) -> Optional[LevelData]:
+        """Bring one level up to date after its file changed on disk
+        
+        A cached level is parsed again and then replaces the old one in a
+        single step, so a lookup gets either the old or the new level. A
+        level that isn't cached only has its catalog entry updated. Returns
+        the new LevelData, or None if the level wasn't cached or its file is
+        gone. If the new file can't be read the old level stays cached and
+        ValueError is raised.
+        """
+        entry = self.manifest.update(level_name)
+        if entry is None:
+            self.levels.discard(level_name)
+            self.catalog.pop(level_name, None)
+            return None
+        if entry.error:
+            raise ValueError(f"Error loading level {level_name}: {entry.error}")
+        
+        self.catalog[level_name] = LevelInfo(level_name, entry.name, entry.difficulty)
         if level_name not in self.levels:
+            return None
+        return self.load_level_from_file(level_name)
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters of the level cache"""
+        return self.levels.stats()
+    
+    def get_level_info(self, level_name: str) -> LevelInfo:
+        """Get catalog metadata for a level without parsing it"""
+        if level_name not in self.catalog:
             self.load_level_from_file(level_name)
-        return self.levels[level_name]
+        return self.catalog[level_name]
     
     def list_levels(self) -> List[str]:
         """List all available levels"""
-        return sorted(self.levels.keys())
+        return sorted(self.catalog.keys())
 
 
-class GameState:
-    """Manages game state and collision detection"""
-    
-    def __init__(self, level: LevelData, screen_width: int, screen_height: int):
-        self.level = level
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        
-        # Player state
-        self.player_pos = pygame.Vector2(*level.spawn_point)
-        self.player_velocity_x = 0
-        self.player_velocity_y = 0
-        self.is_jumping = False
-        self.player_radius = 20
-        
-        # Game state
-        self.game_over = False
-        self.level_complete = False
-        self.start_time = pygame.time.get_ticks()
-        self.elapsed_time = 0
-        
-        # Physics
-        self.gravity = 700
-        self.jump_power = 400
-        self.move_speed = 300  # Horizontal movement speed
-        self.keys_pressed = set()  # Track which keys are currently pressed
-    
-    def update(self, dt: float):
-        """Update game state"""
-        if self.game_over or self.level_complete:
-            return
-        
-        self.elapsed_time = (pygame.time.get_ticks() - self.start_time) / 1000
-        
-        # Check time limit
-        if self.level.time_limit > 0 and self.elapsed_time > self.level.time_limit:
-            self.game_over = True
-            return
-        
-        # Handle horizontal movement based on keys pressed
-        self.player_velocity_x = 0
-        if 'left' in self.keys_pressed:
-            self.player_velocity_x = -self.move_speed
-        if 'right' in self.keys_pressed:
-            self.player_velocity_x = self.move_speed
-        
-        # Apply gravity
-        self.player_velocity_y += self.gravity * dt
-        
-        # Update player position
-        self.player_pos.x += self.player_velocity_x * dt
-        self.player_pos.y += self.player_velocity_y * dt
-        
-        # Keep player in bounds horizontally
-        self.player_pos.x = max(self.player_radius, min(self.player_pos.x, self.screen_width - self.player_radius))
-        
-        # Update moving platforms
-        for platform in self.level.platforms:
-            if platform.platform_type == "moving":
-                platform.x += platform.speed * platform.direction * dt
-                # Bounce at screen edges
-                if platform.x < 0 or platform.x + platform.width > self.screen_width:
-                    platform.direction *= -1
-        
-        # Update moving obstacles
-        for obstacle in self.level.obstacles:
-            if obstacle.obstacle_type == "moving_box":
-                obstacle.x += obstacle.speed * obstacle.direction * dt
-                if obstacle.x < 0 or obstacle.x + obstacle.width > self.screen_width:
-                    obstacle.direction *= -1
-        
-        # Collision detection with platforms
-        self._check_platform_collisions()
-        
-        # Collision detection with obstacles
-        self._check_obstacle_collisions()
-        
-        # Check if level complete
-        self._check_level_complete()
-        
-        # Out of bounds
-        if self.player_pos.y > self.screen_height + 100:
-            self.game_over = True
-    
-    def jump(self):
-        """Perform a jump"""
-        if not self.is_jumping:
-            self.player_velocity_y = -self.jump_power
-            self.is_jumping = True
+# Keys mapped to simulation input actions
+KEY_ACTIONS = {
+    pygame.K_SPACE: 'jump',
+    pygame.K_w: 'jump',
+    pygame.K_UP: 'jump',
+    pygame.K_a: 'left',
+    pygame.K_LEFT: 'left',
+    pygame.K_d: 'right',
+    pygame.K_RIGHT: 'right',
+}
+
+
+class GameState(Simulation):
+    """Interactive game state: the simulation core driven by pygame input"""
     
     def handle_key_down(self, key):
         """Handle key press"""
-        if key == pygame.K_w or key == pygame.K_UP:
-            self.keys_pressed.add('jump')
-        elif key == pygame.K_a or key == pygame.K_LEFT:
-            self.keys_pressed.add('left')
-        elif key == pygame.K_d or key == pygame.K_RIGHT:
-            self.keys_pressed.add('right')
+        action = KEY_ACTIONS.get(key)
+        if action is not None:
+            self.press(action)
     
     def handle_key_up(self, key):
         """Handle key release"""
-        if key == pygame.K_a or key == pygame.K_LEFT:
-            self.keys_pressed.discard('left')
-        elif key == pygame.K_d or key == pygame.K_RIGHT:
-            self.keys_pressed.discard('right')
-    
-    def _check_platform_collisions(self):
-        """Check collision with platforms"""
-        player_rect = pygame.Rect(
-            self.player_pos.x - self.player_radius,
-            self.player_pos.y - self.player_radius,
-            self.player_radius * 2,
-            self.player_radius * 2
-        )
-        
-        for platform in self.level.platforms:
-            platform_rect = pygame.Rect(platform.x, platform.y, platform.width, platform.height)
-            
-            if player_rect.colliderect(platform_rect):
-                # Landing on platform
-                if self.player_velocity_y > 0 and player_rect.centery < platform_rect.centery:
-                    self.player_pos.y = platform.y - self.player_radius
-                    self.player_velocity_y = 0
-                    self.is_jumping = False
-                    
-                    # Spring platforms bounce higher
-                    if platform.platform_type == "spring":
-                        self.player_velocity_y = -self.jump_power * 1.5
-                        self.is_jumping = True
-    
-    def _check_obstacle_collisions(self):
-        """Check collision with obstacles"""
-        player_rect = pygame.Rect(
-            self.player_pos.x - self.player_radius,
-            self.player_pos.y - self.player_radius,
-            self.player_radius * 2,
-            self.player_radius * 2
-        )
-        
-        for obstacle in self.level.obstacles:
-            obstacle_rect = pygame.Rect(obstacle.x, obstacle.y, obstacle.width, obstacle.height)
-            
-            if player_rect.colliderect(obstacle_rect):
-                self.game_over = True
-    
-    def _check_level_complete(self):
-        """Check if player reached the end point"""
-        end_x, end_y = self.level.end_point
-        distance = ((self.player_pos.x - end_x) ** 2 + (self.player_pos.y - end_y) ** 2) ** 0.5
-        
-        if distance < self.player_radius + 30:
-            self.level_complete = True
+        action = KEY_ACTIONS.get(key)
+        if action is not None and action in self.keys_pressed:
+            self.release(action)
@@ -0,0 +1,214 @@
+"""
+Index of the levels in a folder, kept next to them on disk
+
+The manifest records what the menu, the editor and the tools want to know
+about each level without parsing it: display name, difficulty, object
+counts, bounding box and a content hash. Each entry also records the
+mtime and size of the file it was made from. refresh() uses them to
+re-index only files that were added or changed since the manifest was
+last written. A fresh folder is indexed once, and every later listing
+costs a directory scan.
+
+The manifest file, levels.manifest in the levels folder, is only a cache:
+if it is deleted, corrupt or out of date, refresh() rebuilds what's missing.
+
+A level saved as both name.json and name.gdl is indexed from the JSON
+source; both hold the same level.
+
+This module does not import pygame.
+"""
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from level_data import COMPILED_EXTENSION, atomic_write, load_level_file
+
+MANIFEST_FILE = "levels.manifest"
+MANIFEST_VERSION = 1
+
+LEVEL_EXTENSIONS = ('.json', COMPILED_EXTENSION)
+
+
+@dataclass
+class ManifestEntry:
+    """What the manifest knows about one level"""
+    level_name: str  # file name without extension
+    file: str  # file the entry was made from
+    mtime_ns: int
+    size: int
+    hash: str  # sha1 of the file's bytes
+    name: str = ""  # display name
+    difficulty: int = 1
+    platforms: int = 0
+    obstacles: int = 0
+    bounds: Optional[Tuple[float, float, float, float]] = None  # left, top, right, bottom of all objects
+    error: Optional[str] = None  # set if the file could not be read as a level
+
+
+def level_bounds(rects) -> Optional[Tuple[float, float, float, float]]:
+    """Box around (x, y, width, height) rects, or None if there are none"""
+    left = top = float("inf")
+    right = bottom = float("-inf")
+    for x, y, width, height in rects:
+        left, top = min(left, x), min(top, y)
+        right, bottom = max(right, x + width), max(bottom, y + height)
+    if left == float("inf"):
+        return None
+    return (left, top, right, bottom)
+
+
+def index_level_file(level_name: str, filepath: str, stat: os.stat_result) -> ManifestEntry:
+    """Read a level file and summarize it"""
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    entry = ManifestEntry(level_name, os.path.basename(filepath), stat.st_mtime_ns, stat.st_size,
+                          hashlib.sha1(content).hexdigest())
+    try:
+        if filepath.endswith(COMPILED_EXTENSION):
+            level = load_level_file(filepath)
+            entry.name, entry.difficulty = level.name, level.difficulty
+            objects = list(level.platforms) + list(level.obstacles)
+            entry.platforms, entry.obstacles = len(level.platforms), len(level.obstacles)
+            rects = ((obj.x, obj.y, obj.width, obj.height) for obj in objects)
+        else:
+            data = json.loads(content)
+            entry.name, entry.difficulty = data['name'], data.get('difficulty', 1)
+            platforms, obstacles = data.get('platforms', []), data.get('obstacles', [])
+            entry.platforms, entry.obstacles = len(platforms), len(obstacles)
+            rects = ((obj['x'], obj['y'], obj['width'], obj['height']) for obj in platforms + obstacles)
+        entry.bounds = level_bounds(rects)
+    except Exception as e:
+        entry.error = f"{type(e).__name__}: {e}"
+    return entry
+
+
+class LevelManifest:
+    """Metadata of every level in a folder, loaded from and saved to its manifest file"""
+
+    def __init__(self, levels_dir: str):
+        self.levels_dir = levels_dir
+        self.path = os.path.join(levels_dir, MANIFEST_FILE)
+        self._entries: Dict[str, ManifestEntry] = {}
+        self.indexed = 0  # Files read by this instance, for diagnostics
+        self.load()
+
+    def __contains__(self, level_name):
+        return level_name in self._entries
+
+    def __getitem__(self, level_name) -> ManifestEntry:
+        return self._entries[level_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, level_name: str) -> Optional[ManifestEntry]:
+        return self._entries.get(level_name)
+
+    def names(self) -> List[str]:
+        """Names of all indexed levels, sorted"""
+        return sorted(self._entries)
+
+    def entries(self, predicate: Callable[[ManifestEntry], bool] = None) -> List[ManifestEntry]:
+        """Entries sorted by level name, optionally only those matching predicate"""
+        return [self._entries[name] for name in self.names()
+                if predicate is None or predicate(self._entries[name])]
+
+    def next_free_name(self, prefix: str) -> str:
+        """First of prefix1, prefix2, ... that no level uses"""
+        number = 1
+        while f"{prefix}{number}" in self._entries:
+            number += 1
+        return f"{prefix}{number}"
+
+    def load(self):
+        """Read the manifest file; a missing or unreadable one leaves the manifest empty"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                return
+            entries = {}
+            for level_name, fields in data["levels"].items():
+                if fields.get("bounds") is not None:
+                    fields["bounds"] = tuple(fields["bounds"])
+                entries[level_name] = ManifestEntry(level_name=level_name, **fields)
+            self._entries = entries
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self._entries = {}
+
+    def save(self):
+        """Write the manifest file, replacing the old one in one step"""
+        levels = {}
+        for level_name, entry in self._entries.items():
+            fields = asdict(entry)
+            del fields["level_name"]
+            levels[level_name] = fields
+        atomic_write(self.path, json.dumps({"version": MANIFEST_VERSION, "levels": levels},
+                                           separators=(",", ":")))
+
+    def refresh(self) -> bool:
+        """Bring the manifest up to date with the folder, saving it if anything changed
+
+        Only added and changed files are read. Returns whether anything changed.
+        """
+        files: Dict[str, Dict[str, os.stat_result]] = {}
+        try:
+            with os.scandir(self.levels_dir) as scan:
+                for dir_entry in scan:
+                    stem, ext = os.path.splitext(dir_entry.name)
+                    if ext in LEVEL_EXTENSIONS and dir_entry.is_file():
+                        files.setdefault(stem, {})[ext] = dir_entry.stat()
+        except FileNotFoundError:
+            pass
+
+        changed = False
+        for level_name in list(self._entries):
+            if level_name not in files:
+                del self._entries[level_name]
+                changed = True
+
+        for level_name, stats in files.items():
+            ext = '.json' if '.json' in stats else COMPILED_EXTENSION
+            stat = stats[ext]
+            entry = self._entries.get(level_name)
+            if (entry is not None and entry.file == level_name + ext
+                    and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size):
+                continue
+            self._index(level_name, os.path.join(self.levels_dir, level_name + ext), stat)
+            changed = True
+
+        if changed:
+            self._try_save()
+        return changed
+
+    def update(self, level_name: str) -> Optional[ManifestEntry]:
+        """Re-index one level after it was written or removed, and save the manifest"""
+        entry = None
+        for ext in LEVEL_EXTENSIONS:
+            filepath = os.path.join(self.levels_dir, level_name + ext)
+            try:
+                entry = self._index(level_name, filepath, os.stat(filepath))
+                break
+            except FileNotFoundError:
+                continue
+        if entry is None:
+            self._entries.pop(level_name, None)
+        self._try_save()
+        return entry
+
+    def _index(self, level_name: str, filepath: str, stat: os.stat_result) -> ManifestEntry:
+        entry = self._entries[level_name] = index_level_file(level_name, filepath, stat)
+        self.indexed += 1
+        return entry
+
+    def _try_save(self):
+        # A read-only folder still gets an up to date manifest in memory
+        try:
+            self.save()
+        except OSError:
+            pass
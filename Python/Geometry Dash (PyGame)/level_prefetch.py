@@ -0,0 +1,156 @@
+"""
+Background preparation of the levels the player is likely to start next
+
+Starting a level means parsing it (once, then LevelManager caches it),
+building its collision and view indexes (once per level) and creating a
+fresh game state. For large levels that takes long enough to show as a
+hitch when done between two frames. A LevelPrefetcher does the work on a
+background thread while the player looks at a menu: main.py tells it which
+levels may come next with prefetch(), and take() hands over a state that
+is ready to run, or builds one on the spot if it isn't.
+
+States are made by a function the caller provides, so this module does not
+import pygame. The LevelManager must only be used through the prefetcher
+while it runs.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Ready states kept for levels that are no longer wanted, oldest dropped first
+MAX_READY = 4
+
+
+class LevelPrefetcher:
+    """Builds game states for upcoming levels on a background thread"""
+
+    def __init__(self, level_manager, make_state: Callable, max_ready: int = MAX_READY):
+        """make_state(level_name, level) returns a new state for a LevelData;
+        it runs on the background thread for prefetched levels"""
+        self.level_manager = level_manager
+        self.make_state = make_state
+        self.max_ready = max_ready
+
+        self._manager_lock = threading.Lock()  # LevelManager is not thread safe
+        self._condition = threading.Condition()  # Guards everything below
+        self._wanted: List[str] = []
+        self._ready: "OrderedDict[str, object]" = OrderedDict()
+        self._building: Optional[str] = None
+        self._stopped = False
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="level-prefetch", daemon=True)
+        self._thread.start()
+
+    def prefetch(self, level_names: Iterable[str]):
+        """Prepare states for these levels, most likely first; replaces the previous list"""
+        with self._condition:
+            self._wanted = list(dict.fromkeys(level_names))
+            self._condition.notify_all()
+
+    def take(self, level_name: str):
+        """A fresh state for a level: the prefetched one if it's ready and
+        still matches the level file, otherwise one built now"""
+        with self._condition:
+            # Don't build the same level twice at once
+            while self._building == level_name:
+                self._condition.wait()
+            state = self._ready.pop(level_name, None)
+            # The state is used up; don't build another until asked again
+            if level_name in self._wanted:
+                self._wanted.remove(level_name)
+
+        with self._manager_lock:
+            level = self.level_manager.get_level(level_name)
+        if state is not None and state.level is level:
+            self.hits += 1
+            return state
+
+        if state is None:
+            self.misses += 1
+        else:
+            self.stale += 1  # The file changed since it was prefetched
+        return self.make_state(level_name, level)
+
+    def reload(self, level_name: str):
+        """Re-read a level whose file changed and drop its prepared state;
+        it is built again if it is still wanted. Returns the new LevelData,
+        or None if the level wasn't loaded or was removed"""
+        with self._manager_lock:
+            level = self.level_manager.reload_level(level_name)
+        with self._condition:
+            self._ready.pop(level_name, None)
+            self._condition.notify_all()
+        return level
+
+    def list_levels(self) -> List[str]:
+        """The level manager's catalog"""
+        with self._manager_lock:
+            return self.level_manager.list_levels()
+
+    def is_ready(self, level_name: str) -> bool:
+        with self._condition:
+            return level_name in self._ready
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every wanted level is ready or failed, returning whether they are"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._next_wanted() is None and self._building is None,
+                                            timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for diagnostics"""
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale, "errors": self.errors,
+                "ready": len(self._ready)}
+
+    def close(self):
+        """Stop the background thread"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _next_wanted(self) -> Optional[str]:
+        for level_name in self._wanted:
+            if level_name not in self._ready:
+                return level_name
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._stopped or self._next_wanted() is not None)
+                if self._stopped:
+                    return
+                level_name = self._building = self._next_wanted()
+
+            state = None
+            try:
+                with self._manager_lock:
+                    level = self.level_manager.get_level(level_name)
+                state = self.make_state(level_name, level)
+            except Exception as e:
+                self.errors += 1
+                print(f"Could not prefetch level {level_name}: {e}")
+
+            with self._condition:
+                self._building = None
+                if state is None:
+                    # Leave it to take() to report the error again
+                    if level_name in self._wanted:
+                        self._wanted.remove(level_name)
+                else:
+                    self._ready[level_name] = state
+                    self._ready.move_to_end(level_name)
+                    self._trim()
+                self._condition.notify_all()
+
+    def _trim(self):
+        """Drop the oldest ready states of levels that are no longer wanted"""
+        unwanted = [name for name in self._ready if name not in self._wanted]
+        for level_name in unwanted[:max(0, len(self._ready) - self.max_ready)]:
+            del self._ready[level_name]
@@ -0,0 +1,212 @@
+"""
+Load-time simplification of level geometry
+
+Levels built in the editor often make a long platform out of many small
+pieces laid side by side. Each piece is a separate object to index,
+collide with and draw. merge_static_platforms() replaces each row of
+touching or overlapping pieces with one platform covering them.
+
+The merged level plays exactly like the original. A row is only merged
+when that is certain:
+
+- Pieces must be static and share y, height, type and color, so the
+  merged platform lands and bounces the player the same way. Pieces
+  stacked vertically are never merged, because landing snaps the player
+  to the top of the piece it hits.
+- Coordinates must be whole numbers, so truncating them to integers, as
+  collisions do, gives the same edges.
+- Platforms are resolved in level order and the first one landed on
+  wins. A merged row takes the place of its first piece, so a row is cut
+  where a platform listed between its pieces could touch the player at
+  the same time as the row and land it somewhere else. Platforms with
+  the same y, height and type land the player the same way, so their
+  order never matters.
+
+The only visible difference is that the outlines between pieces are gone.
+Obstacles are left as they are.
+
+Usage:
+    python level_simplify.py                 # report for every level in Levels/
+    python level_simplify.py level1 custom1
+"""
+import argparse
+import os
+import sys
+from bisect import bisect_right, insort
+from dataclasses import replace
+from typing import Dict, List, Sequence
+
+from level_data import MOVING_PLATFORM_TYPES, LevelData, Platform, level_file_path, load_level_file
+from level_manifest import LevelManifest
+from simulation import PLAYER_RADIUS
+from x_index import XIndex
+
+# Platforms whose gap to a row is at least this in x or y can't both touch the player
+REACH = PLAYER_RADIUS * 2
+
+
+def _rows(platforms: Sequence[Platform]) -> List[List[int]]:
+    """Indices of mergeable pieces, grouped into rows of two or more, each sorted by x"""
+    groups: Dict[tuple, List[int]] = {}
+    for i, p in enumerate(platforms):
+        if (p.platform_type in MOVING_PLATFORM_TYPES or p.width <= 0 or p.height <= 0
+                or not (float(p.x).is_integer() and float(p.y).is_integer()
+                        and float(p.width).is_integer() and float(p.height).is_integer())):
+            continue
+        groups.setdefault((p.y, p.height, p.platform_type, tuple(p.color)), []).append(i)
+
+    rows = []
+    for members in groups.values():
+        members.sort(key=lambda i: platforms[i].x)
+        row = [members[0]]
+        right = platforms[members[0]].x + platforms[members[0]].width
+        for i in members[1:]:
+            p = platforms[i]
+            if p.x <= right:
+                row.append(i)
+                right = max(right, p.x + p.width)
+            else:
+                if len(row) > 1:
+                    rows.append(row)
+                row = [i]
+                right = p.x + p.width
+        if len(row) > 1:
+            rows.append(row)
+    return rows
+
+
+def _neighbours(platforms: Sequence[Platform], i: int, static_index: XIndex, moving: List[int]) -> List[int]:
+    """Platforms that can touch the player together with platform i and land it differently"""
+    p = platforms[i]
+    left, top, right, bottom = p.x, p.y, p.x + p.width, p.y + p.height
+    lands_same = (p.y, p.height, p.platform_type)
+    found = []
+    for j in static_index.query(left - REACH, right + REACH):
+        q = platforms[j]
+        if (q.x < right + REACH and q.x + q.width > left - REACH
+                and q.y < bottom + REACH and q.y + q.height > top - REACH
+                and (q.y, q.height, q.platform_type) != lands_same):
+            found.append(j)
+    # Moving platforms can be anywhere along their row
+    for j in moving:
+        q = platforms[j]
+        if q.y < bottom + REACH and q.y + q.height > top - REACH:
+            found.append(j)
+    return found
+
+
+def _runs(platforms: Sequence[Platform], row: List[int], static_index: XIndex,
+          moving: List[int]) -> List[List[int]]:
+    """Split a row, in x order, into runs that can be merged without changing
+    which platform the player lands on first
+
+    A run is cut before a piece if some platform that lands the player
+    differently is in reach of the run and listed between its first and
+    last piece.
+    """
+    runs = []
+    run: List[int] = []
+    blockers: List[int] = []  # Sorted indices of the run's neighbours
+    first = last = 0
+    for i in row:
+        near = _neighbours(platforms, i, static_index, moving)
+        if run:
+            low, high = min(first, i), max(last, i)
+            k = bisect_right(blockers, low)
+            if (k < len(blockers) and blockers[k] < high) or any(low < j < high for j in near):
+                runs.append(run)
+                run = []
+        if not run:
+            run, blockers, first, last = [i], sorted(near), i, i
+            continue
+        run.append(i)
+        first, last = min(first, i), max(last, i)
+        for j in near:
+            insort(blockers, j)
+    runs.append(run)
+    return runs
+
+
+def merge_static_platforms(platforms: Sequence[Platform]) -> List[Platform]:
+    """Platforms with rows of touching static pieces merged; unchanged pieces are kept as is"""
+    rows = _rows(platforms)
+    if not rows:
+        return list(platforms)
+
+    static_index = None
+    moving = []
+    merged: Dict[int, Platform] = {}  # first piece's index -> merged platform
+    absorbed = set()
+    for row in rows:
+        if max(row) - min(row) + 1 == len(row):
+            # Pieces listed one after another: nothing is listed between them
+            runs = [row]
+        else:
+            if static_index is None:
+                static_index = XIndex()
+                static = []
+                for i, p in enumerate(platforms):
+                    if p.platform_type in MOVING_PLATFORM_TYPES:
+                        moving.append(i)
+                    else:
+                        static.append((i, p.x, p.width))
+                static_index.extend(static)
+            runs = _runs(platforms, row, static_index, moving)
+        for run in runs:
+            if len(run) < 2:
+                continue
+            left = platforms[run[0]].x
+            right = max(platforms[i].x + platforms[i].width for i in run)
+            merged[min(run)] = replace(platforms[min(run)], x=left, width=right - left)
+            absorbed.update(run)
+
+    result = []
+    for i, p in enumerate(platforms):
+        if i in merged:
+            result.append(merged[i])
+        elif i not in absorbed:
+            result.append(p)
+    return result
+
+
+def simplify_level(level: LevelData) -> LevelData:
+    """The level with its static platforms merged, or the level itself if nothing merges
+
+    Compiled levels are returned unchanged: their records are read from
+    the file on demand, and merging would decode every one of them.
+    """
+    if hasattr(level.platforms, 'rect'):
+        return level
+    platforms = merge_static_platforms(level.platforms)
+    if len(platforms) == len(level.platforms):
+        return level
+    return replace(level, platforms=platforms)
+
+
+def main(argv: List[str]) -> int:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Report how many platforms merging removes")
+    parser.add_argument("levels", nargs="*", help="level names (default: all)")
+    parser.add_argument("--levels-dir", default=os.path.join(script_dir, "Levels"), help="levels folder")
+    args = parser.parse_args(argv)
+
+    level_names = args.levels
+    if not level_names:
+        manifest = LevelManifest(args.levels_dir)
+        manifest.refresh()
+        level_names = manifest.names()
+
+    total_before = total_after = 0
+    for level_name in level_names:
+        level = load_level_file(level_file_path(args.levels_dir, level_name))
+        before, after = len(level.platforms), len(simplify_level(level).platforms)
+        total_before += before
+        total_after += after
+        print(f"{level_name}: {before} platforms -> {after} ({before - after} merged)")
+
+    print(f"\n{total_before} platforms -> {total_after} in {len(level_names)} levels")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,182 @@
+"""
+Watches a levels folder for level files that change on disk
+
+A LevelWatcher runs a background thread that notices when .json or .gdl
+files are written, replaced or removed. The game asks it for the names of
+the levels that changed with changed() once per frame and reloads them.
+The thread does not read the levels itself.
+
+On Linux the thread uses inotify through libc, so it sleeps in select()
+until the kernel reports a change and costs nothing while idle. Elsewhere,
+or if inotify can't be set up, it falls back to scanning the folder every
+poll_interval seconds. Bursts of events, such as an editor writing a
+temporary file and renaming it over the level, are reported once.
+
+This module does not import pygame.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from level_data import COMPILED_EXTENSION
+
+LEVEL_EXTENSIONS = ('.json', COMPILED_EXTENSION)
+
+POLL_INTERVAL = 1.0  # seconds between folder scans without inotify
+DEBOUNCE = 0.05  # seconds of quiet before a burst of events is reported
+
+# From <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_DELETE = 0x200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+def level_name_of(filename: str) -> Optional[str]:
+    """The level a file in the folder belongs to, or None for other files"""
+    stem, ext = os.path.splitext(filename)
+    return stem if ext in LEVEL_EXTENSIONS else None
+
+
+def _open_inotify(directory: str) -> int:
+    """An inotify descriptor watching directory; raises OSError where unsupported"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError) as e:
+        raise OSError(f"inotify is not available: {e}")
+
+    fd = init(_IN_NONBLOCK | _IN_CLOEXEC)
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+    if add_watch(fd, os.fsencode(directory), _WATCH_MASK) < 0:
+        errno = ctypes.get_errno()
+        os.close(fd)
+        raise OSError(errno, f"inotify_add_watch failed for {directory}")
+    return fd
+
+
+def _read_inotify(fd: int) -> Set[str]:
+    """Level names in the events waiting on an inotify descriptor"""
+    names = set()
+    while True:
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            filename = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            level_name = level_name_of(filename)
+            if level_name is not None:
+                names.add(level_name)
+
+
+def _scan(directory: str) -> Dict[str, Tuple[int, int]]:
+    """mtime and size of every level file in a folder"""
+    files = {}
+    try:
+        with os.scandir(directory) as scan:
+            for entry in scan:
+                if level_name_of(entry.name) is not None:
+                    stat = entry.stat()
+                    files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        pass
+    return files
+
+
+class LevelWatcher:
+    """Reports which levels in a folder changed on disk"""
+
+    def __init__(self, levels_dir: str, poll_interval: float = POLL_INTERVAL, use_inotify: bool = True,
+                 on_change: Callable[[List[str]], None] = None):
+        """on_change, if given, is called on the watcher thread with each batch
+        of names before changed() reports them"""
+        self.levels_dir = levels_dir
+        self.poll_interval = poll_interval
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._has_changes = threading.Event()
+        self._stopped = threading.Event()
+
+        self._inotify_fd = None
+        if use_inotify:
+            try:
+                self._inotify_fd = _open_inotify(levels_dir)
+            except OSError:
+                pass
+        self.backend = "inotify" if self._inotify_fd is not None else "polling"
+        # Wakes the inotify thread's select() when closing
+        self._wake_read, self._wake_write = os.pipe() if self._inotify_fd is not None else (None, None)
+        self._snapshot = _scan(levels_dir) if self._inotify_fd is None else None
+
+        target = self._run_inotify if self._inotify_fd is not None else self._run_polling
+        self._thread = threading.Thread(target=target, name="level-watcher", daemon=True)
+        self._thread.start()
+
+    def changed(self) -> List[str]:
+        """Names of levels changed since the last call; never blocks"""
+        if not self._has_changes.is_set():
+            return []
+        with self._lock:
+            names = sorted(self._pending)
+            self._pending.clear()
+            self._has_changes.clear()
+        return names
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until a change is reported, returning whether one was"""
+        return self._has_changes.wait(timeout)
+
+    def close(self):
+        """Stop watching"""
+        self._stopped.set()
+        if self._wake_write is not None:
+            os.write(self._wake_write, b"x")
+        self._thread.join()
+        for fd in (self._inotify_fd, self._wake_read, self._wake_write):
+            if fd is not None:
+                os.close(fd)
+        self._inotify_fd = self._wake_read = self._wake_write = None
+
+    def _publish(self, names: Set[str]):
+        if not names:
+            return
+        if self.on_change is not None:
+            self.on_change(sorted(names))
+        with self._lock:
+            self._pending |= names
+            self._has_changes.set()
+
+    def _run_inotify(self):
+        fd = self._inotify_fd
+        while not self._stopped.is_set():
+            ready, _, _ = select.select([fd, self._wake_read], [], [])
+            if self._wake_read in ready:
+                return
+            names = _read_inotify(fd)
+            # Collect the rest of the burst
+            while select.select([fd], [], [], DEBOUNCE)[0]:
+                names |= _read_inotify(fd)
+            self._publish(names)
+
+    def _run_polling(self):
+        while not self._stopped.wait(self.poll_interval):
+            snapshot = _scan(self.levels_dir)
+            changed = {filename for filename in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(filename) != self._snapshot.get(filename)}
+            self._snapshot = snapshot
+            self._publish({level_name_of(filename) for filename in changed})
@@ -1,20 +1,50 @@
 """
 Geometry Dash Clone with Level Loading System
 """
+import argparse
 import pygame
 import os
-from level_manager import LevelManager, GameState
+from level_manager import LevelManager, GameState, FixedTimestep
+from level_prefetch import LevelPrefetcher
+from level_watcher import LevelWatcher
+from profiler import FrameProfiler
+from replay import InputLog, prune_replays, replay_filename
+from simulation import SCREEN_WIDTH, SCREEN_HEIGHT
+from renderer import LevelRenderer
+from text_cache import TextLabel, render_text, text_cache
 
+parser = argparse.ArgumentParser(description="Geometry Dash clone")
+parser.add_argument("--profile", action="store_true", help="show the frame profiler overlay (toggle with F3)")
+parser.add_argument("--metrics", metavar="FILE", help="write per-frame timings to FILE as JSON lines")
+parser.add_argument("--restart-on-change", action="store_true",
+                    help="restart the level being played when its file changes on disk")
+args = parser.parse_args()
 
 # pygame setup
 pygame.init()
-screen_width = 1280
-screen_height = 720
+screen_width = SCREEN_WIDTH
+screen_height = SCREEN_HEIGHT
+FPS = 60
+PHYSICS_TICK_RATE = 120  # physics steps per second, independent of FPS
 screen = pygame.display.set_mode((screen_width, screen_height))
 pygame.display.set_caption("what do i call this? GD from wish.com?")
 clock = pygame.time.Clock()
 font = pygame.font.Font(None, 36)
 large_font = pygame.font.Font(None, 72)
+time_label = TextLabel(font, (255, 255, 100))
+timestep = FixedTimestep(PHYSICS_TICK_RATE)
+
+# Frame profiler; the overlay is refreshed every PROFILER_REFRESH_FRAMES
+profiler = FrameProfiler(metrics_path=args.metrics)
+show_profiler = args.profile
+profiler_font = pygame.font.SysFont("monospace", 16)
+profiler_overlay = None
+PROFILER_REFRESH_FRAMES = 30
+
+# Finished runs are saved here and can be verified with replay.py; only the
+# newest runs of each level are kept
+REPLAYS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Replays")
+REPLAYS_PER_LEVEL = 10
 
 # Initialize level manager
 level_manager = LevelManager()
@@ -32,94 +62,67 @@ STATE_MENU = 0
 STATE_PLAYING = 1
 STATE_GAME_OVER = 2
 STATE_LEVEL_COMPLETE = 3
+STATE_NAMES = {STATE_MENU: "menu", STATE_PLAYING: "playing",
+               STATE_GAME_OVER: "game_over", STATE_LEVEL_COMPLETE: "level_complete"}
 
 # Initialize game
 current_state = STATE_MENU
 current_level_index = 0
 game_state = None
+renderer = None
 
 
 def draw_menu():
     """Draw level selection menu"""
     screen.fill((20, 20, 30))
     
-    title = large_font.render("what do i call this? GD from wish.com?", True, (255, 255, 255))
+    title = render_text(large_font, "what do i call this? GD from wish.com?", (255, 255, 255))
     screen.blit(title, (screen_width // 2 - title.get_width() // 2, 50))
     
-    subtitle = font.render("Select a Level (1-9 or mouse click)", True, (200, 200, 200))
+    subtitle = render_text(font, "Select a Level (1-9 or mouse click)", (200, 200, 200))
     screen.blit(subtitle, (screen_width // 2 - subtitle.get_width() // 2, 150))
     
     y_offset = 250
     for i, level_name in enumerate(available_levels):
         color = (100, 255, 100) if i == current_level_index else (150, 150, 150)
-        text = font.render(f"{i + 1}. {level_name}", True, color)
+        text = render_text(font, f"{i + 1}. {level_name}", color)
         screen.blit(text, (200, y_offset + i * 50))
     
-    instruction = font.render("Press ENTER to start or ESC to quit", True, (100, 200, 255))
+    instruction = render_text(font, "Press ENTER to start or ESC to quit", (100, 200, 255))
     screen.blit(instruction, (screen_width // 2 - instruction.get_width() // 2, screen_height - 100))
 
 
 def draw_game():
-    """Draw the game"""
-    screen.fill(game_state.level.background_color)
-    
-    # Draw platforms
-    for platform in game_state.level.platforms:
-        pygame.draw.rect(screen, platform.color, 
-                        (platform.x, platform.y, platform.width, platform.height))
-        # Draw platform outline
-        pygame.draw.rect(screen, (255, 255, 255), 
-                        (platform.x, platform.y, platform.width, platform.height), 2)
-    
-    # Draw obstacles
-    for obstacle in game_state.level.obstacles:
-        pygame.draw.rect(screen, obstacle.color, 
-                        (obstacle.x, obstacle.y, obstacle.width, obstacle.height))
-        # Draw obstacle outline
-        pygame.draw.rect(screen, (255, 200, 100), 
-                        (obstacle.x, obstacle.y, obstacle.width, obstacle.height), 2)
-    
-    # Draw end point (goal)
-    end_x, end_y = game_state.level.end_point
-    pygame.draw.circle(screen, (0, 255, 0), (int(end_x), int(end_y)), 30)
-    pygame.draw.circle(screen, (255, 255, 0), (int(end_x), int(end_y)), 30, 3)
-    
-    # Draw player
-    pygame.draw.circle(screen, (255, 50, 50), 
-                      (int(game_state.player_pos.x), int(game_state.player_pos.y)), 
-                      game_state.player_radius)
-    pygame.draw.circle(screen, (255, 200, 100), 
-                      (int(game_state.player_pos.x), int(game_state.player_pos.y)), 
-                      game_state.player_radius, 3)
+    """Draw the game over the cached static layer"""
+    renderer.begin_frame()
+    renderer.draw_world()
     
     # Draw UI
-    level_text = font.render(f"Level: {game_state.level.name}", True, (255, 255, 255))
-    screen.blit(level_text, (10, 10))
+    level_text = render_text(font, f"Level: {game_state.level.name}", (255, 255, 255))
+    renderer.blit(level_text, (10, 10))
     
+    # Re-rendered only when the displayed tenth of a second changes
     if game_state.level.time_limit > 0:
-        time_text = font.render(f"Time: {game_state.elapsed_time:.1f}s / {game_state.level.time_limit}s", 
-                               True, (255, 255, 100))
+        time_text = time_label.render(f"Time: {game_state.elapsed_time:.1f}s / {game_state.level.time_limit}s")
     else:
-        time_text = font.render(f"Time: {game_state.elapsed_time:.1f}s", 
-                               True, (255, 255, 100))
-    screen.blit(time_text, (10, 50))
+        time_text = time_label.render(f"Time: {game_state.elapsed_time:.1f}s")
+    renderer.blit(time_text, (10, 50))
     
-    difficulty_text = font.render(f"Difficulty: {game_state.level.difficulty}/10", 
-                                 True, (255, 100, 100))
-    screen.blit(difficulty_text, (10, 90))
+    difficulty_text = render_text(font, f"Difficulty: {game_state.level.difficulty}/10", (255, 100, 100))
+    renderer.blit(difficulty_text, (10, 90))
 
 
 def draw_game_over():
     """Draw game over screen"""
     screen.fill((50, 10, 10))
     
-    game_over_text = large_font.render("GAME OVER!", True, (255, 0, 0))
+    game_over_text = render_text(large_font, "GAME OVER!", (255, 0, 0))
     screen.blit(game_over_text, (screen_width // 2 - game_over_text.get_width() // 2, 200))
     
-    time_text = font.render(f"Time survived: {game_state.elapsed_time:.1f}s", True, (255, 255, 255))
+    time_text = render_text(font, f"Time survived: {game_state.elapsed_time:.1f}s", (255, 255, 255))
     screen.blit(time_text, (screen_width // 2 - time_text.get_width() // 2, 350))
     
-    instruction = font.render("Press R to retry or M for menu", True, (100, 200, 255))
+    instruction = render_text(font, "Press R to retry or M for menu", (100, 200, 255))
     screen.blit(instruction, (screen_width // 2 - instruction.get_width() // 2, 450))
 
 
@@ -127,36 +130,154 @@ def draw_level_complete():
     """Draw level complete screen"""
     screen.fill((10, 50, 10))
     
-    complete_text = large_font.render("LEVEL COMPLETE!", True, (0, 255, 0))
+    complete_text = render_text(large_font, "LEVEL COMPLETE!", (0, 255, 0))
     screen.blit(complete_text, (screen_width // 2 - complete_text.get_width() // 2, 200))
     
-    time_text = font.render(f"Time: {game_state.elapsed_time:.1f}s", True, (255, 255, 255))
+    time_text = render_text(font, f"Time: {game_state.elapsed_time:.1f}s", (255, 255, 255))
     screen.blit(time_text, (screen_width // 2 - time_text.get_width() // 2, 350))
     
     if current_level_index < len(available_levels) - 1:
-        instruction = font.render("Press SPACE for next level or M for menu", True, (100, 200, 255))
+        instruction = render_text(font, "Press SPACE for next level or M for menu", (100, 200, 255))
     else:
-        instruction = font.render("Press M for menu (All levels completed!)", True, (100, 200, 255))
+        instruction = render_text(font, "Press M for menu (All levels completed!)", (100, 200, 255))
     screen.blit(instruction, (screen_width // 2 - instruction.get_width() // 2, 450))
 
 
+def draw_profiler_overlay():
+    """Draw phase timings of recent frames in the top right corner"""
+    global profiler_overlay
+    if profiler_overlay is None or profiler.frame_count % PROFILER_REFRESH_FRAMES == 0:
+        stats = text_cache.stats()
+        lines = profiler.report_lines()
+        lines.append(f"text cache {stats['hit_rate']:.0%} of {stats['hits'] + stats['misses']}")
+        line_height = profiler_font.get_linesize()
+        width = max(profiler_font.size(line)[0] for line in lines) + 16
+        profiler_overlay = pygame.Surface((width, line_height * len(lines) + 12))
+        profiler_overlay.fill((0, 0, 0))
+        profiler_overlay.set_alpha(200)
+        for i, line in enumerate(lines):
+            profiler_overlay.blit(profiler_font.render(line, True, (220, 220, 220)), (8, 6 + i * line_height))
+
+    position = (screen_width - profiler_overlay.get_width() - 10, 10)
+    if current_state == STATE_PLAYING:
+        renderer.blit(profiler_overlay, position)
+    else:
+        screen.blit(profiler_overlay, position)
+
+
+def build_state(level_name, level):
+    """A game state for a level, with everything its first frame needs built"""
+    state = GameState(level, screen_width, screen_height, PHYSICS_TICK_RATE)
+    # Built once per level; the renderer looks up static objects in view with them
+    level.static_platform_x_index
+    level.static_obstacle_x_index
+    return state
+
+
+# Levels that can be started from the menu and result screens are prepared
+# in the background; level_manager is only used through it from here on
+prefetcher = LevelPrefetcher(level_manager, build_state)
+prefetched_levels = None
+# Levels whose latest file change could not be loaded; they keep their old version
+failed_reloads = set()
+
+
+def reload_levels(level_names):
+    """Re-read levels whose files changed; runs on the watcher's thread"""
+    for level_name in level_names:
+        try:
+            prefetcher.reload(level_name)
+            failed_reloads.discard(level_name)
+            print(f"Reloaded level: {level_name}")
+        except Exception as e:
+            failed_reloads.add(level_name)
+            print(f"Could not reload level {level_name}: {e}")
+
+
+# Levels edited while the game runs are picked up without restarting it
+watcher = LevelWatcher(level_manager.levels_dir, on_change=reload_levels)
+
+
+def upcoming_levels():
+    """Levels the player can start from the current screen"""
+    if current_state == STATE_MENU:
+        return available_levels[current_level_index:current_level_index + 2]
+    if current_state == STATE_LEVEL_COMPLETE:
+        return available_levels[current_level_index + 1:current_level_index + 2]
+    if current_state == STATE_GAME_OVER:
+        return [available_levels[current_level_index]]
+    # Nothing is built while playing so the game has the CPU to itself
+    return []
+
+
+def apply_level_changes(level_names):
+    """Update the level list after files changed, restarting the current run if asked to"""
+    global available_levels, current_level_index, game_state
+    current_name = available_levels[current_level_index]
+    available_levels = prefetcher.list_levels() or available_levels
+    if current_name in available_levels:
+        current_level_index = available_levels.index(current_name)
+    else:
+        current_level_index = min(current_level_index, len(available_levels) - 1)
+    
+    if (args.restart_on_change and current_state == STATE_PLAYING
+            and current_name in level_names and current_name in available_levels):
+        if current_name in failed_reloads:
+            # Restarting would only replay the old version of the level
+            print(f"Level {current_name} failed to reload, continuing the current run")
+        else:
+            game_state = start_level(current_name)
+            print(f"Restarted level: {current_name}")
+
+
+def start_level(level_name):
+    """Create a fresh game state for a level, recording its inputs"""
+    global renderer
+    state = prefetcher.take(level_name)
+    state.input_log = InputLog(level_name, PHYSICS_TICK_RATE, screen_width, screen_height,
+                               level_hash=state.level.source_hash)
+    state.profiler = profiler
+    renderer = LevelRenderer(screen, state)
+    timestep.reset()
+    return state
+
+
+def save_replay(state):
+    """Save the inputs of a finished run"""
+    log = state.input_log
+    log.finish(state)
+    try:
+        os.makedirs(REPLAYS_DIR, exist_ok=True)
+        log.save(os.path.join(REPLAYS_DIR, replay_filename(log.level_name)))
+        prune_replays(REPLAYS_DIR, log.level_name, REPLAYS_PER_LEVEL)
+    except OSError as e:
+        print(f"Could not save replay: {e}")
+
+
 # Main game loop
 running = True
 while running:
-    dt = clock.tick(60) / 1000
+    dt = clock.tick(FPS) / 1000
+    profiler.begin_frame()
     
     # Handle events
-    for event in pygame.event.get():
+    with profiler.phase("events"):
+        events = pygame.event.get()
+    for event in events:
         if event.type == pygame.QUIT:
             running = False
         
         if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_F3:
+                show_profiler = not show_profiler
+                if current_state == STATE_PLAYING and not show_profiler:
+                    renderer.invalidate()  # Repaint where the overlay was
+            
             if current_state == STATE_MENU:
                 if event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
                     # Start level
                     level_name = available_levels[current_level_index]
-                    level = level_manager.get_level(level_name)
-                    game_state = GameState(level, screen_width, screen_height)
+                    game_state = start_level(level_name)
                     current_state = STATE_PLAYING
                     print(f"Starting level: {level_name}")
                 
@@ -170,23 +291,19 @@ while running:
                         current_level_index = level_num
             
             elif current_state == STATE_PLAYING:
-                if event.key == pygame.K_SPACE or event.key == pygame.K_w or event.key == pygame.K_UP:
-                    game_state.jump()
-                
-                elif event.key == pygame.K_m:
+                if event.key == pygame.K_m:
                     current_state = STATE_MENU
                 
                 elif event.key == pygame.K_ESCAPE:
                     current_state = STATE_MENU
                 
-                # Handle movement keys
+                # Handle jump and movement keys
                 game_state.handle_key_down(event.key)
             
             elif current_state == STATE_GAME_OVER:
                 if event.key == pygame.K_r:
                     # Retry current level
-                    level = level_manager.get_level(available_levels[current_level_index])
-                    game_state = GameState(level, screen_width, screen_height)
+                    game_state = start_level(available_levels[current_level_index])
                     current_state = STATE_PLAYING
                 
                 elif event.key == pygame.K_m:
@@ -196,8 +313,7 @@ while running:
                 if event.key == pygame.K_SPACE:
                     if current_level_index < len(available_levels) - 1:
                         current_level_index += 1
-                        level = level_manager.get_level(available_levels[current_level_index])
-                        game_state = GameState(level, screen_width, screen_height)
+                        game_state = start_level(available_levels[current_level_index])
                         current_state = STATE_PLAYING
                     else:
                         current_state = STATE_MENU
@@ -209,26 +325,56 @@ while running:
             if current_state == STATE_PLAYING:
                 game_state.handle_key_up(event.key)
     
-    # Update game state
+    # Update game state in fixed steps so runs don't depend on frame timing
+    steps = 0
     if current_state == STATE_PLAYING:
-        game_state.update(dt)
+        with profiler.phase("physics"):
+            for _ in range(timestep.steps(dt)):
+                game_state.step()
+                steps += 1
+                if game_state.game_over or game_state.level_complete:
+                    break
         
         if game_state.game_over:
             current_state = STATE_GAME_OVER
+            save_replay(game_state)
         elif game_state.level_complete:
             current_state = STATE_LEVEL_COMPLETE
+            save_replay(game_state)
+    
+    changed_levels = watcher.changed()
+    if changed_levels:
+        apply_level_changes(changed_levels)
+    
+    upcoming = upcoming_levels()
+    if upcoming != prefetched_levels:
+        prefetcher.prefetch(upcoming)
+        prefetched_levels = upcoming
     
     # Draw
-    if current_state == STATE_MENU:
-        draw_menu()
-    elif current_state == STATE_PLAYING:
-        draw_game()
-    elif current_state == STATE_GAME_OVER:
-        draw_game_over()
-    elif current_state == STATE_LEVEL_COMPLETE:
-        draw_level_complete()
+    with profiler.phase("draw"):
+        if current_state == STATE_MENU:
+            draw_menu()
+        elif current_state == STATE_PLAYING:
+            draw_game()
+        elif current_state == STATE_GAME_OVER:
+            draw_game_over()
+        elif current_state == STATE_LEVEL_COMPLETE:
+            draw_level_complete()
+        
+        if show_profiler:
+            draw_profiler_overlay()
+    
+    with profiler.phase("display"):
+        if current_state == STATE_PLAYING:
+            renderer.present()  # Only the areas that changed
+        else:
+            pygame.display.flip()
     
-    pygame.display.flip()
+    profiler.end_frame(state=STATE_NAMES[current_state], steps=steps)
 
+profiler.close()
+watcher.close()
+prefetcher.close()
 pygame.quit()
 print("Thanks for playing!")
\ No newline at end of file
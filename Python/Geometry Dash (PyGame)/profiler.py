@@ -0,0 +1,114 @@
+"""
+Per-phase frame profiler
+
+Times the phases of each frame (event handling, physics, collisions, drawing,
+display update) into a ring buffer of recent frames, summarizes them as
+percentiles for an on-screen overlay, and can stream every frame as a JSON
+line for offline analysis.
+
+This module does not import pygame.
+
+Usage:
+    profiler = FrameProfiler(metrics_path="frames.jsonl")
+    profiler.begin_frame()
+    with profiler.phase("events"):
+        ...
+    profiler.end_frame()
+"""
+import json
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Frames kept for the summary; 10 seconds at 60 FPS
+DEFAULT_HISTORY = 600
+
+PERCENTILES = (50, 95, 99)
+
+# Phases the game records, in the order they happen in a frame. "collisions"
+# is part of "physics"; "frame" is the whole frame.
+PHASES = ("events", "physics", "collisions", "draw", "display")
+
+
+class FrameProfiler:
+    """Collects phase timings per frame"""
+
+    def __init__(self, history: int = DEFAULT_HISTORY, metrics_path: Optional[str] = None):
+        self.frames = deque(maxlen=history)  # dicts of phase -> seconds, plus "frame"
+        self.frame_count = 0
+        self._current: Dict[str, float] = {}
+        self._frame_start = None
+        self._metrics_file = open(metrics_path, 'w') if metrics_path else None
+
+    def begin_frame(self):
+        self._current = {}
+        self._frame_start = time.perf_counter()
+
+    def add(self, phase: str, seconds: float):
+        """Add time to a phase of the current frame"""
+        self._current[phase] = self._current.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as part of a phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def end_frame(self, **fields):
+        """Close the current frame; extra fields are written to the metrics stream"""
+        if self._frame_start is None:
+            return
+        timings = self._current
+        timings["frame"] = time.perf_counter() - self._frame_start
+        self.frames.append(timings)
+        self.frame_count += 1
+        self._frame_start = None
+
+        if self._metrics_file is not None:
+            record = {"frame": self.frame_count, "time": time.time()}
+            record.update(fields)
+            record["ms"] = {phase: round(seconds * 1000, 4) for phase, seconds in timings.items()}
+            self._metrics_file.write(json.dumps(record) + "\n")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles and worst value per phase over the buffered frames, in ms"""
+        phases = set()
+        for timings in self.frames:
+            phases.update(timings)
+
+        result = {}
+        for phase in phases:
+            # Frames without the phase spent no time in it
+            values = sorted(timings.get(phase, 0.0) * 1000 for timings in self.frames)
+            stats = {f"p{q}": _percentile(values, q) for q in PERCENTILES}
+            stats["max"] = values[-1]
+            result[phase] = stats
+        return result
+
+    def report_lines(self) -> List[str]:
+        """Summary formatted as one line per phase, frame total last"""
+        summary = self.summary()
+        lines = [f"{'phase':<11}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}  ms"]
+        order = {phase: i for i, phase in enumerate(PHASES)}
+        for phase in sorted(summary, key=lambda p: (p == "frame", order.get(p, len(PHASES)), p)):
+            stats = summary[phase]
+            lines.append(f"{phase:<11}" + "".join(f"{stats[key]:>7.2f}" for key in ("p50", "p95", "p99", "max")))
+        return lines
+
+    def close(self):
+        if self._metrics_file is not None:
+            self._metrics_file.close()
+            self._metrics_file = None
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(0, rank - 1)]
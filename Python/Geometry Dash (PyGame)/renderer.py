@@ -0,0 +1,169 @@
+"""
+Level rendering with a cached static layer and dirty rectangles
+
+Static platforms, static obstacles and the goal are drawn into a background
+surface once. Each frame only the moving objects, the player and the HUD are
+drawn on top; whatever they covered last frame is restored from the
+background, and only the rectangles that changed are pushed to the display.
+Moving objects are therefore always drawn above static ones.
+
+Levels wider than the screen scroll with the game state's camera. Their
+background is a strip twice the screen width, re-drawn from the objects
+found through the level's x index whenever the view leaves it. While the
+camera moves the visible part of the strip is copied to the whole screen.
+"""
+import math
+
+import pygame
+
+PLATFORM_OUTLINE_COLOR = (255, 255, 255)
+OBSTACLE_OUTLINE_COLOR = (255, 200, 100)
+GOAL_COLOR = (0, 255, 0)
+GOAL_OUTLINE_COLOR = (255, 255, 0)
+GOAL_RADIUS = 30
+PLAYER_COLOR = (255, 50, 50)
+PLAYER_OUTLINE_COLOR = (255, 200, 100)
+
+# Background strip width for scrolling levels, in screen widths
+STRIP_SCREENS = 2
+
+# World coordinates are truncated to whole pixels before the camera offset is
+# subtracted, so an object lands on the same pixels at every camera position
+
+
+def draw_platform(surface, platform, offset_x: int = 0):
+    """Draw a platform with its outline, returning the area touched"""
+    rect = (int(platform.x) - offset_x, platform.y, platform.width, platform.height)
+    pygame.draw.rect(surface, platform.color, rect)
+    return pygame.draw.rect(surface, PLATFORM_OUTLINE_COLOR, rect, 2)
+
+
+def draw_obstacle(surface, obstacle, offset_x: int = 0):
+    """Draw an obstacle with its outline, returning the area touched"""
+    rect = (int(obstacle.x) - offset_x, obstacle.y, obstacle.width, obstacle.height)
+    pygame.draw.rect(surface, obstacle.color, rect)
+    return pygame.draw.rect(surface, OBSTACLE_OUTLINE_COLOR, rect, 2)
+
+
+def draw_goal(surface, end_point, offset_x: int = 0):
+    """Draw the end point, returning the area touched"""
+    center = (int(end_point[0]) - offset_x, int(end_point[1]))
+    pygame.draw.circle(surface, GOAL_COLOR, center, GOAL_RADIUS)
+    return pygame.draw.circle(surface, GOAL_OUTLINE_COLOR, center, GOAL_RADIUS, 3)
+
+
+def draw_player(surface, state, offset_x: int = 0):
+    """Draw the player, returning the area touched"""
+    center = (int(state.player_pos.x) - offset_x, int(state.player_pos.y))
+    pygame.draw.circle(surface, PLAYER_COLOR, center, state.player_radius)
+    return pygame.draw.circle(surface, PLAYER_OUTLINE_COLOR, center, state.player_radius, 3)
+
+
+class LevelRenderer:
+    """Draws one run of a level, updating only the parts of the screen that change
+
+    Per frame: begin_frame(), draw_world(), blit() for each HUD element, then
+    present() instead of pygame.display.flip().
+    """
+
+    def __init__(self, screen: pygame.Surface, state):
+        self.screen = screen
+        self.state = state
+        screen_width, screen_height = screen.get_size()
+        world_width = math.ceil(state.world_width)
+        self.strip_width = min(world_width, screen_width * STRIP_SCREENS)
+        self.background = pygame.Surface((self.strip_width, screen_height)).convert()
+        self.strip_x = None  # World x of the background's left edge
+        self._goal_rect = None
+        self._view_x = None
+        self._previous = []  # Areas drawn over the background last frame
+        self._current = []
+        self._full_redraw = True
+
+    def reset(self, state):
+        """Draw a new run of the same level, keeping the rendered background"""
+        self.state = state
+        self._previous = []
+        self._full_redraw = True
+
+    def invalidate(self):
+        """Repaint the whole screen next frame, e.g. after another screen was shown"""
+        self._full_redraw = True
+
+    def begin_frame(self):
+        """Erase last frame's moving parts by restoring the background under them"""
+        screen_width, screen_height = self.screen.get_size()
+        view_x = int(self.state.camera_x)
+        if self.strip_x is None or not self.strip_x <= view_x <= self.strip_x + self.strip_width - screen_width:
+            self._render_strip(view_x)
+        if view_x != self._view_x:
+            self._view_x = view_x
+            self._full_redraw = True
+
+        source_x = view_x - self.strip_x
+        if self._full_redraw:
+            self.screen.blit(self.background, (0, 0), (source_x, 0, screen_width, screen_height))
+        else:
+            for rect in self._previous:
+                self.screen.blit(self.background, rect, rect.move(source_x, 0))
+        self._current = []
+
+    def draw_world(self):
+        """Draw the moving objects in view and the player"""
+        state = self.state
+        view_x = self._view_x
+        for index in state.moving_in_view(state.platforms, state.moving_platform_x_index):
+            self._current.append(draw_platform(self.screen, state.platforms[index], view_x))
+        for index in state.moving_in_view(state.obstacles, state.moving_obstacle_x_index):
+            self._current.append(draw_obstacle(self.screen, state.obstacles[index], view_x))
+
+        # The goal is drawn above level objects, so repaint it if one passed over it
+        goal_rect = self._goal_rect.move(self.strip_x - view_x, 0)
+        if goal_rect.collidelist(self._current) != -1:
+            draw_goal(self.screen, state.level.end_point, view_x)
+
+        self._current.append(draw_player(self.screen, state, view_x))
+
+    def blit(self, surface: pygame.Surface, position):
+        """Draw a HUD element on top of the world"""
+        self._current.append(self.screen.blit(surface, position))
+
+    def present(self):
+        """Push this frame's changes to the display"""
+        full_redraw = self._full_redraw
+        changed = self.end_frame()
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(changed)
+
+    def end_frame(self):
+        """Finish the frame without touching the display, returning the areas
+        of the target surface that changed; for targets that aren't the screen"""
+        if self._full_redraw:
+            changed = [self.screen.get_rect()]
+            self._full_redraw = False
+        else:
+            changed = self._previous + self._current
+        self._previous = self._current
+        return changed
+
+    def _render_strip(self, view_x: int):
+        """Draw the background color, static geometry and goal around the view"""
+        state = self.state
+        screen_width = self.screen.get_width()
+        world_width = math.ceil(state.world_width)
+        # Center the strip on the view so it lasts in either scroll direction
+        strip_x = view_x - (self.strip_width - screen_width) // 2
+        self.strip_x = strip_x = max(0, min(strip_x, world_width - self.strip_width))
+        self._full_redraw = True
+
+        background = self.background
+        background.fill(state.level.background_color)
+        x0, x1 = strip_x, strip_x + self.strip_width
+        # Sorted back into level order so overlapping objects stack as before
+        for index in sorted(state.level.static_platform_x_index.query(x0, x1)):
+            draw_platform(background, state.platforms[index], strip_x)
+        for index in sorted(state.level.static_obstacle_x_index.query(x0, x1)):
+            draw_obstacle(background, state.obstacles[index], strip_x)
+        self._goal_rect = draw_goal(background, state.level.end_point, strip_x)
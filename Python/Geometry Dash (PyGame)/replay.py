@@ -0,0 +1,313 @@
+"""
+Input recording and deterministic replay
+
+An InputLog stores the actions of one run ('jump' presses and 'left'/'right'
+holds) with the simulation tick they happened on, plus the outcome the run
+claims. Because the simulation runs on a fixed timestep, replaying the log
+headlessly reproduces the run exactly, as fast as the CPU allows.
+
+The log also stores the sha1 of the level file the run was played on.
+Once that file has been edited, a replay can't say anything about the
+level, so verification reports the mismatch instead of a verdict.
+
+File format (little-endian):
+    header      magic, version, tick rate, screen size, outcome, end tick,
+                sha1 of the level file (zeros if unknown; not in version 1)
+    level name  u16 length + UTF-8 bytes
+    events      u32 count, then per event a varint tick delta and one byte:
+                action code in the low bits, pressed flag in the top bit
+
+Usage:
+    python replay.py RUN.gdr [RUN.gdr ...]        # verify runs
+    python replay.py --levels Levels/ Replays/    # verify a folder of runs
+"""
+import argparse
+import os
+import re
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from level_data import LevelData, level_file_path, load_level_file
+from simulation import DEFAULT_TICK_RATE, Simulation
+
+MAGIC = b'GDIR'
+VERSION = 2
+REPLAY_EXTENSION = '.gdr'
+
+# magic, version, tick rate, screen width/height, outcome, end tick
+HEADER = struct.Struct('<4sHHHHBI')
+# sha1 of the level file, after the header from version 2 on
+LEVEL_HASH = struct.Struct('<20s')
+
+ACTIONS = ('jump', 'left', 'right')
+_PRESSED_FLAG = 0x80
+
+# Outcome codes stored in the header
+OUTCOME_NONE = 0
+OUTCOME_COMPLETE = 1
+OUTCOME_GAME_OVER = 2
+
+
+@dataclass
+class InputEvent:
+    """One input action at a simulation tick"""
+    tick: int
+    action: str  # 'jump', 'left' or 'right'
+    pressed: bool
+
+
+@dataclass
+class InputLog:
+    """Recorded inputs of one run and the outcome it claims"""
+    level_name: str
+    tick_rate: int = DEFAULT_TICK_RATE
+    screen_width: int = 1280
+    screen_height: int = 720
+    events: List[InputEvent] = field(default_factory=list)
+    outcome: int = OUTCOME_NONE
+    end_tick: int = 0
+    level_hash: str = ""  # LevelData.source_hash of the level played; "" if unknown
+
+    def record(self, tick: int, action: str, pressed: bool):
+        """Add an event; events must arrive in tick order"""
+        self.events.append(InputEvent(tick, action, pressed))
+
+    def finish(self, sim: Simulation):
+        """Store the outcome of the finished run"""
+        if sim.level_complete:
+            self.outcome = OUTCOME_COMPLETE
+        elif sim.game_over:
+            self.outcome = OUTCOME_GAME_OVER
+        self.end_tick = sim.tick
+
+    def to_bytes(self) -> bytes:
+        name_bytes = self.level_name.encode('utf-8')
+        chunks = [
+            HEADER.pack(MAGIC, VERSION, self.tick_rate, self.screen_width, self.screen_height,
+                        self.outcome, self.end_tick),
+            LEVEL_HASH.pack(bytes.fromhex(self.level_hash) if self.level_hash else b''),
+            struct.pack('<H', len(name_bytes)), name_bytes,
+            struct.pack('<I', len(self.events)),
+        ]
+        last_tick = 0
+        for event in self.events:
+            chunks.append(_encode_varint(event.tick - last_tick))
+            code = ACTIONS.index(event.action)
+            chunks.append(bytes([code | (_PRESSED_FLAG if event.pressed else 0)]))
+            last_tick = event.tick
+        return b''.join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'InputLog':
+        magic, version, tick_rate, width, height, outcome, end_tick = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a replay file")
+        if version not in (1, VERSION):
+            raise ValueError(f"Unsupported replay version {version}")
+
+        offset = HEADER.size
+        level_hash = ""
+        if version >= 2:
+            (digest,) = LEVEL_HASH.unpack_from(data, offset)
+            offset += LEVEL_HASH.size
+            if any(digest):
+                level_hash = digest.hex()
+        (name_length,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        level_name = data[offset:offset + name_length].decode('utf-8')
+        offset += name_length
+        (count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+
+        log = cls(level_name, tick_rate, width, height, outcome=outcome, end_tick=end_tick,
+                  level_hash=level_hash)
+        tick = 0
+        for _ in range(count):
+            delta, offset = _decode_varint(data, offset)
+            code = data[offset]
+            offset += 1
+            tick += delta
+            log.events.append(InputEvent(tick, ACTIONS[code & ~_PRESSED_FLAG], bool(code & _PRESSED_FLAG)))
+        return log
+
+    def save(self, filepath: str):
+        temp_path = filepath + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(self.to_bytes())
+        os.replace(temp_path, filepath)
+
+    @classmethod
+    def load(cls, filepath: str) -> 'InputLog':
+        with open(filepath, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class LevelChangedError(ValueError):
+    """The level differs from the one a run was recorded on"""
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of replaying an input log"""
+    level_complete: bool
+    game_over: bool
+    ticks: int
+    elapsed_time: float
+
+    @property
+    def outcome(self) -> int:
+        if self.level_complete:
+            return OUTCOME_COMPLETE
+        if self.game_over:
+            return OUTCOME_GAME_OVER
+        return OUTCOME_NONE
+
+
+def replay(level: LevelData, log: InputLog, max_ticks: Optional[int] = None) -> ReplayResult:
+    """Re-drive a simulation from an input log, headless and unthrottled"""
+    sim = Simulation(level, log.screen_width, log.screen_height, log.tick_rate)
+    if max_ticks is None:
+        max_ticks = log.end_tick
+
+    events = log.events
+    next_event = 0
+    while sim.tick < max_ticks and not (sim.game_over or sim.level_complete):
+        # Inputs recorded at a tick were applied before that tick's step
+        while next_event < len(events) and events[next_event].tick <= sim.tick:
+            event = events[next_event]
+            if event.pressed:
+                sim.press(event.action)
+            else:
+                sim.release(event.action)
+            next_event += 1
+        sim.step()
+
+    return ReplayResult(sim.level_complete, sim.game_over, sim.tick, sim.elapsed_time)
+
+
+def check_level(level: LevelData, log: InputLog):
+    """Raise LevelChangedError if the log was recorded on a different version of the level
+
+    Logs and levels that don't know their level file's hash are trusted.
+    """
+    if log.level_hash and level.source_hash and log.level_hash != level.source_hash:
+        raise LevelChangedError(f"level '{log.level_name}' has changed since the run was recorded")
+
+
+def verify(level: LevelData, log: InputLog) -> bool:
+    """Check that a log reproduces the outcome and end tick it claims
+
+    Raises LevelChangedError instead of answering if the level was edited.
+    """
+    check_level(level, log)
+    result = replay(level, log)
+    return result.outcome == log.outcome and result.ticks == log.end_tick
+
+
+def verify_file(replay_path: str, levels_dir: str) -> tuple:
+    """Verify one replay file, returning (path, ok, message)
+
+    ok is None when the level changed since the run, so there is no verdict.
+    """
+    try:
+        log = InputLog.load(replay_path)
+        level = load_level_file(level_file_path(levels_dir, log.level_name))
+        check_level(level, log)
+        result = replay(level, log)
+        ok = result.outcome == log.outcome and result.ticks == log.end_tick
+        status = {OUTCOME_COMPLETE: "complete", OUTCOME_GAME_OVER: "game over"}.get(result.outcome, "unfinished")
+        return replay_path, ok, f"{log.level_name}: {status} at {result.elapsed_time:.2f}s ({result.ticks} ticks)"
+    except LevelChangedError as e:
+        return replay_path, None, f"not verified: {e}"
+    except Exception as e:
+        return replay_path, False, f"error: {e}"
+
+
+def replay_filename(level_name: str, when: Optional[float] = None) -> str:
+    """File name of a run of a level saved at time when (default: now)
+
+    The time is kept to the millisecond, so a quick retry that ends in the
+    same second as the last run doesn't overwrite it.
+    """
+    if when is None:
+        when = time.time()
+    stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(when))
+    return f"{level_name}_{stamp}_{int(when * 1000) % 1000:03d}{REPLAY_EXTENSION}"
+
+
+def prune_replays(directory: str, level_name: str, keep: int) -> List[str]:
+    """Delete all but the newest keep runs of a level in directory, returning the deleted paths
+
+    Only files named by replay_filename() for that level are considered,
+    including ones saved before it added milliseconds; their timestamps
+    sort oldest first.
+    """
+    pattern = re.compile(re.escape(level_name) + r'_\d{8}_\d{6}(_\d{3})?' + re.escape(REPLAY_EXTENSION))
+    runs = sorted(name for name in os.listdir(directory) if pattern.fullmatch(name))
+    deleted = [os.path.join(directory, name) for name in runs[:max(0, len(runs) - keep)]]
+    for path in deleted:
+        os.remove(path)
+    return deleted
+
+
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _decode_varint(data: bytes, offset: int):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def main(argv: List[str]) -> int:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Verify recorded runs by replaying them headlessly")
+    parser.add_argument("paths", nargs="+", help="replay files or folders of replay files")
+    parser.add_argument("--levels", default=os.path.join(script_dir, "Levels"), help="levels folder")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(REPLAY_EXTENSION))
+        else:
+            files.append(path)
+
+    failures = unverified = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for path, ok, message in pool.map(verify_file, files, [args.levels] * len(files), chunksize=16):
+            if ok is None:
+                unverified += 1
+                print(f"? {os.path.basename(path)}: {message}")
+                continue
+            failures += not ok
+            print(f"{'✓' if ok else '✗'} {os.path.basename(path)}: {message}")
+
+    print(f"\n{len(files) - failures - unverified}/{len(files)} runs verified")
+    if unverified:
+        print(f"{unverified} runs not verified because their level changed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,365 @@
+"""
+Headless simulation core: player physics, moving objects, collisions and
+win/lose rules
+
+This module does not import pygame. GameState in level_manager.py wraps it
+for the interactive game; batch tools can use Simulation directly. Rectangles
+follow pygame.Rect rules (coordinates truncated to integers, edges that only
+touch don't collide) so both give identical results.
+"""
+import copy
+import time
+from typing import List, Tuple
+
+from level_data import LevelData, LevelObjects
+from spatial_hash import SpatialHash, build_spatial_hash
+from x_index import XIndex, build_x_index
+
+IntRect = Tuple[int, int, int, int]
+
+# Physics steps per second when running on a fixed timestep
+DEFAULT_TICK_RATE = 120
+
+# Size of the game's screen; moving objects bounce and the player falls to
+# death relative to it, so levels must be played at this size to behave as in main.py
+SCREEN_WIDTH = 1280
+SCREEN_HEIGHT = 720
+
+# Most steps run for one rendered frame; after a long hitch the backlog is
+# dropped instead of trying to catch up (and falling further behind)
+MAX_STEPS_PER_FRAME = 8
+
+# Where the camera keeps the player, as a fraction of the screen width
+CAMERA_ANCHOR = 1 / 3
+# Moving objects this far outside the view keep moving, so they don't visibly
+# start up at the screen edge
+ACTIVE_MARGIN = 200
+
+# Half the size of the player's square bounding box
+PLAYER_RADIUS = 20
+
+
+class Vec2:
+    """Minimal 2D vector with the parts of pygame.Vector2 the game uses"""
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x: float = 0, y: float = 0):
+        self.x = x
+        self.y = y
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __eq__(self, other):
+        try:
+            ox, oy = other
+        except (TypeError, ValueError):
+            return NotImplemented
+        return self.x == ox and self.y == oy
+
+    def __repr__(self):
+        return f"Vec2({self.x}, {self.y})"
+
+
+def int_rect(x: float, y: float, width: float, height: float) -> IntRect:
+    """Rect with coordinates truncated to integers, like pygame.Rect"""
+    return (int(x), int(y), int(width), int(height))
+
+
+def rects_collide(a: IntRect, b: IntRect) -> bool:
+    """Overlap test matching pygame.Rect.colliderect"""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    if aw > 0 and ah > 0 and bw > 0 and bh > 0:
+        return ax < bx + bw and ay < by + bh and ax + aw > bx and ay + ah > by
+    if not (aw and ah and bw and bh):
+        return False
+    # Negative sizes extend up/left of the origin, as in pygame
+    return (min(ax, ax + aw) < max(bx, bx + bw) and min(ay, ay + ah) < max(by, by + bh)
+            and max(ax, ax + aw) > min(bx, bx + bw) and max(ay, ay + ah) > min(by, by + bh))
+
+
+def rect_centery(rect: IntRect) -> int:
+    """Vertical center of a rect, rounded like pygame.Rect.centery"""
+    return rect[1] + rect[3] // 2
+
+
+class FixedTimestep:
+    """Accumulator that turns variable frame times into fixed simulation steps"""
+
+    def __init__(self, tick_rate: int = DEFAULT_TICK_RATE, max_steps: int = MAX_STEPS_PER_FRAME):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def steps(self, frame_dt: float) -> int:
+        """Add a frame's duration and return how many steps are due"""
+        self.accumulator += frame_dt
+        # The epsilon keeps e.g. 1/60 from counting as slightly under 2/120
+        count = int((self.accumulator + 1e-9) / self.dt)
+        if count > self.max_steps:
+            self.accumulator = 0.0
+            return self.max_steps
+        self.accumulator = max(0.0, self.accumulator - count * self.dt)
+        return count
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a step left over, for interpolating rendering"""
+        return self.accumulator / self.dt
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+class Simulation:
+    """Manages game state and collision detection
+
+    Time is simulation time: elapsed_time is the sum of the dt values passed
+    to update(), so a run gives the same result however fast it is stepped.
+    """
+
+    def __init__(self, level: LevelData, screen_width: int, screen_height: int,
+                 tick_rate: int = DEFAULT_TICK_RATE):
+        self.level = level
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+
+        # Fixed step used by step(); update() also accepts any dt
+        self.tick_rate = tick_rate
+        self.tick_dt = 1.0 / tick_rate
+        self.tick = 0
+
+        # This run's objects; moving ones are copied from the template on write
+        self.platforms = LevelObjects(level.platforms, level.moving_platform_indices)
+        self.obstacles = LevelObjects(level.obstacles, level.moving_obstacle_indices)
+
+        # Collision broadphase: static cells are shared by every run of the
+        # level, moving objects get their own small grid that follows them
+        self.static_platform_grid = level.static_platform_grid
+        self.static_obstacle_grid = level.static_obstacle_grid
+        self.moving_platform_grid = build_spatial_hash(self.platforms, self.platforms.moving_indices)
+        self.moving_obstacle_grid = build_spatial_hash(self.obstacles, self.obstacles.moving_indices)
+
+        # Levels can be wider than the screen; the camera scrolls to follow
+        # the player, and moving objects are found by x near the view
+        self.world_width = max(screen_width, level.width)
+        self.scrolling = self.world_width > screen_width
+        self.moving_platform_x_index = build_x_index(self.platforms, self.platforms.moving_indices)
+        self.moving_obstacle_x_index = build_x_index(self.obstacles, self.obstacles.moving_indices)
+
+        # Player state
+        self.player_pos = Vec2(*level.spawn_point)
+        self.player_velocity_x = 0
+        self.player_velocity_y = 0
+        self.is_jumping = False
+        self.player_radius = PLAYER_RADIUS
+
+        # Game state
+        self.game_over = False
+        self.level_complete = False
+        self.elapsed_time = 0
+
+        # Physics
+        self.gravity = 700
+        self.jump_power = 400
+        self.move_speed = 300  # Horizontal movement speed
+        self.keys_pressed = set()  # Actions currently held: 'left', 'right', 'jump'
+
+        # Optional replay.InputLog that press() and release() record into
+        self.input_log = None
+        # Optional profiler.FrameProfiler that collision checks are timed into
+        self.profiler = None
+
+        self.camera_x = 0
+        self._update_camera()
+
+    def update(self, dt: float):
+        """Update game state"""
+        if self.game_over or self.level_complete:
+            return
+
+        self.tick += 1
+        self.elapsed_time += dt
+
+        # Check time limit
+        if self.level.time_limit > 0 and self.elapsed_time > self.level.time_limit:
+            self.game_over = True
+            return
+
+        # Handle horizontal movement based on keys pressed
+        self.player_velocity_x = 0
+        if 'left' in self.keys_pressed:
+            self.player_velocity_x = -self.move_speed
+        if 'right' in self.keys_pressed:
+            self.player_velocity_x = self.move_speed
+
+        # Apply gravity
+        self.player_velocity_y += self.gravity * dt
+
+        # Update player position
+        self.player_pos.x += self.player_velocity_x * dt
+        self.player_pos.y += self.player_velocity_y * dt
+
+        # Keep player in bounds horizontally
+        self.player_pos.x = max(self.player_radius, min(self.player_pos.x, self.world_width - self.player_radius))
+        self._update_camera()
+
+        # Update moving platforms near the view
+        for index in self.moving_in_view(self.platforms, self.moving_platform_x_index, ACTIVE_MARGIN):
+            platform = self.platforms.writable(index)
+            platform.x += platform.speed * platform.direction * dt
+            # Bounce at the level edges
+            if platform.x < 0 or platform.x + platform.width > self.world_width:
+                platform.direction *= -1
+            self.moving_platform_grid.move(index, platform.x, platform.y, platform.width, platform.height)
+            if self.scrolling:
+                self.moving_platform_x_index.move(index, platform.x, platform.width)
+
+        # Update moving obstacles near the view
+        for index in self.moving_in_view(self.obstacles, self.moving_obstacle_x_index, ACTIVE_MARGIN):
+            obstacle = self.obstacles.writable(index)
+            obstacle.x += obstacle.speed * obstacle.direction * dt
+            if obstacle.x < 0 or obstacle.x + obstacle.width > self.world_width:
+                obstacle.direction *= -1
+            self.moving_obstacle_grid.move(index, obstacle.x, obstacle.y, obstacle.width, obstacle.height)
+            if self.scrolling:
+                self.moving_obstacle_x_index.move(index, obstacle.x, obstacle.width)
+
+        if self.profiler is not None:
+            start = time.perf_counter()
+
+        # Collision detection with platforms
+        self._check_platform_collisions()
+
+        # Collision detection with obstacles
+        self._check_obstacle_collisions()
+
+        if self.profiler is not None:
+            self.profiler.add("collisions", time.perf_counter() - start)
+
+        # Check if level complete
+        self._check_level_complete()
+
+        # Out of bounds
+        if self.player_pos.y > self.screen_height + 100:
+            self.game_over = True
+
+    def step(self):
+        """Advance by one fixed tick"""
+        self.update(self.tick_dt)
+
+    def run(self, max_ticks: int) -> int:
+        """Step until the run ends or max_ticks pass, as fast as possible"""
+        start = self.tick
+        while self.tick - start < max_ticks and not (self.game_over or self.level_complete):
+            self.step()
+        return self.tick - start
+
+    def clone(self) -> 'Simulation':
+        """Independent copy of this run, sharing the level and static grids"""
+        other = copy.copy(self)
+        other.platforms = self.platforms.clone()
+        other.obstacles = self.obstacles.clone()
+        other.moving_platform_grid = build_spatial_hash(other.platforms, other.platforms.moving_indices)
+        other.moving_obstacle_grid = build_spatial_hash(other.obstacles, other.obstacles.moving_indices)
+        other.moving_platform_x_index = build_x_index(other.platforms, other.platforms.moving_indices)
+        other.moving_obstacle_x_index = build_x_index(other.obstacles, other.obstacles.moving_indices)
+        other.player_pos = Vec2(self.player_pos.x, self.player_pos.y)
+        other.keys_pressed = set(self.keys_pressed)
+        other.input_log = None
+        other.profiler = None
+        return other
+
+    def press(self, action: str):
+        """Start an input action: 'jump' jumps, 'left'/'right' start moving"""
+        if self.input_log is not None:
+            self.input_log.record(self.tick, action, True)
+        self.keys_pressed.add(action)
+        if action == 'jump':
+            self.jump()
+
+    def release(self, action: str):
+        """End an input action"""
+        if self.input_log is not None:
+            self.input_log.record(self.tick, action, False)
+        self.keys_pressed.discard(action)
+
+    def jump(self):
+        """Perform a jump"""
+        if not self.is_jumping:
+            self.player_velocity_y = -self.jump_power
+            self.is_jumping = True
+
+    def player_rect(self) -> IntRect:
+        """The player's bounding box"""
+        return int_rect(
+            self.player_pos.x - self.player_radius,
+            self.player_pos.y - self.player_radius,
+            self.player_radius * 2,
+            self.player_radius * 2
+        )
+
+    def view_range(self, margin: float = 0) -> Tuple[float, float]:
+        """World x range shown on screen, optionally widened on both sides"""
+        return self.camera_x - margin, self.camera_x + self.screen_width + margin
+
+    def moving_in_view(self, objects: LevelObjects, x_index: XIndex, margin: float = 0) -> List[int]:
+        """Indices of moving objects near the view, in level order"""
+        if not self.scrolling:
+            # The whole level is on screen
+            return objects.moving_indices
+        return sorted(x_index.query(*self.view_range(margin)))
+
+    def _update_camera(self):
+        """Follow the player, stopping at the level edges"""
+        target = self.player_pos.x - self.screen_width * CAMERA_ANCHOR
+        self.camera_x = max(0, min(target, self.world_width - self.screen_width))
+
+    def _check_platform_collisions(self):
+        """Check collision with platforms"""
+        player_rect = self.player_rect()
+
+        for index in self._nearby(self.static_platform_grid, self.moving_platform_grid, player_rect):
+            platform = self.platforms[index]
+            platform_rect = int_rect(platform.x, platform.y, platform.width, platform.height)
+
+            if rects_collide(player_rect, platform_rect):
+                # Landing on platform
+                if self.player_velocity_y > 0 and rect_centery(player_rect) < rect_centery(platform_rect):
+                    self.player_pos.y = platform.y - self.player_radius
+                    self.player_velocity_y = 0
+                    self.is_jumping = False
+
+                    # Spring platforms bounce higher
+                    if platform.platform_type == "spring":
+                        self.player_velocity_y = -self.jump_power * 1.5
+                        self.is_jumping = True
+
+    def _check_obstacle_collisions(self):
+        """Check collision with obstacles"""
+        player_rect = self.player_rect()
+
+        for index in self._nearby(self.static_obstacle_grid, self.moving_obstacle_grid, player_rect):
+            obstacle = self.obstacles[index]
+            obstacle_rect = int_rect(obstacle.x, obstacle.y, obstacle.width, obstacle.height)
+
+            if rects_collide(player_rect, obstacle_rect):
+                self.game_over = True
+
+    def _nearby(self, static_grid: SpatialHash, moving_grid: SpatialHash, rect: IntRect) -> List[int]:
+        """Indices of objects near a rect, in level order like a full scan"""
+        candidates = static_grid.query(*rect)
+        if len(moving_grid):
+            candidates |= moving_grid.query(*rect)
+        return sorted(candidates)
+
+    def _check_level_complete(self):
+        """Check if player reached the end point"""
+        end_x, end_y = self.level.end_point
+        distance = ((self.player_pos.x - end_x) ** 2 + (self.player_pos.y - end_y) ** 2) ** 0.5
+
+        if distance < self.player_radius + 30:
+            self.level_complete = True
@@ -0,0 +1,287 @@
+"""
+Level solvability verifier
+
+Searches the input space of a level headlessly: at every decision point
+(DECISION_TICKS apart) the player may hold left, right or nothing and may
+jump. States are expanded best-first, closest to the end point in ticks
+spent plus estimated ticks left, and states that round to an already
+visited position/velocity are pruned.
+
+A solvable level comes with a witness: the InputLog of the winning run,
+which can be saved as a replay and checked with replay.py. "unsolvable"
+means the search ran out of states to try at its resolution; "unknown"
+means it hit the state budget first. Levels that fail to load are
+reported as "error" instead of stopping the run.
+
+Usage:
+    python solver.py                     # every level in Levels/
+    python solver.py level1 custom1      # selected levels
+    python solver.py --witness-dir Replays/
+"""
+import argparse
+import heapq
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from level_data import LevelData, level_file_path, load_level_file
+from level_manifest import LevelManifest
+from replay import REPLAY_EXTENSION, InputLog
+from simulation import DEFAULT_TICK_RATE, SCREEN_HEIGHT, SCREEN_WIDTH, Simulation
+
+SOLVABLE = "solvable"
+UNSOLVABLE = "unsolvable"
+UNKNOWN = "unknown"
+ERROR = "error"  # the level could not be loaded
+
+# Ticks between decisions; 12 ticks is 0.1 s at the default tick rate
+DECISION_TICKS = 12
+# Expanded states before giving up with UNKNOWN
+DEFAULT_MAX_STATES = 100_000
+# Search horizon for levels without a time limit, in seconds
+DEFAULT_HORIZON = 60
+
+# How strongly the search is pulled towards the end point; above 1 it finds
+# a witness faster but not necessarily the fastest run
+HEURISTIC_WEIGHT = 6
+
+# Resolution of the visited-state key: pixels for position, px/s for velocity
+POSITION_STEP = 4
+VELOCITY_STEP = 25
+
+# (held direction, jump) choices available at each decision point
+CHOICES: Tuple[Tuple[Optional[str], bool], ...] = (
+    ('right', False), ('right', True),
+    (None, False), (None, True),
+    ('left', False), ('left', True),
+)
+
+
+@dataclass
+class SolveResult:
+    """Outcome of searching one level"""
+    level_name: str
+    status: str
+    states: int
+    witness: Optional[InputLog] = None
+    error: Optional[str] = None  # why the level could not be loaded, for ERROR
+
+    @property
+    def end_tick(self) -> Optional[int]:
+        return self.witness.end_tick if self.witness else None
+
+
+def apply_choice(sim: Simulation, choice: Tuple[Optional[str], bool]):
+    """Set the held direction and maybe jump, through press()/release()"""
+    held, jump = choice
+    for action in ('left', 'right'):
+        if action in sim.keys_pressed and action != held:
+            sim.release(action)
+    if held is not None and held not in sim.keys_pressed:
+        sim.press(held)
+    if jump:
+        sim.press('jump')
+
+
+def solve(level: LevelData, level_name: str = "", first_choices: Optional[List[int]] = None,
+          max_states: int = DEFAULT_MAX_STATES, decision_ticks: int = DECISION_TICKS,
+          tick_rate: int = DEFAULT_TICK_RATE,
+          screen_width: int = SCREEN_WIDTH, screen_height: int = SCREEN_HEIGHT) -> SolveResult:
+    """Best-first search for inputs that complete the level
+
+    first_choices restricts the first decision to some CHOICES indices, so
+    several processes can split one level's search between them.
+    """
+    level_name = level_name or level.name
+    if level.time_limit > 0:
+        max_ticks = int(level.time_limit * tick_rate) + 1
+    else:
+        max_ticks = DEFAULT_HORIZON * tick_rate
+    # Moving objects make the same player state at another tick a different
+    # state, and so does a time limit: reaching it later leaves less time
+    timed = bool(level.moving_platform_indices or level.moving_obstacle_indices or level.time_limit > 0)
+
+    root = Simulation(level, screen_width, screen_height, tick_rate)
+    # paths[i] = (parent path index, choice index); the root is -1
+    paths: List[Tuple[int, int]] = []
+    visited = set()
+    # (priority, insertion order, simulation, path index)
+    queue = [(0.0, 0, root, -1)]
+    states = 0
+
+    while queue:
+        _, _, sim, path = heapq.heappop(queue)
+        allowed = first_choices if path == -1 and first_choices is not None else range(len(CHOICES))
+        for choice_index in allowed:
+            if sim.is_jumping and CHOICES[choice_index][1]:
+                continue  # Jumping in mid-air does nothing
+            if states >= max_states:
+                return SolveResult(level_name, UNKNOWN, states)
+            states += 1
+
+            child = sim.clone()
+            apply_choice(child, CHOICES[choice_index])
+            child.run(decision_ticks)
+            paths.append((path, choice_index))
+            child_path = len(paths) - 1
+
+            if child.level_complete:
+                witness = _witness(level, level_name, paths, child_path, decision_ticks,
+                                   tick_rate, screen_width, screen_height)
+                return SolveResult(level_name, SOLVABLE, states, witness)
+            if child.game_over or child.tick >= max_ticks:
+                continue
+
+            key = _state_key(child, timed)
+            if key in visited:
+                continue
+            visited.add(key)
+            heapq.heappush(queue, (_priority(child), states, child, child_path))
+
+    return SolveResult(level_name, UNSOLVABLE, states)
+
+
+def _priority(sim: Simulation) -> float:
+    """Ticks spent plus a greedy estimate of the ticks still needed"""
+    end_x, end_y = sim.level.end_point
+    distance = ((sim.player_pos.x - end_x) ** 2 + (sim.player_pos.y - end_y) ** 2) ** 0.5
+    return sim.tick + HEURISTIC_WEIGHT * distance / sim.move_speed * sim.tick_rate
+
+
+def _state_key(sim: Simulation, timed: bool) -> tuple:
+    key = (
+        round(sim.player_pos.x / POSITION_STEP),
+        round(sim.player_pos.y / POSITION_STEP),
+        round(sim.player_velocity_y / VELOCITY_STEP),
+        sim.is_jumping,
+    )
+    return key + (sim.tick,) if timed else key
+
+
+def _witness(level, level_name, paths, path, decision_ticks, tick_rate, width, height) -> InputLog:
+    """Re-run the winning choices from the start, recording an InputLog"""
+    choices = []
+    while path != -1:
+        path, choice_index = paths[path]
+        choices.append(CHOICES[choice_index])
+    choices.reverse()
+
+    sim = Simulation(level, width, height, tick_rate)
+    sim.input_log = InputLog(level_name, tick_rate, width, height, level_hash=level.source_hash)
+    for choice in choices:
+        apply_choice(sim, choice)
+        sim.run(decision_ticks)
+    sim.input_log.finish(sim)
+    return sim.input_log
+
+
+def _solve_file(levels_dir: str, level_name: str, first_choices: Optional[List[int]],
+                max_states: int) -> SolveResult:
+    """Worker entry point: load a level by name and search it
+
+    A level that fails to load is reported as an ERROR result, so one bad
+    file doesn't stop a directory run.
+    """
+    try:
+        level = load_level_file(level_file_path(levels_dir, level_name))
+    except Exception as e:
+        return SolveResult(level_name, ERROR, 0, error=f"cannot load level: {type(e).__name__}: {e}")
+    return solve(level, level_name, first_choices, max_states)
+
+
+def solve_level(levels_dir: str, level_name: str, workers: Optional[int] = None,
+                max_states: int = DEFAULT_MAX_STATES) -> SolveResult:
+    """Search one level, splitting its first decision across processes
+
+    Each process prunes only its own subtree, so together they may expand
+    some states twice; the shortest witness found by any of them is kept.
+    """
+    groups = [[i] for i in range(len(CHOICES))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_solve_file, [levels_dir] * len(groups), [level_name] * len(groups),
+                                groups, [max_states] * len(groups)))
+    return _merge(level_name, results)
+
+
+def _merge(level_name: str, results: List[SolveResult]) -> SolveResult:
+    states = sum(r.states for r in results)
+    errors = [r for r in results if r.status == ERROR]
+    if errors:
+        return errors[0]
+    solved = [r for r in results if r.status == SOLVABLE]
+    if solved:
+        best = min(solved, key=lambda r: r.end_tick)
+        return SolveResult(level_name, SOLVABLE, states, best.witness)
+    if all(r.status == UNSOLVABLE for r in results):
+        return SolveResult(level_name, UNSOLVABLE, states)
+    return SolveResult(level_name, UNKNOWN, states)
+
+
+def solve_directory(levels_dir: str, level_names: Optional[List[str]] = None,
+                    workers: Optional[int] = None,
+                    max_states: int = DEFAULT_MAX_STATES) -> Dict[str, SolveResult]:
+    """Search many levels in parallel, one level per task
+
+    Levels the manifest couldn't read are reported as errors without a search.
+    """
+    results: Dict[str, Optional[SolveResult]] = {}
+    if level_names is None:
+        manifest = LevelManifest(levels_dir)
+        manifest.refresh()
+        for entry in manifest.entries():
+            if entry.error:
+                results[entry.level_name] = SolveResult(entry.level_name, ERROR, 0,
+                                                        error=f"cannot read level: {entry.error}")
+            else:
+                results[entry.level_name] = None
+    else:
+        results = dict.fromkeys(level_names)
+
+    to_search = [name for name, result in results.items() if result is None]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results.update(zip(to_search, pool.map(_solve_file, [levels_dir] * len(to_search), to_search,
+                                               [None] * len(to_search), [max_states] * len(to_search))))
+    return results
+
+
+def main(argv: List[str]) -> int:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Check that levels can be completed")
+    parser.add_argument("levels", nargs="*", help="level names (default: all)")
+    parser.add_argument("--levels-dir", default=os.path.join(script_dir, "Levels"), help="levels folder")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--max-states", type=int, default=DEFAULT_MAX_STATES, help="search budget per level")
+    parser.add_argument("--witness-dir", help="save a replay of each solution here")
+    args = parser.parse_args(argv)
+
+    if len(args.levels) == 1:
+        results = {args.levels[0]: solve_level(args.levels_dir, args.levels[0], args.workers, args.max_states)}
+    else:
+        results = solve_directory(args.levels_dir, args.levels or None, args.workers, args.max_states)
+
+    if args.witness_dir:
+        os.makedirs(args.witness_dir, exist_ok=True)
+
+    failures = 0
+    for name, result in results.items():
+        if result.status == SOLVABLE:
+            seconds = result.end_tick / result.witness.tick_rate
+            print(f"✓ {name}: solvable in {seconds:.2f}s "
+                  f"({len(result.witness.events)} inputs, {result.states} states)")
+            if args.witness_dir:
+                result.witness.save(os.path.join(args.witness_dir, name + REPLAY_EXTENSION))
+        else:
+            failures += 1
+            if result.status == ERROR:
+                print(f"✗ {name}: {result.error}")
+            else:
+                print(f"✗ {name}: {result.status} ({result.states} states)")
+
+    print(f"\n{len(results) - failures}/{len(results)} levels solvable")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
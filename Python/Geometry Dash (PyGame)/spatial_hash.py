@@ -0,0 +1,115 @@
+"""
+Uniform grid spatial hash used as a collision broadphase
+"""
+import math
+from typing import Dict, Hashable, Iterable, Set, Tuple
+
+# Cell size in pixels; a few times the player size keeps queries to 1-4 cells
+DEFAULT_CELL_SIZE = 128
+
+
+class SpatialHash:
+    """Maps grid cells to the keys of the rectangles that overlap them
+
+    Cell ranges are computed conservatively, so a query may return keys whose
+    rectangle doesn't actually touch the area. Callers do the exact test.
+    """
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._ranges: Dict[Hashable, Tuple[int, int, int, int]] = {}
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, key):
+        return key in self._ranges
+
+    def insert(self, key: Hashable, x: float, y: float, width: float, height: float):
+        """Add a rectangle under the given key"""
+        cell_range = self._cell_range(x, y, width, height)
+        self._ranges[key] = cell_range
+        for cell in _cells_in(cell_range):
+            bucket = self._cells.get(cell)
+            if bucket is None:
+                self._cells[cell] = bucket = set()
+            bucket.add(key)
+
+    def remove(self, key: Hashable):
+        """Remove a rectangle if present"""
+        cell_range = self._ranges.pop(key, None)
+        if cell_range is None:
+            return
+        for cell in _cells_in(cell_range):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._cells[cell]
+
+    def move(self, key: Hashable, x: float, y: float, width: float, height: float):
+        """Update a rectangle, only touching buckets if it changed cells"""
+        if self._ranges.get(key) == self._cell_range(x, y, width, height):
+            return
+        self.remove(key)
+        self.insert(key, x, y, width, height)
+
+    def query(self, x: float, y: float, width: float, height: float) -> Set[Hashable]:
+        """Keys of rectangles that may overlap the given area"""
+        found = set()
+        cells = self._cells
+        for cell in _cells_in(self._cell_range(x, y, width, height)):
+            bucket = cells.get(cell)
+            if bucket:
+                found |= bucket
+        return found
+
+    def query_point(self, x: float, y: float) -> Set[Hashable]:
+        """Keys of rectangles that may contain the given point"""
+        return set(self._cells.get((math.floor(x / self.cell_size), math.floor(y / self.cell_size)), ()))
+
+    def cells(self):
+        """(cell, keys) pairs for every non-empty cell"""
+        return self._cells.items()
+
+    def clear(self):
+        self._cells.clear()
+        self._ranges.clear()
+
+    def _cell_range(self, x, y, width, height) -> Tuple[int, int, int, int]:
+        # Negative sizes extend up/left of the origin, as in pygame.Rect
+        if width < 0:
+            x, width = x + width, -width
+        if height < 0:
+            y, height = y + height, -height
+        # Pad by a pixel so rects rounded to integers by pygame stay covered
+        size = self.cell_size
+        return (
+            math.floor((x - 1) / size),
+            math.floor((y - 1) / size),
+            math.floor((x + width + 1) / size),
+            math.floor((y + height + 1) / size),
+        )
+
+
+def _cells_in(cell_range) -> Iterable[Tuple[int, int]]:
+    min_cx, min_cy, max_cx, max_cy = cell_range
+    for cx in range(min_cx, max_cx + 1):
+        for cy in range(min_cy, max_cy + 1):
+            yield (cx, cy)
+
+
+def build_spatial_hash(objects, indices: Iterable[int], cell_size: int = DEFAULT_CELL_SIZE) -> SpatialHash:
+    """Build a hash over the given indices of a platform or obstacle sequence"""
+    grid = SpatialHash(cell_size)
+    if hasattr(objects, 'columns'):
+        # Compiled record tables are read column by column without building objects
+        xs, ys, widths, heights = objects.columns()
+        for index in indices:
+            grid.insert(index, xs[index], ys[index], widths[index], heights[index])
+        return grid
+    for index in indices:
+        obj = objects[index]
+        grid.insert(index, obj.x, obj.y, obj.width, obj.height)
+    return grid
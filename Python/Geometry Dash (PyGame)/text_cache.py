@@ -0,0 +1,93 @@
+"""
+Cache of rendered text surfaces shared by the game and the level editor
+
+Rendering text is one of the more expensive things a frame does, and most
+strings on screen (level names, menu entries, button labels) never change.
+render_text() keeps recently used surfaces in a shared LRU cache keyed by
+(font, text, color). Surfaces from the cache are shared: blit them, never
+draw on them.
+
+Text that changes while it is shown, like a timer, should use a TextLabel
+instead, so every value it passes through doesn't push out other entries.
+"""
+from collections import OrderedDict
+from typing import Dict
+
+import pygame
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces with hit/miss counters"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()  # (font, text, color, antialias) -> surface
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+        """Get a rendered surface for the text, rendering it on a miss"""
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """Drop every cached surface"""
+        self._surfaces.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Cache counters for diagnostics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class TextLabel:
+    """Text in one place on screen that is re-rendered only when it changes"""
+
+    def __init__(self, font: pygame.font.Font, color, antialias: bool = True):
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+        self.renders = 0
+        self._text = None
+        self._surface = None
+
+    def render(self, text: str) -> pygame.Surface:
+        if text != self._text:
+            self._text = text
+            self._surface = self.font.render(text, self.antialias, self.color)
+            self.renders += 1
+        return self._surface
+
+
+# The cache used by render_text(), shared by everything in the process
+text_cache = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, color, antialias: bool = True) -> pygame.Surface:
+    """Render text through the shared cache"""
+    return text_cache.render(font, text, color, antialias)
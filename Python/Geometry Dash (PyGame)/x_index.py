@@ -0,0 +1,106 @@
+"""
+Objects sorted by x, used to find what overlaps a horizontal range such as
+the camera's view
+"""
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+# Objects wider than this are checked by every query instead of being sorted,
+# so one long ground strip doesn't make queries scan back to the level start
+DEFAULT_WIDE_THRESHOLD = 2048
+
+
+class XIndex:
+    """Keys of objects sorted by their left edge
+
+    A query bisects to the first object that could reach the range (its left
+    edge is at most the widest narrow object's width before the range) and
+    scans until left edges pass the end of the range, so its cost depends on
+    how many objects are near the range, not how long the level is.
+    """
+
+    def __init__(self, wide_threshold: float = DEFAULT_WIDE_THRESHOLD):
+        self.wide_threshold = wide_threshold
+        self._entries: List[Tuple[float, int, Hashable]] = []  # (left, order, key), sorted
+        self._spans: Dict[Hashable, Tuple[float, float, int]] = {}  # key -> (left, right, order)
+        self._wide: Dict[Hashable, Tuple[float, float]] = {}
+        self._max_width = 0.0
+        self._order = 0
+
+    def __len__(self):
+        return len(self._spans) + len(self._wide)
+
+    def __contains__(self, key):
+        return key in self._spans or key in self._wide
+
+    def insert(self, key: Hashable, x: float, width: float):
+        """Add an object spanning x to x + width"""
+        entry = self._add(key, x, width)
+        if entry is not None:
+            insort(self._entries, entry)
+
+    def extend(self, spans: Iterable[Tuple[Hashable, float, float]]):
+        """Add (key, x, width) objects, sorting once rather than inserting each"""
+        entries = self._entries
+        for key, x, width in spans:
+            entry = self._add(key, x, width)
+            if entry is not None:
+                entries.append(entry)
+        entries.sort()
+
+    def _add(self, key: Hashable, x: float, width: float):
+        """Record an object's span; returns its sort entry, or None for wide objects"""
+        left, right = (x + width, x) if width < 0 else (x, x + width)
+        if right - left > self.wide_threshold:
+            self._wide[key] = (left, right)
+            return None
+        # The insertion counter keeps entries with equal left edges comparable
+        self._order += 1
+        self._spans[key] = (left, right, self._order)
+        self._max_width = max(self._max_width, right - left)
+        return (left, self._order, key)
+
+    def remove(self, key: Hashable):
+        """Remove an object if present"""
+        if self._wide.pop(key, None) is not None:
+            return
+        span = self._spans.pop(key, None)
+        if span is None:
+            return
+        left, _, order = span
+        del self._entries[bisect_left(self._entries, (left, order))]
+
+    def move(self, key: Hashable, x: float, width: float):
+        """Update an object's span"""
+        self.remove(key)
+        self.insert(key, x, width)
+
+    def query(self, x0: float, x1: float) -> List[Hashable]:
+        """Keys of objects overlapping or touching x0..x1
+
+        Wide objects come first, then the rest in left edge order.
+        """
+        entries = self._entries
+        spans = self._spans
+        found = [key for key, (left, right) in self._wide.items() if left <= x1 and right >= x0]
+        start = bisect_left(entries, (x0 - self._max_width,))
+        for i in range(start, len(entries)):
+            left, _, key = entries[i]
+            if left > x1:
+                break
+            if spans[key][1] >= x0:
+                found.append(key)
+        return found
+
+
+def build_x_index(objects, indices: Iterable[int],
+                  wide_threshold: float = DEFAULT_WIDE_THRESHOLD) -> XIndex:
+    """Build an index over the given indices of a platform or obstacle sequence"""
+    index = XIndex(wide_threshold)
+    if hasattr(objects, 'columns'):
+        # Compiled record tables are read column by column without building objects
+        xs, _, widths, _ = objects.columns()
+        index.extend((i, xs[i], widths[i]) for i in indices)
+    else:
+        index.extend((i, objects[i].x, objects[i].width) for i in indices)
+    return index